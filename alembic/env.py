@@ -6,19 +6,30 @@ from alembic import context
 from src.config.database import DATABASE_URL
 from src.models.address import AddressModel  # noqa
 from src.models.base import BaseModel
+from src.models.cache_version import CacheVersionModel  # noqa
 
 # Models import
 from src.models.country import CountryModel  # noqa
+from src.models.daily_category_sales import DailyCategorySalesModel  # noqa
+from src.models.daily_customer_sales import DailyCustomerSalesModel  # noqa
+from src.models.daily_financials import DailyFinancialsModel  # noqa
+from src.models.daily_product_sales import DailyProductSalesModel  # noqa
+from src.models.idempotency_key import IdempotencyKeyModel  # noqa
+from src.models.image_derivative import ImageDerivativeModel  # noqa
 from src.models.inventory_item import InventoryItemModel  # noqa
 from src.models.inventory_item_category import InventoryItemCategoryModel  # noqa
+from src.models.inventory_movement import InventoryMovementModel  # noqa
 from src.models.inventory_purchase import InventoryPurchaseModel  # noqa
 from src.models.invoice import InvoiceModel  # noqa
 from src.models.invoice_detail import InvoiceDetailModel  # noqa
+from src.models.job import JobModel  # noqa
 from src.models.locality import LocalityModel  # noqa
 from src.models.manufactured_item import ManufacturedItemModel  # noqa
 from src.models.manufactured_item_category import ManufacturedItemCategoryModel  # noqa
 from src.models.manufactured_item_detail import ManufacturedItemDetailModel  # noqa
 from src.models.measurement_unit import MeasurementUnitModel  # noqa
+from src.models.mp_preference import MpPreferenceModel  # noqa
+from src.models.mp_webhook_event import MpWebhookEventModel  # noqa
 from src.models.order import OrderModel  # noqa
 from src.models.order_detail import OrderDetailModel  # noqa
 from src.models.order_inventory_detail import OrderInventoryDetailModel  # noqa
@@ -30,6 +41,7 @@ from src.models.promotion_manufactured_item_detail import (  # noqa
     PromotionManufacturedItemDetailModel,
 )
 from src.models.province import ProvinceModel  # noqa
+from src.models.sales_rollup_state import SalesRollupStateModel  # noqa
 from src.models.user import UserModel  # noqa
 
 config = context.config
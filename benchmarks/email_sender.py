@@ -0,0 +1,90 @@
+"""Benchmark de envío de correos: una conexión por mensaje contra el pool.
+
+Levanta el servidor SMTP local de ``benchmarks.smtp_server`` y mide cuántos
+mensajes por segundo se envían abriendo una sesión por mensaje (como
+``aiosmtplib.send``) y reutilizando las conexiones de ``SMTPConnectionPool``.
+
+Uso: python -m benchmarks.email_sender [mensajes] [demora_conexion_ms] [demora_comando_ms]
+"""
+
+import asyncio
+import sys
+import time
+
+import aiosmtplib
+
+from benchmarks.smtp_server import SinkSMTPServer
+from src.config.settings import settings
+from src.utils.email import build_message, send_bulk_emails
+from src.utils.smtp import SMTPConnectionPool
+
+
+def build_messages(count: int) -> list:
+    """Arma mensajes con un PDF de prueba adjunto."""
+    pdf_data = b"%PDF-1.4\n" + b"0" * 40_000
+    return [
+        build_message(
+            f"cliente{index}@example.com",
+            f"Factura #{index}",
+            "Adjunto encontrará su factura.",
+            pdf_data,
+            f"factura_{index}.pdf",
+        )
+        for index in range(count)
+    ]
+
+
+async def send_one_connection_per_message(messages: list) -> None:
+    """Envía cada mensaje abriendo y cerrando su propia sesión SMTP."""
+    semaphore = asyncio.Semaphore(settings.smtp_pool_size or 4)
+
+    async def send(message) -> None:
+        async with semaphore:
+            await aiosmtplib.send(
+                message, hostname=settings.smtp_host, port=settings.smtp_port
+            )
+
+    await asyncio.gather(*(send(message) for message in messages))
+
+
+async def run(count: int, connect_delay: float, command_delay: float) -> None:
+    server = SinkSMTPServer(connect_delay=connect_delay, command_delay=command_delay)
+    await server.start()
+    settings.smtp_host = server.host
+    settings.smtp_port = server.port
+
+    print(
+        f"{count} mensajes, {settings.smtp_pool_size} conexiones, "
+        f"demora de conexión {connect_delay * 1000:.0f} ms, "
+        f"demora por comando {command_delay * 1000:.0f} ms"
+    )
+
+    for label, send in (
+        ("una sesión por mensaje", send_one_connection_per_message),
+        ("pool", send_bulk_emails),
+    ):
+        messages = build_messages(count)
+        received, connections = server.messages, server.connections
+        start = time.perf_counter()
+        result = await send(messages)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for _, error in result or [] if error)
+        print(
+            f"{label:<24} {count / elapsed:8.1f} mensajes/seg"
+            f"   conexiones {server.connections - connections:5d}"
+            f"   recibidos {server.messages - received:5d}   errores {failed}"
+        )
+
+    await SMTPConnectionPool().close()
+    await server.stop()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    connect_delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    command_delay = (float(sys.argv[3]) if len(sys.argv) > 3 else 1) / 1000
+    asyncio.run(run(count, connect_delay, command_delay))
+
+
+if __name__ == "__main__":
+    main()
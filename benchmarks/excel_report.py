@@ -0,0 +1,98 @@
+"""Benchmark de memoria del reporte de ingresos en Excel.
+
+Compara el pico de memoria (RSS) de generar el reporte con las filas en listas
+y un libro completo en memoria (como antes) contra el libro de sólo escritura
+alimentado por iteradores y volcado a un archivo temporal. Cada variante corre
+en un proceso aparte para medir su propio pico.
+
+Uso: python -m benchmarks.excel_report [filas]
+"""
+
+import multiprocessing
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Iterator, Tuple
+
+import openpyxl
+
+from src.models.invoice import InvoiceType
+from src.utils.openpyxl import generate_excel_report
+
+
+def purchase_rows(count: int) -> Iterator[Tuple[datetime, int, float, str]]:
+    """Filas sintéticas de compras de inventario."""
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        yield start + timedelta(minutes=index), 5, 1250.0, f"Insumo {index % 500}"
+
+
+def invoice_rows(count: int) -> Iterator[Tuple[datetime, float, InvoiceType]]:
+    """Filas sintéticas de facturas."""
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        yield start + timedelta(minutes=index), 8500.0, InvoiceType.factura
+
+
+def legacy_report(purchases: list, invoices: list) -> bytes:
+    """Reproduce el reporte anterior: libro completo en memoria celda por celda."""
+    buffer = BytesIO()
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    row = 2
+    for purchase_date, quantity, total_cost, name in purchases:
+        sheet.cell(row=row, column=1).value = "Compra de Inventario"
+        sheet.cell(row=row, column=2).value = purchase_date
+        sheet.cell(row=row, column=3).value = name
+        sheet.cell(row=row, column=4).value = quantity
+        sheet.cell(row=row, column=5).value = total_cost
+        row += 1
+    for invoice_date, total, invoice_type in invoices:
+        sheet.cell(row=row, column=1).value = "Venta"
+        sheet.cell(row=row, column=2).value = invoice_date
+        sheet.cell(row=row, column=3).value = invoice_type.value
+        sheet.cell(row=row, column=6).value = total
+        row += 1
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def run_variant(variant: str, rows: int, results) -> None:
+    """Genera el reporte con una variante y publica tiempo, tamaño y pico de RSS."""
+    half = rows // 2
+    start = time.perf_counter()
+
+    if variant == "en memoria":
+        size = len(legacy_report(list(purchase_rows(half)), list(invoice_rows(half))))
+    else:
+        with SpooledTemporaryFile(max_size=10 * 1024 * 1024) as file:
+            generate_excel_report(file, purchase_rows(half), invoice_rows(half))
+            size = file.tell()
+
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, size, peak_kb))
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{rows} filas")
+    for variant in ("en memoria", "sólo escritura"):
+        results = context.Queue()
+        process = context.Process(target=run_variant, args=(variant, rows, results))
+        process.start()
+        elapsed, size, peak_kb = results.get()
+        process.join()
+        print(
+            f"{variant:<16} {elapsed:8.1f} s   archivo {size / 1024 / 1024:7.1f} MB"
+            f"   pico RSS {peak_kb / 1024:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark de la simulación de la cola de cocina.
+
+Uso: python -m benchmarks.kitchen_scheduler [pedidos_en_cola] [cocineros]
+"""
+
+import random
+import sys
+import time
+
+from src.services.kitchen_scheduler import KitchenScheduler, QueuedOrder
+
+
+def build_scheduler(queued_orders: int) -> KitchenScheduler:
+    """Prepara el simulador con una cola sintética sin tocar la base de datos."""
+    random.seed(42)
+    scheduler = KitchenScheduler()
+    scheduler._orders = [
+        QueuedOrder(
+            order_id=order_id,
+            prep_minutes=[
+                random.choice([5, 10, 15, 20]) * random.randint(1, 3)
+                for _ in range(random.randint(1, 4))
+            ],
+        )
+        for order_id in range(1, queued_orders + 1)
+    ]
+    scheduler._checkpoints = []
+    scheduler._dirty_from = 0
+    scheduler._loaded = True
+    return scheduler
+
+
+def measure(label: str, func, repeat: int = 200) -> None:
+    """Ejecuta una función varias veces y muestra el tiempo medio y el peor."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    print(
+        f"{label:<22} media {sum(timings) / len(timings) * 1000:7.3f} ms"
+        f"   peor {max(timings) * 1000:7.3f} ms"
+    )
+
+
+def main() -> None:
+    queued_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cook_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    scheduler = build_scheduler(queued_orders)
+    now = time.time()
+    next_id = queued_orders + 1
+
+    def full_simulation() -> None:
+        scheduler._dirty_from = 0
+        scheduler._simulate(now, cook_count)
+
+    def enqueue_and_remove() -> None:
+        nonlocal next_id
+        scheduler._orders.append(QueuedOrder(order_id=next_id, prep_minutes=[15, 10]))
+        scheduler._mark_dirty(len(scheduler._orders) - 1)
+        scheduler._simulate(now, cook_count)
+        scheduler._remove(next_id)
+        scheduler._simulate(now, cook_count)
+        next_id += 1
+
+    def delay_middle_order() -> None:
+        position = len(scheduler._orders) // 2
+        scheduler._orders[position].delay_minutes += 1
+        scheduler._mark_dirty(position)
+        scheduler._simulate(now, cook_count)
+
+    print(f"{queued_orders} pedidos en cola, {cook_count} cocineros")
+    measure("simulación completa", full_simulation)
+    measure("alta + baja al final", enqueue_and_remove)
+    measure("retraso a mitad de cola", delay_middle_order)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Servidor local que imita la API de Mercado Pago.
+
+Responde la creación de preferencias y la consulta de pagos con una latencia y
+una tasa de errores 503 configurables, para probar con carga el flujo de pago
+sin salir a internet. Para usarlo hay que apuntar la app al stub con
+``MP_API_BASE_URL=http://localhost:<puerto>``. Los pagos que devuelve se
+cargan antes con ``POST /v1/payments`` (lo hace ``benchmarks.mp_webhook_replay``)
+y ``GET /stats`` devuelve los contadores de pedidos atendidos.
+
+Uso: python -m benchmarks.mercado_pago_stub [puerto] [latencia_ms] [tasa_error]
+"""
+
+import asyncio
+import random
+import sys
+import uuid
+from collections import Counter
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def build_app(latency_ms: float, error_rate: float) -> FastAPI:
+    """Aplicación que responde como la API de Mercado Pago."""
+    app = FastAPI()
+    stats: Counter = Counter()
+    preferences: Dict[str, Dict[str, Any]] = {}
+    payments: Dict[str, Dict[str, Any]] = {}
+
+    async def simulate() -> JSONResponse | None:
+        """Aplica la latencia y devuelve un 503 según la tasa de errores."""
+        await asyncio.sleep(latency_ms / 1000)
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"message": "service unavailable"}, status_code=503)
+        return None
+
+    @app.post("/checkout/preferences")
+    async def create_preference(request: Request) -> Any:
+        if error := await simulate():
+            return error
+        idempotency_key = request.headers.get("X-Idempotency-Key")
+        if idempotency_key in preferences:
+            stats["replayed"] += 1
+            return preferences[idempotency_key]
+
+        body = await request.json()
+        preference_id = uuid.uuid4().hex
+        preference = {
+            "id": preference_id,
+            "items": body.get("items", []),
+            "init_point": (
+                "https://www.mercadopago.com.ar/checkout/v1/redirect"
+                f"?pref_id={preference_id}"
+            ),
+        }
+        if idempotency_key:
+            preferences[idempotency_key] = preference
+        stats["preferences"] += 1
+        return JSONResponse(preference, status_code=201)
+
+    @app.post("/v1/payments")
+    async def create_payment(request: Request) -> Any:
+        payment = await request.json()
+        payments[str(payment["id"])] = payment
+        return JSONResponse(payment, status_code=201)
+
+    @app.get("/v1/payments/{payment_id}")
+    async def get_payment(payment_id: str) -> Any:
+        if error := await simulate():
+            return error
+        if payment_id not in payments:
+            return JSONResponse({"message": "payment not found"}, status_code=404)
+        stats["payments"] += 1
+        return payments[payment_id]
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return dict(stats)
+
+    return app
+
+
+def main() -> None:
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8081
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 150
+    error_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    print(
+        f"Stub de Mercado Pago en http://localhost:{port}"
+        f"   latencia {latency_ms:.0f} ms   errores {error_rate:.0%}"
+    )
+    uvicorn.run(build_app(latency_ms, error_rate), port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
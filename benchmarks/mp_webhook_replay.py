@@ -0,0 +1,171 @@
+"""Reproduce ráfagas de notificaciones de pago de Mercado Pago contra la API.
+
+Toma los pedidos con Mercado Pago que todavía no están pagados, carga un pago
+aprobado por cada uno en ``benchmarks.mercado_pago_stub`` y envía al webhook
+las notificaciones firmadas con ``MP_WEBHOOK_SECRET``, repitiendo cada una
+varias veces con el mismo ``x-request-id`` como hace Mercado Pago al
+reintentar. Muestra el throughput y la latencia del webhook; los pagos se
+procesan después en la cola de trabajos.
+
+Uso: python -m benchmarks.mp_webhook_replay [url_api] [url_stub] [pedidos]
+    [repeticiones] [concurrencia]
+"""
+
+import asyncio
+import hashlib
+import hmac
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.config.database import Database
+from src.config.settings import settings
+from src.models.order import OrderModel, PaymentMethod
+
+
+def pending_orders(limit: int) -> List[Tuple[int, float]]:
+    """Pedidos con Mercado Pago que todavía no están pagados."""
+    stmt = (
+        select(OrderModel.id_key, OrderModel.final_total)
+        .where(
+            OrderModel.payment_method == PaymentMethod.mercado_pago,
+            OrderModel.is_paid.isnot(True),
+        )
+        .order_by(OrderModel.id_key)
+        .limit(limit)
+    )
+    with Session(Database().engine) as session:
+        return [(order_id, total) for order_id, total in session.execute(stmt)]
+
+
+def sign(data_id: str, request_id: str, secret: str) -> str:
+    """Arma el header ``x-signature`` como lo firma Mercado Pago."""
+    timestamp = str(int(time.time()))
+    manifest = f"id:{data_id.lower()};request-id:{request_id};ts:{timestamp};"
+    digest = hmac.new(
+        secret.encode("utf-8"), manifest.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    return f"ts={timestamp},v1={digest}"
+
+
+def build_notification(payment_id: str) -> Dict[str, Any]:
+    """Notificación de pago con el formato de los webhooks de Mercado Pago."""
+    return {
+        "id": random.randint(10**10, 10**11),
+        "live_mode": False,
+        "type": "payment",
+        "action": "payment.updated",
+        "api_version": "v1",
+        "data": {"id": payment_id},
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def replay(
+    api: httpx.AsyncClient,
+    stub: httpx.AsyncClient,
+    orders: List[Tuple[int, float]],
+    repetitions: int,
+    concurrency: int,
+    secret: str,
+) -> None:
+    """Carga los pagos en el stub y envía las notificaciones en paralelo."""
+    deliveries = []
+    for order_id, total in orders:
+        payment_id = str(random.randint(10**9, 10**10))
+        await stub.post(
+            "/v1/payments",
+            json={
+                "id": payment_id,
+                "status": "approved",
+                "external_reference": str(order_id),
+                "transaction_amount": total,
+            },
+        )
+        notification = build_notification(payment_id)
+        request_id = str(uuid.uuid4())
+        deliveries.extend([(payment_id, request_id, notification)] * repetitions)
+    random.shuffle(deliveries)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    results: Counter = Counter()
+
+    async def deliver(
+        payment_id: str, request_id: str, notification: Dict[str, Any]
+    ) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await api.post(
+                "/order/mp-webhook",
+                params={"data.id": payment_id, "type": "payment"},
+                json=notification,
+                headers={
+                    "x-request-id": request_id,
+                    "x-signature": sign(payment_id, request_id, secret),
+                },
+            )
+            latencies.append(time.perf_counter() - start)
+        if response.status_code == 200:
+            results[response.json()["status"]] += 1
+        else:
+            results[str(response.status_code)] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(deliver(*delivery) for delivery in deliveries))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{len(deliveries)} notificaciones en {elapsed:.1f} s"
+        f"   {len(deliveries) / elapsed:7.1f} notif/seg"
+        f"   p50 {percentile(latencies, 0.5) * 1000:7.1f} ms"
+        f"   p99 {percentile(latencies, 0.99) * 1000:7.1f} ms"
+    )
+    print("  ".join(f"{status}: {count}" for status, count in sorted(results.items())))
+
+
+async def run(
+    api_url: str, stub_url: str, orders: int, repetitions: int, concurrency: int
+) -> None:
+    if not settings.mp_webhook_secret:
+        raise SystemExit("Falta configurar MP_WEBHOOK_SECRET.")
+
+    selected = pending_orders(orders)
+    if not selected:
+        raise SystemExit("No hay pedidos con Mercado Pago pendientes de pago.")
+
+    print(
+        f"{len(selected)} pedidos, {repetitions} repeticiones,"
+        f" {concurrency} en paralelo"
+    )
+    async with httpx.AsyncClient(
+        base_url=api_url, timeout=30
+    ) as api, httpx.AsyncClient(base_url=stub_url) as stub:
+        await replay(
+            api, stub, selected, repetitions, concurrency, settings.mp_webhook_secret
+        )
+
+
+def main() -> None:
+    api_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    stub_url = sys.argv[2] if len(sys.argv) > 2 else "http://localhost:8081"
+    orders = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    repetitions = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    concurrency = int(sys.argv[5]) if len(sys.argv) > 5 else 50
+    asyncio.run(run(api_url, stub_url, orders, repetitions, concurrency))
+
+
+if __name__ == "__main__":
+    main()
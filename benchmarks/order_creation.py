@@ -0,0 +1,382 @@
+"""Benchmark de carga y contención de la creación de pedidos.
+
+Carga un catálogo sintético (cientos de productos que comparten ingredientes y
+promociones) en la base de datos configurada, levanta la API con uvicorn y
+varios workers y envía pedidos concurrentes por HTTP a ``POST /order/generate``.
+Cada worker cuenta sus consultas y deadlocks (también los de las tareas en
+segundo plano) y los escribe al terminar; las consultas se informan por
+solicitud, incluidas las rechazadas.
+
+Usar siempre una base de Postgres local y descartable: el benchmark crea las
+tablas si no existen y deja los datos generados.
+
+La sobreventa se controla leyendo el stock directamente de la base, sin pasar
+por los servicios, así el mismo script sirve para medir versiones anteriores.
+
+Uso: python -m benchmarks.order_creation [pedidos] [concurrencia] [productos]
+    [workers]
+"""
+
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from fastapi import FastAPI
+from psycopg2.errors import DeadlockDetected
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.orm import Session
+
+from src.config.database import Database
+from src.models.base import BaseModel
+from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_item_category import InventoryItemCategoryModel
+from src.models.manufactured_item import ManufacturedItemModel
+from src.models.manufactured_item_category import ManufacturedItemCategoryModel
+from src.models.manufactured_item_detail import ManufacturedItemDetailModel
+from src.models.promotion import PromotionModel
+from src.models.promotion_inventory_item_detail import (
+    PromotionInventoryItemDetailModel,
+)
+from src.models.promotion_manufactured_item_detail import (
+    PromotionManufacturedItemDetailModel,
+)
+from src.models.user import UserModel, UserRole
+from src.utils.auth import create_access_token
+
+INGREDIENTS = 40
+PRODUCTS = 30
+PROMOTIONS = 20
+CUSTOMERS = 50
+PORT = 8099
+COUNTS_DIR_ENV = "ORDER_BENCH_COUNTS_DIR"
+
+
+class QueryCounter:
+    """Cuenta las consultas y los deadlocks que pasan por el engine."""
+
+    def __init__(self, engine) -> None:
+        self.queries = 0
+        self.deadlocks = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_execute(self, *_: Any) -> None:
+        self.queries += 1
+
+    def _on_error(self, context) -> None:
+        if isinstance(context.original_exception, DeadlockDetected):
+            self.deadlocks += 1
+
+    def reset(self) -> None:
+        self.queries = 0
+        self.deadlocks = 0
+
+    def dump(self, directory: str) -> None:
+        """Escribe los contadores del proceso en un archivo propio."""
+        with open(os.path.join(directory, f"{os.getpid()}.json"), "w") as file:
+            json.dump({"queries": self.queries, "deadlocks": self.deadlocks}, file)
+
+
+def create_counted_app() -> FastAPI:
+    """Aplicación de un worker de uvicorn, con el contador de consultas."""
+    from main import app
+
+    counter = QueryCounter(Database.engine)
+    # Las consultas del arranque del worker no cuentan.
+    app.add_event_handler("startup", counter.reset)
+    app.add_event_handler("shutdown", lambda: counter.dump(os.environ[COUNTS_DIR_ENV]))
+    return app
+
+
+def start_server(workers: int, counts_dir: str) -> subprocess.Popen:
+    """Levanta la API con uvicorn y espera a que responda."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.order_creation:create_counted_app",
+            "--factory",
+            "--workers",
+            str(workers),
+            "--port",
+            str(PORT),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, COUNTS_DIR_ENV: counts_dir},
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://localhost:{PORT}/docs", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.5)
+    server.kill()
+    raise RuntimeError("La API no respondió a tiempo.")
+
+
+def stop_server(server: subprocess.Popen, counts_dir: str) -> Dict[str, int]:
+    """Detiene la API y suma los contadores que escribió cada worker."""
+    server.send_signal(signal.SIGINT)
+    server.wait(timeout=60)
+    totals = {"queries": 0, "deadlocks": 0}
+    for name in os.listdir(counts_dir):
+        with open(os.path.join(counts_dir, name)) as file:
+            for key, value in json.load(file).items():
+                totals[key] += value
+    return totals
+
+
+def seed_catalog(session: Session, manufactured_items: int) -> Dict[str, Any]:
+    """Crea un catálogo con ingredientes compartidos, productos y promociones.
+
+    El stock de los ingredientes alcanza sólo para una parte de los pedidos,
+    así los pedidos concurrentes compiten por las mismas filas.
+    """
+    random.seed(42)
+    tag = uuid.uuid4().hex[:8]
+
+    inventory_category = InventoryItemCategoryModel(
+        name=f"bench-{tag}", description="Benchmark", public=True
+    )
+    manufactured_category = ManufacturedItemCategoryModel(
+        name=f"bench-{tag}", description="Benchmark"
+    )
+    session.add_all([inventory_category, manufactured_category])
+    session.flush()
+
+    ingredients = [
+        InventoryItemModel(
+            name=f"bench-{tag}-ingrediente-{index}",
+            current_stock=random.randint(200, 600),
+            minimum_stock=0,
+            price=0,
+            purchase_cost=10,
+            is_ingredient=True,
+            category_id=inventory_category.id_key,
+        )
+        for index in range(INGREDIENTS)
+    ]
+    products = [
+        InventoryItemModel(
+            name=f"bench-{tag}-producto-{index}",
+            current_stock=random.randint(50, 150),
+            minimum_stock=0,
+            price=random.randint(500, 3000),
+            purchase_cost=100,
+            is_ingredient=False,
+            category_id=inventory_category.id_key,
+        )
+        for index in range(PRODUCTS)
+    ]
+    items = [
+        ManufacturedItemModel(
+            name=f"bench-{tag}-plato-{index}",
+            description="Benchmark",
+            preparation_time=random.choice([5, 10, 15, 20]),
+            price=random.randint(2000, 12000),
+            category_id=manufactured_category.id_key,
+        )
+        for index in range(manufactured_items)
+    ]
+    session.add_all(ingredients + products + items)
+    session.flush()
+
+    session.add_all(
+        ManufacturedItemDetailModel(
+            manufactured_item_id=item.id_key,
+            inventory_item_id=ingredient.id_key,
+            quantity=random.randint(1, 3),
+        )
+        for item in items
+        for ingredient in random.sample(ingredients, random.randint(2, 5))
+    )
+
+    promotions = [
+        PromotionModel(
+            name=f"bench-{tag}-promo-{index}",
+            description="Benchmark",
+            discount_percentage=random.choice([10, 15, 20]),
+        )
+        for index in range(PROMOTIONS)
+    ]
+    session.add_all(promotions)
+    session.flush()
+
+    for promotion in promotions:
+        session.add_all(
+            PromotionManufacturedItemDetailModel(
+                promotion_id=promotion.id_key,
+                manufactured_item_id=item.id_key,
+                quantity=random.randint(1, 2),
+            )
+            for item in random.sample(items, random.randint(2, 4))
+        )
+        session.add(
+            PromotionInventoryItemDetailModel(
+                promotion_id=promotion.id_key,
+                inventory_item_id=random.choice(products).id_key,
+                quantity=1,
+            )
+        )
+
+    customers = [
+        UserModel(
+            full_name=f"Cliente {index}",
+            email=f"bench-{tag}-{index}@example.com",
+            role=UserRole.cliente,
+        )
+        for index in range(CUSTOMERS)
+    ]
+    session.add_all(customers)
+    session.commit()
+
+    return {
+        "ingredient_ids": [item.id_key for item in ingredients + products],
+        "manufactured_item_ids": [item.id_key for item in items],
+        "product_ids": [item.id_key for item in products],
+        "promotion_ids": [promotion.id_key for promotion in promotions],
+        "tokens": [
+            create_access_token(user.email, user.id_key, UserRole.cliente.value)
+            for user in customers
+        ],
+    }
+
+
+def build_order(catalog: Dict[str, Any]) -> Dict[str, Any]:
+    """Arma un pedido de retiro en local con platos, productos y promociones."""
+    return {
+        "delivery_method": "pickup",
+        "payment_method": "cash",
+        "details": [
+            {"manufactured_item_id": item_id, "quantity": random.randint(1, 3)}
+            for item_id in random.sample(
+                catalog["manufactured_item_ids"], random.randint(1, 4)
+            )
+        ],
+        "inventory_details": [
+            {"inventory_item_id": item_id, "quantity": 1}
+            for item_id in random.sample(catalog["product_ids"], random.randint(0, 2))
+        ],
+        "promotion_details": [
+            {"promotion_id": promotion_id, "quantity": 1}
+            for promotion_id in random.sample(
+                catalog["promotion_ids"], random.randint(0, 1)
+            )
+        ],
+    }
+
+
+async def fire_orders(
+    catalog: Dict[str, Any], total_orders: int, concurrency: int
+) -> Tuple[List[float], Dict[int, int], float]:
+    """Envía los pedidos por HTTP con un límite de solicitudes en vuelo."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    status_codes: Dict[int, int] = {}
+
+    async with httpx.AsyncClient(
+        base_url=f"http://localhost:{PORT}",
+        limits=httpx.Limits(max_connections=concurrency),
+        timeout=60,
+    ) as client:
+
+        async def send(payload: Dict[str, Any]) -> None:
+            headers = {"Authorization": f"Bearer {random.choice(catalog['tokens'])}"}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/order/generate", json=payload, headers=headers
+                )
+                latencies.append(time.perf_counter() - start)
+            status_codes[response.status_code] = (
+                status_codes.get(response.status_code, 0) + 1
+            )
+
+        payloads = [build_order(catalog) for _ in range(total_orders)]
+        start = time.perf_counter()
+        await asyncio.gather(*(send(payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+
+    return latencies, status_codes, elapsed
+
+
+def read_stock(engine, inventory_item_ids: List[int]) -> Dict[str, float]:
+    """Lee el stock de los items directamente de la base.
+
+    Si existe el libro de movimientos, se suman los movimientos que todavía no
+    se compactaron en ``current_stock``.
+    """
+    stock = "item.current_stock"
+    if inspect(engine).has_table("inventory_movement"):
+        stock += (
+            " + COALESCE((SELECT SUM(movement.quantity) FROM inventory_movement"
+            " AS movement WHERE movement.inventory_item_id = item.id_key"
+            " AND NOT movement.compacted), 0)"
+        )
+    stmt = text(
+        f"SELECT item.name, {stock} FROM inventory_item AS item"
+        " WHERE item.id_key IN :ids"
+    ).bindparams(bindparam("ids", expanding=True))
+    with engine.connect() as connection:
+        return dict(connection.execute(stmt, {"ids": inventory_item_ids}).all())
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    total_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    manufactured_items = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    engine = Database.engine
+    BaseModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        catalog = seed_catalog(session, manufactured_items)
+
+    with tempfile.TemporaryDirectory() as counts_dir:
+        server = start_server(workers, counts_dir)
+        try:
+            latencies, status_codes, elapsed = asyncio.run(
+                fire_orders(catalog, total_orders, concurrency)
+            )
+        finally:
+            counts = stop_server(server, counts_dir)
+
+    created = status_codes.get(200, 0)
+    stock = read_stock(engine, catalog["ingredient_ids"])
+    oversold = sorted(name for name, quantity in stock.items() if quantity < 0)
+
+    print(
+        f"{total_orders} pedidos, concurrencia {concurrency}, "
+        f"{manufactured_items} platos, {workers} workers"
+    )
+    print(f"respuestas         {dict(sorted(status_codes.items()))}")
+    print(f"pedidos/seg        {created / elapsed:10.1f}")
+    print(f"p50                {percentile(latencies, 0.50) * 1000:10.1f} ms")
+    print(f"p99                {percentile(latencies, 0.99) * 1000:10.1f} ms")
+    print(f"consultas/solicitud {counts['queries'] / total_orders:9.1f}")
+    print(f"deadlocks          {counts['deadlocks']:10d}")
+    print(f"items sobrevendidos {len(oversold):9d}")
+    for name in oversold:
+        print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark de inicios de sesión concurrentes contra lecturas del catálogo.
+
+Arma una aplicación mínima con un endpoint de login que verifica la
+contraseña con bcrypt y otro que simula una lectura del catálogo, y mide los
+logins por segundo y la latencia de las lecturas: primero verificando dentro
+del handler (como antes) y después con el pool de hilos de
+``PasswordHasher``. Los logins rechazados por la cola llena (503) se informan
+aparte.
+
+Uso: python -m benchmarks.password_hashing [logins] [lecturas] [costo]
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from src.config.settings import settings
+from src.services.password_hasher import (
+    PasswordHasher,
+    PasswordHashQueueFullError,
+    hash_password_sync,
+    verify_password_sync,
+)
+
+READ_INTERVAL = 0.005
+PASSWORD = "una-contraseña-de-prueba"
+
+
+def build_app(hashed_password: str, use_pool: bool) -> FastAPI:
+    """Aplicación con un login y una lectura de catálogo."""
+    app = FastAPI()
+    catalog = [{"id_key": index, "name": f"Plato {index}"} for index in range(50)]
+
+    @app.post("/login")
+    async def login() -> Dict[str, bool]:
+        if use_pool:
+            try:
+                valid = await PasswordHasher().verify(PASSWORD, hashed_password)
+            except PasswordHashQueueFullError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+        else:
+            valid = verify_password_sync(PASSWORD, hashed_password)
+        return {"valid": valid}
+
+    @app.get("/catalog")
+    async def read_catalog() -> List[Dict[str, Any]]:
+        return catalog
+
+    return app
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_scenario(label: str, app: FastAPI, logins: int, reads: int) -> None:
+    """Lanza los logins y las lecturas a la vez y muestra los resultados."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.post("/login")
+        read_latencies: List[float] = []
+        statuses: List[int] = []
+
+        async def login() -> None:
+            response = await client.post("/login")
+            statuses.append(response.status_code)
+
+        async def read(scheduled_at: float) -> None:
+            # La latencia se mide desde el momento programado: si el event loop
+            # está bloqueado, la lectura arranca tarde y eso también cuenta.
+            await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+            await client.get("/catalog")
+            read_latencies.append(time.perf_counter() - scheduled_at)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(login() for _ in range(logins)),
+            *(read(start + index * READ_INTERVAL) for index in range(reads)),
+        )
+        elapsed = time.perf_counter() - start
+
+    accepted = statuses.count(200)
+    print(
+        f"{label:<20} {accepted / elapsed:7.1f} logins/seg"
+        f"   rechazados {statuses.count(503):4d}"
+        f"   catálogo p50 {percentile(read_latencies, 0.5) * 1000:8.1f} ms"
+        f"   p99 {percentile(read_latencies, 0.99) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else PasswordHasher.rounds()
+    settings.password_hash_rounds = rounds
+    hashed_password = hash_password_sync(PASSWORD, rounds)
+
+    print(
+        f"{logins} logins y {reads} lecturas concurrentes, costo {rounds}, "
+        f"cola de {settings.password_hash_queue_size}"
+    )
+    asyncio.run(
+        run_scenario(
+            "en el event loop",
+            build_app(hashed_password, use_pool=False),
+            logins,
+            reads,
+        )
+    )
+    asyncio.run(
+        run_scenario(
+            "pool de hilos",
+            build_app(hashed_password, use_pool=True),
+            logins,
+            reads,
+        )
+    )
+    PasswordHasher().shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark de descargas de PDF concurrentes contra lecturas del catálogo.
+
+Arma una aplicación mínima con un endpoint que genera un PDF de factura y otro
+que simula una lectura del catálogo, y mide la latencia de las lecturas
+mientras hay descargas en curso: primero generando el PDF dentro del handler
+(como antes) y después con el pool de procesos de ``PdfRenderer``.
+
+Uso: python -m benchmarks.pdf_rendering [descargas] [lecturas] [items_por_factura]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI, Response
+
+from src.services.pdf_renderer import PdfRenderer
+from src.utils.reportlab import render_pdf_report
+
+READ_INTERVAL = 0.005
+
+
+def build_invoice(items: int) -> Dict[str, Any]:
+    """Arma los datos de una factura con varias líneas."""
+    return {
+        "number": "INV-20250101-ABCDEF",
+        "date": datetime(2025, 1, 1, 12, 0),
+        "user_name": "Cliente de prueba",
+        "items": [
+            {
+                "name": f"Producto {index}",
+                "quantity": 2,
+                "unit_price": 1500.0,
+                "type": "Manufacturado",
+                "total": 3000.0,
+            }
+            for index in range(items)
+        ],
+        "subtotal": 3000.0 * items,
+        "discount": 0.0,
+        "total": 3000.0 * items,
+    }
+
+
+def build_app(invoice_data: Dict[str, Any], use_pool: bool) -> FastAPI:
+    """Aplicación con una descarga de PDF y una lectura de catálogo."""
+    app = FastAPI()
+    catalog = [{"id_key": index, "name": f"Plato {index}"} for index in range(50)]
+
+    @app.get("/pdf")
+    async def download_pdf() -> Response:
+        if use_pool:
+            pdf_data = await PdfRenderer().render(invoice_data, "Factura")
+        else:
+            pdf_data = render_pdf_report(invoice_data, "Factura")
+        return Response(pdf_data, media_type="application/pdf")
+
+    @app.get("/catalog")
+    async def read_catalog() -> List[Dict[str, Any]]:
+        return catalog
+
+    return app
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_scenario(label: str, app: FastAPI, downloads: int, reads: int) -> None:
+    """Lanza las descargas y las lecturas a la vez y muestra los resultados."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.get("/pdf")
+        read_latencies: List[float] = []
+
+        async def download() -> None:
+            await client.get("/pdf")
+
+        async def read(scheduled_at: float) -> None:
+            # La latencia se mide desde el momento programado: si el event loop
+            # está bloqueado, la lectura arranca tarde y eso también cuenta.
+            await asyncio.sleep(max(0.0, scheduled_at - time.perf_counter()))
+            await client.get("/catalog")
+            read_latencies.append(time.perf_counter() - scheduled_at)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(download() for _ in range(downloads)),
+            *(read(start + index * READ_INTERVAL) for index in range(reads)),
+        )
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<20} {downloads / elapsed:7.1f} PDFs/seg"
+        f"   catálogo p50 {percentile(read_latencies, 0.5) * 1000:8.1f} ms"
+        f"   p99 {percentile(read_latencies, 0.99) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    downloads = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    items = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    invoice_data = build_invoice(items)
+
+    print(f"{downloads} descargas y {reads} lecturas concurrentes, {items} líneas")
+    asyncio.run(
+        run_scenario(
+            "en el event loop",
+            build_app(invoice_data, use_pool=False),
+            downloads,
+            reads,
+        )
+    )
+    asyncio.run(
+        run_scenario(
+            "pool de procesos",
+            build_app(invoice_data, use_pool=True),
+            downloads,
+            reads,
+        )
+    )
+    PdfRenderer().shutdown()
+
+
+if __name__ == "__main__":
+    main()
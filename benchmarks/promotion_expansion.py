@@ -0,0 +1,103 @@
+"""Benchmark de la expansión de promociones para pedidos de catering grandes.
+
+Uso: python -m benchmarks.promotion_expansion [lineas_de_promocion] [items_por_promocion]
+"""
+
+import random
+import sys
+import time
+from collections import namedtuple
+from typing import Dict, List
+
+from src.schemas.order_detail import CreateOrderDetailSchema
+from src.services.promotion_expansion import PromotionExpansionService
+
+Row = namedtuple(
+    "Row",
+    [
+        "promotion_id",
+        "discount_percentage",
+        "item_type",
+        "item_id",
+        "quantity",
+        "price",
+    ],
+)
+
+
+def build_rows(promotion_lines: int, items_per_promotion: int) -> List[Row]:
+    """Genera filas de promociones que comparten items entre sí."""
+    random.seed(42)
+    item_pool = max(items_per_promotion * 4, promotion_lines)
+    rows = []
+    for promotion_id in range(1, promotion_lines + 1):
+        discount = random.choice([5.0, 10.0, 15.0, 20.0])
+        for item_id in random.sample(range(1, item_pool + 1), items_per_promotion):
+            item_type = "manufactured" if item_id % 3 else "inventory"
+            rows.append(
+                Row(promotion_id, discount, item_type, item_id, 2, 1000.0 + item_id)
+            )
+    return rows
+
+
+def legacy_merge(rows: List[Row], quantities: Dict[int, int]) -> list:
+    """Reproduce el agrupamiento anterior con búsqueda lineal por item."""
+    expanded_details: List[CreateOrderDetailSchema] = []
+    for row in rows:
+        discounted_price = row.price * (1 - row.discount_percentage / 100)
+        total_quantity = row.quantity * quantities[row.promotion_id]
+        existing_detail = next(
+            (
+                detail
+                for detail in expanded_details
+                if detail.manufactured_item_id == (row.item_id, row.item_type)
+            ),
+            None,
+        )
+        if existing_detail:
+            combined_quantity = existing_detail.quantity + total_quantity
+            existing_detail.unit_price = (
+                existing_detail.unit_price * existing_detail.quantity
+                + discounted_price * total_quantity
+            ) / combined_quantity
+            existing_detail.quantity = combined_quantity
+        else:
+            expanded_details.append(
+                CreateOrderDetailSchema.model_construct(
+                    manufactured_item_id=(row.item_id, row.item_type),
+                    quantity=total_quantity,
+                    unit_price=discounted_price,
+                )
+            )
+    return expanded_details
+
+
+def measure(label: str, func, repeat: int = 5) -> None:
+    """Ejecuta una función varias veces y muestra el mejor tiempo."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<10} {best * 1000:10.2f} ms")
+
+
+def main() -> None:
+    promotion_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    items_per_promotion = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rows = build_rows(promotion_lines, items_per_promotion)
+    quantities = {row.promotion_id: 3 for row in rows}
+
+    print(
+        f"{promotion_lines} promociones, {len(rows)} filas, "
+        f"{len({(r.item_type, r.item_id) for r in rows})} items distintos"
+    )
+    measure("lineal", lambda: legacy_merge(rows, quantities))
+    measure(
+        "indexado",
+        lambda: PromotionExpansionService.merge_rows(rows, quantities),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Servidor SMTP local que acepta y descarta los mensajes, para benchmarks.
+
+Simula el costo de abrir una sesión (TCP + TLS + AUTH) con una demora al
+conectar y el tiempo de ida y vuelta de cada comando con otra demora.
+
+Uso: python -m benchmarks.smtp_server [puerto] [demora_conexion_ms] [demora_comando_ms]
+"""
+
+import asyncio
+import sys
+
+
+class SinkSMTPServer:
+    """Servidor SMTP mínimo que cuenta los mensajes recibidos."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_delay: float = 0.0,
+        command_delay: float = 0.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.connect_delay = connect_delay
+        self.command_delay = command_delay
+        self.messages = 0
+        self.connections = 0
+        self._server = None
+
+    async def start(self) -> None:
+        """Empieza a escuchar. Con puerto 0 se elige uno libre."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Deja de aceptar conexiones."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Atiende una sesión SMTP."""
+        self.connections += 1
+        await asyncio.sleep(self.connect_delay)
+
+        async def reply(line: str) -> None:
+            await asyncio.sleep(self.command_delay)
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 localhost ESMTP benchmark")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode(errors="replace").strip().upper()
+
+                if command.startswith("EHLO"):
+                    writer.write(b"250-localhost\r\n250-8BITMIME\r\n")
+                    await reply("250 SIZE 52428800")
+                elif command.startswith("HELO"):
+                    await reply("250 localhost")
+                elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                    await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    self.messages += 1
+                    await reply("250 OK queued")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(port: int, connect_delay: float, command_delay: float) -> None:
+    """Ejecuta el servidor hasta que se interrumpe."""
+    server = SinkSMTPServer(
+        port=port, connect_delay=connect_delay, command_delay=command_delay
+    )
+    await server.start()
+    print(f"Servidor SMTP escuchando en {server.host}:{server.port}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        serve(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 1025,
+            (float(sys.argv[2]) if len(sys.argv) > 2 else 0) / 1000,
+            (float(sys.argv[3]) if len(sys.argv) > 3 else 0) / 1000,
+        )
+    )
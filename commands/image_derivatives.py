@@ -0,0 +1,18 @@
+"""Genera las variantes de las imágenes que no las tienen.
+
+Encola un trabajo por cada imagen de items o usuarios subida antes de que
+existieran las variantes; los workers de la API las generan después.
+
+Uso: python -m commands.image_derivatives
+"""
+
+from src.services.image_derivative import ImageDerivativeService
+
+
+def main() -> None:
+    count = ImageDerivativeService().schedule_missing()
+    print(f"{count} imágenes encoladas.")
+
+
+if __name__ == "__main__":
+    main()
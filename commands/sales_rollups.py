@@ -0,0 +1,69 @@
+"""Mantenimiento de los acumulados diarios de los reportes.
+
+``backfill`` recalcula los acumulados desde las tablas originales, de a bloques
+de días para no armar una transacción enorme. ``check`` los compara con lo que
+surge de las tablas originales y termina con código 1 si encuentra diferencias.
+Sin fechas se recorre todo el historial.
+
+La aplicación encola el recálculo de todo el historial la primera vez que
+arranca y, hasta que termina, calcula los reportes desde las tablas originales.
+Un ``backfill`` sin fechas que termina bien también lo marca como hecho; sirve
+para completarlo a mano si el trabajo falló.
+
+Uso: python -m commands.sales_rollups backfill|check [desde AAAA-MM-DD] [hasta AAAA-MM-DD]
+"""
+
+import sys
+from datetime import date
+from typing import Optional
+
+from src.services.sales_rollup import SalesRollupService, day_batches
+
+
+def parse_day(value: Optional[str]) -> Optional[date]:
+    """Interpreta una fecha AAAA-MM-DD."""
+    return date.fromisoformat(value) if value else None
+
+
+def main() -> None:
+    if len(sys.argv) < 2 or sys.argv[1] not in ("backfill", "check"):
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+
+    service = SalesRollupService()
+    start_day = parse_day(sys.argv[2] if len(sys.argv) > 2 else None)
+    end_day = parse_day(sys.argv[3] if len(sys.argv) > 3 else None)
+    full_history = start_day is None and end_day is None
+    start_day = start_day or service.get_first_day()
+    end_day = end_day or date.today()
+    if start_day is None:
+        print("No hay datos para procesar.")
+        if sys.argv[1] == "backfill":
+            service.mark_backfilled()
+        return
+
+    mismatches = 0
+    for batch_start, batch_end in day_batches(start_day, end_day):
+        if sys.argv[1] == "backfill":
+            service.backfill(batch_start, batch_end)
+            print(f"{batch_start} a {batch_end}: recalculado")
+            continue
+
+        for mismatch in service.check(batch_start, batch_end):
+            mismatches += 1
+            print(
+                f"{mismatch.table} {mismatch.key}: "
+                f"esperado {mismatch.expected}, guardado {mismatch.actual}"
+            )
+
+    if sys.argv[1] == "backfill" and full_history:
+        service.mark_backfilled()
+        print("Historial completo recalculado.")
+
+    if sys.argv[1] == "check":
+        print(f"{mismatches} diferencias entre {start_day} y {end_day}")
+        sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
+import asyncio
+from urllib.parse import urlparse
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.config.database import Database
@@ -24,13 +29,24 @@ from src.controllers.province import ProvinceController
 from src.controllers.report import ReportController
 from src.controllers.user import UserController
 from src.repositories.base_implementation import RecordNotFoundError
+from src.services.idempotency import IdempotencyService
+from src.services.image_uploader import ImageUploader
+from src.services.inventory_movement import InventoryMovementService
+from src.services.job_queue import JobQueue
+from src.services.kitchen_scheduler import KitchenScheduler
+from src.services.password_hasher import PasswordHasher, PasswordHashQueueFullError
+from src.services.pdf_renderer import PdfRenderer
+from src.services.sales_rollup import SalesRollupService
 from src.utils.exception_handlers import (
     global_exception_handler,
     http_exception_handler,
     integrity_error_handler,
     not_found_error_handler,
+    password_hash_queue_full_handler,
     value_error_handler,
 )
+from src.utils.mercado_pago import MercadoPagoClient
+from src.utils.smtp import SMTPConnectionPool
 
 db = Database()
 
@@ -56,6 +72,7 @@ app.add_middleware(
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RecordNotFoundError, not_found_error_handler)
 app.add_exception_handler(ValueError, value_error_handler)
+app.add_exception_handler(PasswordHashQueueFullError, password_hash_queue_full_handler)
 app.add_exception_handler(IntegrityError, integrity_error_handler)
 app.add_exception_handler(Exception, global_exception_handler)
 
@@ -80,9 +97,48 @@ app.include_router(InvoiceController().router, prefix="/invoice")
 app.include_router(ReportController().router, prefix="/reports")
 app.include_router(PromotionController().router, prefix="/promotion")
 
+if settings.image_storage_backend == "local":
+    app.mount(
+        urlparse(settings.image_public_base_url).path,
+        StaticFiles(directory=settings.image_storage_path, check_dir=False),
+        name="images",
+    )
+
 
 @app.on_event("startup")
 async def startup_event():
     """Check database connection on startup."""
     if not db.check_connection():
         print("WARNING: Could not connect to database. Some features may not work.")
+    else:
+        await run_in_threadpool(KitchenScheduler().reload)
+        await run_in_threadpool(SalesRollupService().schedule_backfill)
+
+    if settings.inventory_compaction_interval_seconds:
+        asyncio.create_task(
+            InventoryMovementService().run_compaction_loop(
+                settings.inventory_compaction_interval_seconds
+            )
+        )
+
+    if settings.idempotency_cleanup_interval_seconds:
+        asyncio.create_task(
+            IdempotencyService().run_cleanup_loop(
+                settings.idempotency_cleanup_interval_seconds
+            )
+        )
+
+    for _ in range(settings.job_workers or 0):
+        asyncio.create_task(
+            JobQueue().run_worker(settings.job_poll_interval_seconds or 5)
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled connections on shutdown."""
+    await SMTPConnectionPool().close()
+    await MercadoPagoClient().close()
+    PdfRenderer().shutdown()
+    PasswordHasher().shutdown()
+    ImageUploader().shutdown()
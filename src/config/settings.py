@@ -18,6 +18,11 @@ class Settings(BaseSettings):
     algorithm: Optional[str] = "HS256"
     access_token_expire_minutes: Optional[int] = 30
 
+    # Passwords
+    password_hash_rounds: Optional[int] = 12
+    password_hash_workers: Optional[int] = None
+    password_hash_queue_size: Optional[int] = 32
+
     # OAuth
     google_client_id: Optional[str] = None
     google_client_secret: Optional[str] = None
@@ -25,6 +30,18 @@ class Settings(BaseSettings):
 
     # Mercado Pago
     prod_access_token: Optional[str] = None
+    mp_api_base_url: Optional[str] = "https://api.mercadopago.com"
+    mp_timeout_seconds: Optional[float] = 10
+    mp_connect_timeout_seconds: Optional[float] = 3
+    mp_pool_size: Optional[int] = 20
+    mp_max_retries: Optional[int] = 2
+    mp_retry_base_seconds: Optional[float] = 0.2
+    mp_circuit_failure_threshold: Optional[int] = 5
+    mp_circuit_reset_seconds: Optional[float] = 30
+    mp_preference_ttl_minutes: Optional[int] = 60
+    mp_webhook_secret: Optional[str] = None
+    mp_webhook_tolerance_seconds: Optional[int] = 300
+    mp_notification_url: Optional[str] = None
 
     # Frontend
     frontend_url: Optional[str] = "http://localhost:5173"
@@ -32,6 +49,17 @@ class Settings(BaseSettings):
     # Cloudinary
     cloudinary_api_key: Optional[str] = None
 
+    # Images
+    image_storage_backend: Optional[str] = "cloudinary"
+    image_storage_path: Optional[str] = "storage/images"
+    image_public_base_url: Optional[str] = "http://localhost:8000/images"
+    image_placeholder_url: Optional[str] = "https://placehold.co/600x400?text=Cargando"
+    image_upload_workers: Optional[int] = 4
+    image_upload_max_bytes: Optional[int] = 5 * 1024 * 1024
+    image_thumbnail_size: Optional[int] = 240
+    image_medium_size: Optional[int] = 720
+    image_derivative_quality: Optional[int] = 80
+
     # Email
     smtp_host: Optional[str] = "localhost"
     smtp_port: Optional[int] = 1025
@@ -39,9 +67,44 @@ class Settings(BaseSettings):
     smtp_password: Optional[str] = None
     smtp_use_tls: Optional[bool] = False
     from_email: Optional[str] = "noreply@elbuensabor.com"
+    smtp_pool_size: Optional[int] = 4
+    smtp_max_messages_per_connection: Optional[int] = 100
+    smtp_idle_check_seconds: Optional[int] = 30
+    smtp_timeout_seconds: Optional[float] = 30
+
+    # Documents
+    document_store_backend: Optional[str] = "local"
+    document_store_path: Optional[str] = "storage/documents"
+    pdf_render_workers: Optional[int] = None
+    pdf_render_queue_size: Optional[int] = 32
+    invoice_export_window: Optional[int] = 8
+
+    # Reports
+    report_spool_max_bytes: Optional[int] = 10 * 1024 * 1024
+    report_cache_ttl_seconds: Optional[int] = 60
+    report_cache_max_entries: Optional[int] = 256
+
+    # Inventory
+    inventory_compaction_interval_seconds: Optional[int] = 60
+
+    # Kitchen
+    kitchen_backlog_refresh_seconds: Optional[int] = 300
+
+    # Idempotency
+    idempotency_key_ttl_hours: Optional[int] = 24
+    idempotency_cleanup_interval_seconds: Optional[int] = 3600
+    idempotency_claim_timeout_seconds: Optional[int] = 120
+
+    # Jobs
+    job_workers: Optional[int] = 2
+    job_poll_interval_seconds: Optional[float] = 5
+    job_max_attempts: Optional[int] = 5
+    job_retry_base_seconds: Optional[int] = 30
+    job_lock_timeout_seconds: Optional[int] = 300
 
     # Misc
     pickup_discount: Optional[float] = 0.1
+    app_timezone: Optional[str] = "America/Argentina/Buenos_Aires"
 
     class Config:
         env_file = ".env"
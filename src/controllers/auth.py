@@ -9,6 +9,7 @@ from src.config.auth import oauth
 from src.config.settings import settings
 from src.schemas.auth import GoogleUser, LoginRequest, RegisterRequest
 from src.schemas.user import ResponseUserSchema
+from src.services.password_hasher import PasswordHasher
 from src.services.user import UserService
 from src.utils.auth import authenticate_user, create_access_token
 
@@ -19,17 +20,20 @@ class AuthController:
     def __init__(self):
         self.router = APIRouter(tags=["Auth"])
         self.user_service = UserService()
+        self.password_hasher = PasswordHasher()
 
         @self.router.post("/register", response_model=ResponseUserSchema)
         async def register(new_user: RegisterRequest) -> ResponseUserSchema:
             """Registra un nuevo usuario en el sistema"""
+            if not self.password_hasher.is_hashed(new_user.password):
+                new_user.password = await self.password_hasher.hash(new_user.password)
             return self.user_service.save(new_user)
 
         @self.router.post("/login")
         async def login(user: LoginRequest) -> Dict[str, str | bool]:
             """Inicia sesión de un usuario y devuelve un token de acceso"""
-            authenticated_user = authenticate_user(
-                user.email, user.password, self.user_service
+            authenticated_user = await authenticate_user(
+                user.email, user.password, self.user_service, self.password_hasher
             )
             if not authenticated_user:
                 raise HTTPException(
@@ -65,7 +65,7 @@ class BaseControllerImplementation(Generic[S, C], BaseController[S]):
             _: Dict[str, Any] = Depends(role_dependency),
         ) -> S:
             """Guarda un nuevo registro"""
-            return self.save(schema_in)
+            return self.save(await self.prepare_schema(schema_in))
 
         @self.router.put("/{id_key}", response_model=self.response_schema)
         async def update(
@@ -74,7 +74,7 @@ class BaseControllerImplementation(Generic[S, C], BaseController[S]):
             _: Dict[str, Any] = Depends(role_dependency),
         ) -> S:
             """Actualiza un registro existente por su ID"""
-            return self.update(id_key, schema_in)
+            return self.update(id_key, await self.prepare_schema(schema_in))
 
         @self.router.delete("/{id_key}")
         async def delete(
@@ -101,6 +101,14 @@ class BaseControllerImplementation(Generic[S, C], BaseController[S]):
         """Obtiene un registro por su ID"""
         return self.service.get_one(id_key)
 
+    async def prepare_schema(self, schema: C) -> C:
+        """Prepara el esquema recibido antes de guardarlo o actualizarlo.
+
+        Los controladores que necesitan trabajo asíncrono previo (por ejemplo,
+        hashear una contraseña fuera del event loop) lo sobrescriben.
+        """
+        return schema
+
     def save(self, schema: C) -> S:
         """Guarda un nuevo registro"""
         return self.service.save(schema)
@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
+from src.config.settings import settings
 from src.controllers.base_implementation import BaseControllerImplementation
 from src.models.user import UserRole
 from src.schemas.inventory_item import (
@@ -9,7 +11,10 @@ from src.schemas.inventory_item import (
     ResponseInventoryItemSchema,
 )
 from src.schemas.pagination import PaginatedResponseSchema
+from src.services.image_uploader import ImageUploader
 from src.services.inventory_item import InventoryItemService
+from src.services.inventory_movement import InventoryMovementService
+from src.utils.multipart_upload import receive_image_upload
 from src.utils.rbac import has_role
 
 
@@ -23,6 +28,8 @@ class InventoryItemController(BaseControllerImplementation):
             service=InventoryItemService(),
             tags=["Inventory Item"],
         )
+        self.inventory_movement_service = InventoryMovementService()
+        self.image_uploader = ImageUploader()
 
         @self.router.get("/products/all", response_model=PaginatedResponseSchema)
         def get_product_inventory_items(
@@ -92,3 +99,47 @@ class InventoryItemController(BaseControllerImplementation):
                 limit=limit,
                 items=paginated_items,
             )
+
+        @self.router.get("/{id_key}/movements", response_model=PaginatedResponseSchema)
+        def get_inventory_item_movements(
+            id_key: int,
+            offset: int = 0,
+            limit: int = 10,
+            _: Dict[str, Any] = Depends(
+                has_role([UserRole.administrador, UserRole.cocinero])
+            ),
+        ) -> PaginatedResponseSchema:
+            """Obtiene el historial de movimientos de stock de un item."""
+            return self.inventory_movement_service.get_by_inventory_item(
+                id_key, offset, limit
+            )
+
+        @self.router.get("/{id_key}/stock-at")
+        def get_inventory_item_stock_at(
+            id_key: int,
+            date: datetime,
+            _: Dict[str, Any] = Depends(
+                has_role([UserRole.administrador, UserRole.cocinero])
+            ),
+        ) -> Dict[str, Any]:
+            """Obtiene el stock que tenía un item en una fecha determinada."""
+            return {
+                "inventory_item_id": id_key,
+                "date": date,
+                "stock": self.inventory_movement_service.get_stock_at(id_key, date),
+            }
+
+        @self.router.post("/image")
+        async def upload_image(
+            request: Request,
+            _: Dict[str, Any] = Depends(
+                has_role([UserRole.administrador, UserRole.cocinero])
+            ),
+        ) -> Dict[str, str]:
+            """Sube la imagen de un item del inventario y devuelve su URL."""
+            file = await receive_image_upload(
+                request, settings.image_upload_max_bytes or 5 * 1024 * 1024
+            )
+            return {
+                "image_url": await self.image_uploader.store(file, "inventory_items")
+            }
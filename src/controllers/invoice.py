@@ -1,15 +1,17 @@
-import io
+from datetime import datetime
+from typing import List
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.models.invoice import InvoiceType
 from src.models.user import UserRole
 from src.schemas.invoice import ResponseInvoiceSchema
 from src.schemas.pagination import PaginatedResponseSchema
 from src.services.invoice import InvoiceService
+from src.services.pdf_renderer import RenderQueueFullError
 from src.utils.rbac import get_current_user, has_role
-from src.utils.reportlab import generate_pdf_report
 
 
 class InvoiceController:
@@ -42,51 +44,66 @@ class InvoiceController:
         @self.router.get("/report/{id_key}")
         async def get_invoice_report(
             id_key: int, _: dict = Depends(get_current_user)
-        ) -> StreamingResponse:
-            """Genera un reporte PDF de la factura o nota de crédito."""
+        ) -> Response:
+            """Descarga el PDF de la factura o nota de crédito.
+
+            El PDF se genera una sola vez y las descargas siguientes se sirven
+            desde el almacenamiento de documentos.
+            """
             invoice = self.service.get_one(id_key)
+            try:
+                document_key = await self.service.get_document_key(invoice, wait=False)
+            except RenderQueueFullError as e:
+                raise HTTPException(
+                    status_code=503, detail=str(e), headers={"Retry-After": "5"}
+                )
 
-            invoice_items = [
-                {
-                    "name": detail.item_name,
-                    "quantity": detail.quantity,
-                    "unit_price": detail.unit_price,
-                    "type": detail.item_type,
-                    "total": detail.subtotal,
-                }
-                for detail in invoice.details
-            ]
-
-            invoice_data = {
-                "number": invoice.number,
-                "date": invoice.date,
-                "user_name": invoice.order.user.full_name,
-                "items": invoice_items,
-                "subtotal": invoice.order.total,
-                "discount": invoice.order.discount,
-                "total": invoice.total,
-            }
-
-            report_type = (
-                "Factura"
-                if invoice.type == InvoiceType.factura.value
-                else "Nota de Crédito"
-            )
             filename = (
                 f"{'invoice' if invoice.type == InvoiceType.factura.value else 'credit_note'}"
                 f"_{id_key}.pdf"
             )
 
-            buffer = io.BytesIO()
-            generate_pdf_report(invoice_data, buffer, report_type)
-            buffer.seek(0)
+            path = self.service.document_store.local_path(document_key)
+            if path:
+                return FileResponse(
+                    path, media_type="application/pdf", filename=filename
+                )
 
-            return StreamingResponse(
-                buffer,
+            return Response(
+                content=self.service.document_store.get(document_key),
                 media_type="application/pdf",
                 headers={"Content-Disposition": f"attachment; filename={filename}"},
             )
 
+        @self.router.get("/export")
+        async def export_invoices(
+            start_date: datetime = Query(None),
+            end_date: datetime = Query(None),
+            ids: List[int] = Query(None),
+            _: dict = Depends(has_role([UserRole.administrador, UserRole.cajero])),
+        ) -> StreamingResponse:
+            """Descarga un ZIP con los PDFs de las facturas pedidas."""
+            if not start_date and not end_date and not ids:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Se debe indicar un rango de fechas o una lista de facturas.",
+                )
+
+            invoice_ids = await run_in_threadpool(
+                self.service.get_export_ids, start_date, end_date, ids
+            )
+            if not invoice_ids:
+                raise HTTPException(
+                    status_code=404,
+                    detail="No se encontraron facturas para exportar.",
+                )
+
+            return StreamingResponse(
+                self.service.stream_documents_zip(invoice_ids),
+                media_type="application/zip",
+                headers={"Content-Disposition": "attachment; filename=facturas.zip"},
+            )
+
         @self.router.get("/search", response_model=PaginatedResponseSchema)
         async def search_invoices(
             search_term: str,
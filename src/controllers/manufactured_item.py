@@ -1,11 +1,20 @@
+from typing import Any, Dict
+
+from fastapi import Depends, Request
+
+from src.config.settings import settings
 from src.controllers.base_implementation import BaseControllerImplementation
+from src.models.user import UserRole
 from src.schemas.manufactured_item import (
     CreateManufacturedItemSchema,
     ResponseManufacturedItemSchema,
     ResponseManufacturedItemWithAvailabilitySchema,
 )
 from src.schemas.pagination import PaginatedResponseSchema
+from src.services.image_uploader import ImageUploader
 from src.services.manufactured_item import ManufacturedItemService
+from src.utils.multipart_upload import receive_image_upload
+from src.utils.rbac import has_role
 
 
 class ManufacturedItemController(BaseControllerImplementation):
@@ -18,6 +27,7 @@ class ManufacturedItemController(BaseControllerImplementation):
             service=ManufacturedItemService(),
             tags=["Manufactured Item"],
         )
+        self.image_uploader = ImageUploader()
 
         @self.router.get("/products/all", response_model=PaginatedResponseSchema)
         def get_public_products(
@@ -35,3 +45,18 @@ class ManufacturedItemController(BaseControllerImplementation):
         ) -> ResponseManufacturedItemWithAvailabilitySchema:
             """Endpoint publico para un producto por ID."""
             return self.service.get_one(id_key)
+
+        @self.router.post("/image")
+        async def upload_image(
+            request: Request,
+            _: Dict[str, Any] = Depends(
+                has_role([UserRole.administrador, UserRole.cocinero])
+            ),
+        ) -> Dict[str, str]:
+            """Sube la imagen de un item manufacturado y devuelve su URL."""
+            file = await receive_image_upload(
+                request, settings.image_upload_max_bytes or 5 * 1024 * 1024
+            )
+            return {
+                "image_url": await self.image_uploader.store(file, "manufactured_items")
+            }
@@ -1,17 +1,41 @@
-from typing import Any, Dict
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import Depends, HTTPException
+from fastapi import (
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+from starlette.status import WS_1008_POLICY_VIOLATION
 
+from src.config.settings import settings
 from src.controllers.base_implementation import BaseControllerImplementation
 from src.models.order import DeliveryMethod, OrderStatus, PaymentMethod
 from src.models.user import UserRole
+from src.schemas.kitchen_schedule import KitchenScheduleSchema
 from src.schemas.order import CreateOrderSchema, ResponseOrderSchema
 from src.schemas.pagination import PaginatedResponseSchema
 from src.services.address import AddressService
+from src.services.idempotency import IdempotencyService
 from src.services.inventory_item import InventoryItemService
 from src.services.invoice import InvoiceService
+from src.services.mp_webhook import MpWebhookService
 from src.services.order import OrderService
-from src.utils.rbac import get_current_user, has_role
+from src.services.order_events import OrderEventBroker
+from src.utils.mercado_pago import (
+    MercadoPagoError,
+    MercadoPagoUnavailableError,
+    verify_webhook_signature,
+)
+from src.utils.rbac import get_current_user, get_user_from_token, has_role
+
+KEEP_ALIVE_SECONDS = 15
 
 
 class OrderController(
@@ -35,62 +59,79 @@ class OrderController(
         self.invoice_service = InvoiceService()
         self.address_service = AddressService()
         self.inventory_item_service = InventoryItemService()
+        self.order_event_broker = OrderEventBroker()
+        self.idempotency_service = IdempotencyService()
+        self.mp_webhook_service = MpWebhookService()
 
         @self.router.post("/generate", response_model=ResponseOrderSchema)
         async def create_order(
             order: CreateOrderSchema,
             current_user: Dict[str, Any] = Depends(get_current_user),
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
         ) -> ResponseOrderSchema:
             """Genera un nuevo pedido."""
-            if (
-                not order.details
-                and not order.inventory_details
-                and not order.promotion_details
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail="El pedido debe tener al menos un detalle, un insumo o una promoción.",
-                )
 
-            for detail in order.inventory_details:
-                inventory_item = self.inventory_item_service.get_one(
-                    detail.inventory_item_id
-                )
-                if inventory_item.is_ingredient:
+            async def handle() -> ResponseOrderSchema:
+                if (
+                    not order.details
+                    and not order.inventory_details
+                    and not order.promotion_details
+                ):
                     raise HTTPException(
                         status_code=400,
-                        detail="Los items de inventario deben ser productos, no ingredientes.",
+                        detail=(
+                            "El pedido debe tener al menos un detalle, un insumo "
+                            "o una promoción."
+                        ),
                     )
 
-            order.user_id = current_user["id"]
+                for detail in order.inventory_details:
+                    inventory_item = self.inventory_item_service.get_one(
+                        detail.inventory_item_id
+                    )
+                    if inventory_item.is_ingredient:
+                        raise HTTPException(
+                            status_code=400,
+                            detail="Los items de inventario deben ser productos, no ingredientes.",
+                        )
 
-            if order.delivery_method == DeliveryMethod.pickup.value:
-                return self.service.save(order)
+                order.user_id = current_user["id"]
 
-            if not order.address_id:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Para pedidos con entrega, se debe proporcionar una direccion.",
-                )
+                if order.delivery_method == DeliveryMethod.pickup.value:
+                    return self.service.save(order)
 
-            if order.payment_method != PaymentMethod.mercado_pago.value:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Mercado Pago debe ser el metodo de pago para pedidos con entrega.",
-                )
+                if not order.address_id:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Para pedidos con entrega, se debe proporcionar una direccion.",
+                    )
 
-            user_addresses = self.address_service.get_all_by(
-                "user_id", order.user_id, offset=0, limit=10
-            )
-            if not any(
-                addr.id_key == order.address_id for addr in user_addresses.items
-            ):
-                raise HTTPException(
-                    status_code=403,
-                    detail="La direccion seleccionada no pertenece al usuario.",
+                if order.payment_method != PaymentMethod.mercado_pago.value:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Mercado Pago debe ser el metodo de pago para pedidos con entrega.",
+                    )
+
+                user_addresses = self.address_service.get_all_by(
+                    "user_id", order.user_id, offset=0, limit=10
                 )
+                if not any(
+                    addr.id_key == order.address_id for addr in user_addresses.items
+                ):
+                    raise HTTPException(
+                        status_code=403,
+                        detail="La direccion seleccionada no pertenece al usuario.",
+                    )
 
-            return self.service.save(order)
+                return self.service.save(order)
+
+            return await self.idempotency_service.execute(
+                idempotency_key,
+                current_user["id"],
+                "POST /order/generate",
+                order,
+                handle,
+            )
 
         @self.router.get("/status/{status}", response_model=PaginatedResponseSchema)
         async def get_by_status(
@@ -111,6 +152,81 @@ class OrderController(
             """Se obtienen los pedidos por estado."""
             return self.service.get_all_by("status", status, offset, limit)
 
+        @self.router.get("/kitchen/schedule", response_model=KitchenScheduleSchema)
+        async def get_kitchen_schedule(
+            _: Dict[str, Any] = Depends(
+                has_role([UserRole.administrador, UserRole.cajero, UserRole.cocinero])
+            ),
+        ) -> KitchenScheduleSchema:
+            """Obtiene el inicio y fin proyectados de cada pedido en cocina."""
+            return self.service.get_kitchen_schedule()
+
+        @self.router.get("/events/stream")
+        async def stream_order_events(
+            request: Request,
+            token: str,
+            statuses: Optional[List[OrderStatus]] = Query(None),
+        ) -> StreamingResponse:
+            """Envía los cambios de pedidos por Server-Sent Events.
+
+            El personal recibe los pedidos de los estados de su rol y los clientes
+            sólo los propios. El token va por query porque EventSource no envía headers.
+            """
+            current_user = get_user_from_token(token)
+
+            async def event_stream() -> AsyncIterator[str]:
+                with self.order_event_broker.subscribe(
+                    current_user["id"],
+                    current_user["role"],
+                    {status.value for status in statuses} if statuses else None,
+                ) as subscription:
+                    while not await request.is_disconnected():
+                        try:
+                            event = await asyncio.wait_for(
+                                subscription.queue.get(), KEEP_ALIVE_SECONDS
+                            )
+                        except asyncio.TimeoutError:
+                            yield ": keep-alive\n\n"
+                            continue
+                        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+            return StreamingResponse(
+                event_stream(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        @self.router.websocket("/events/ws")
+        async def order_events_websocket(
+            websocket: WebSocket,
+            token: str,
+            statuses: Optional[List[OrderStatus]] = Query(None),
+        ) -> None:
+            """Envía los cambios de pedidos por WebSocket."""
+            try:
+                current_user = get_user_from_token(token)
+            except HTTPException:
+                await websocket.close(code=WS_1008_POLICY_VIOLATION)
+                return
+
+            await websocket.accept()
+            with self.order_event_broker.subscribe(
+                current_user["id"],
+                current_user["role"],
+                {status.value for status in statuses} if statuses else None,
+            ) as subscription:
+                try:
+                    while True:
+                        try:
+                            event = await asyncio.wait_for(
+                                subscription.queue.get(), KEEP_ALIVE_SECONDS
+                            )
+                        except asyncio.TimeoutError:
+                            event = {"type": "ping"}
+                        await websocket.send_json(event)
+                except WebSocketDisconnect:
+                    pass
+
         @self.router.get("/user/token", response_model=PaginatedResponseSchema)
         async def get_by_user(
             user_id: int | None = None,
@@ -174,50 +290,113 @@ class OrderController(
         @self.router.put("/{id_key}/cash-payment", response_model=ResponseOrderSchema)
         async def process_cash_payment(
             id_key: int,
-            _: Dict[str, Any] = Depends(
+            current_user: Dict[str, Any] = Depends(
                 has_role([UserRole.cajero, UserRole.administrador])
             ),
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
         ) -> ResponseOrderSchema:
             """Procesa el pago en efectivo de un pedido."""
-            order = self.service.get_one(id_key)
 
-            if order.is_paid:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Este pedido ya ha sido pagado.",
-                )
+            async def handle() -> ResponseOrderSchema:
+                order = self.service.get_one(id_key)
 
-            if order.payment_method != PaymentMethod.cash.value:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Este pedido no acepta efectivo como metodo de pago.",
-                )
+                if order.is_paid:
+                    raise HTTPException(
+                        status_code=403,
+                        detail="Este pedido ya ha sido pagado.",
+                    )
 
-            return await self.service.process_cash_payment(order)
+                if order.payment_method != PaymentMethod.cash.value:
+                    raise HTTPException(
+                        status_code=403,
+                        detail="Este pedido no acepta efectivo como metodo de pago.",
+                    )
+
+                return await self.service.process_cash_payment(order)
+
+            return await self.idempotency_service.execute(
+                idempotency_key,
+                current_user["id"],
+                f"PUT /order/{id_key}/cash-payment",
+                None,
+                handle,
+            )
 
         @self.router.put("/{id_key}/mp-payment")
         async def process_mp_payment(
             id_key: int,
-            _: Dict[str, Any] = Depends(get_current_user),
+            current_user: Dict[str, Any] = Depends(get_current_user),
+            idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
         ) -> Dict[str, str]:
             """Procesa el pago con Mercado Pago de un pedido."""
-            order = self.service.get_one(id_key)
 
-            if order.is_paid:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Este pedido ya ha sido pagado.",
-                )
+            async def handle() -> Dict[str, str]:
+                order = self.service.get_one(id_key)
 
-            if order.payment_method != PaymentMethod.mercado_pago.value:
+                if order.is_paid:
+                    raise HTTPException(
+                        status_code=403,
+                        detail="Este pedido ya ha sido pagado.",
+                    )
+
+                if order.payment_method != PaymentMethod.mercado_pago.value:
+                    raise HTTPException(
+                        status_code=403,
+                        detail="Este pedido no acepta Mercado Pago como metodo de pago.",
+                    )
+
+                try:
+                    preference_id = await self.service.process_mp_payment(order)
+                except MercadoPagoUnavailableError as e:
+                    raise HTTPException(
+                        status_code=503, detail=str(e), headers={"Retry-After": "30"}
+                    )
+                except MercadoPagoError as e:
+                    raise HTTPException(status_code=502, detail=str(e))
+
+                return {"payment_url": preference_id}
+
+            return await self.idempotency_service.execute(
+                idempotency_key,
+                current_user["id"],
+                f"PUT /order/{id_key}/mp-payment",
+                None,
+                handle,
+            )
+
+        @self.router.post("/mp-webhook")
+        async def receive_mp_webhook(
+            request: Request,
+            x_signature: Optional[str] = Header(None, alias="x-signature"),
+            x_request_id: Optional[str] = Header(None, alias="x-request-id"),
+        ) -> Dict[str, str]:
+            """Recibe las notificaciones de pagos de Mercado Pago."""
+            try:
+                notification = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Notificación inválida.")
+
+            data_id = request.query_params.get("data.id") or str(
+                (notification.get("data") or {}).get("id") or ""
+            )
+            if not data_id:
                 raise HTTPException(
-                    status_code=403,
-                    detail="Este pedido no acepta Mercado Pago como metodo de pago.",
+                    status_code=400, detail="La notificación no indica el recurso."
                 )
 
-            preference_id = await self.service.process_mp_payment(order)
+            if not settings.mp_webhook_secret or not verify_webhook_signature(
+                x_signature,
+                x_request_id,
+                data_id,
+                settings.mp_webhook_secret,
+                settings.mp_webhook_tolerance_seconds or 300,
+            ):
+                raise HTTPException(status_code=401, detail="Firma inválida.")
 
-            return {"payment_url": preference_id}
+            event = await self.mp_webhook_service.receive(
+                notification, data_id, x_request_id
+            )
+            return {"status": "recibido" if event else "duplicado"}
 
         @self.router.put("/{id_key}/add-delay", response_model=ResponseOrderSchema)
         async def add_delay(
@@ -1,13 +1,40 @@
 from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import APIRouter, Depends, Query
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import StreamingResponse
 
+from src.config.settings import settings
 from src.models.user import UserRole
-from src.services.report import ReportService
+from src.schemas.report_cache import ReportCacheMetricsSchema
+from src.schemas.report_series import ReportSeriesSchema, SeriesBucket
+from src.schemas.sales_rollup import ProductBreakdown
+from src.services.report import (
+    TOP_CATEGORIES_COLUMNS,
+    TOP_CUSTOMERS_COLUMNS,
+    TOP_PRODUCTS_BY_DELIVERY_COLUMNS,
+    TOP_PRODUCTS_COLUMNS,
+    ReportService,
+)
+from src.services.report_cache import ReportCache
 from src.utils.rbac import has_role
+from src.utils.streaming import iter_file
+from src.utils.tabular_export import MEDIA_TYPES, ReportFormat
+
+
+def export_response(
+    chunks: Iterator[bytes], report_format: ReportFormat, name: str
+) -> StreamingResponse:
+    """Arma la respuesta de descarga de un reporte exportado."""
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[report_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={name}_"
+            f"{datetime.now().strftime('%Y%m%d')}.{report_format.value}"
+        },
+    )
 
 
 class ReportController:
@@ -15,6 +42,7 @@ class ReportController:
 
     def __init__(self):
         self.service = ReportService()
+        self.cache = ReportCache()
         self.router = APIRouter(tags=["Reports"])
 
         @self.router.get("/top-products")
@@ -22,20 +50,84 @@ class ReportController:
             start_date: datetime = Query(None),
             end_date: datetime = Query(None),
             limit: int = Query(10),
+            breakdown: Optional[ProductBreakdown] = Query(None),
+            format: Optional[ReportFormat] = Query(None),
             _: dict = Depends(has_role([UserRole.administrador])),
         ) -> List[Dict[str, Any]]:
-            """Obtiene los productos más vendidos en un período específico."""
-            return self.service.get_top_products(start_date, end_date, limit)
+            """Obtiene los productos más vendidos en un período específico.
+
+            Con ``breakdown`` el ranking se arma dentro de cada categoría o forma
+            de entrega, con hasta ``limit`` productos en cada una.
+            """
+            products = await self.cache.get_or_compute(
+                "top-products",
+                start_date,
+                end_date,
+                (limit, breakdown),
+                lambda start, end: self.service.get_top_products(
+                    start, end, limit, breakdown
+                ),
+            )
+            if format is None:
+                return products
+            columns = (
+                TOP_PRODUCTS_BY_DELIVERY_COLUMNS
+                if breakdown == ProductBreakdown.delivery_method
+                else TOP_PRODUCTS_COLUMNS
+            )
+            return export_response(
+                self.service.export_rows(products, columns, format),
+                format,
+                "top_products",
+            )
+
+        @self.router.get("/top-categories")
+        async def get_top_categories(
+            start_date: datetime = Query(None),
+            end_date: datetime = Query(None),
+            limit: int = Query(10),
+            format: Optional[ReportFormat] = Query(None),
+            _: dict = Depends(has_role([UserRole.administrador])),
+        ) -> List[Dict[str, Any]]:
+            """Obtiene las categorías con más ingresos en un período específico."""
+            categories = await self.cache.get_or_compute(
+                "top-categories",
+                start_date,
+                end_date,
+                limit,
+                lambda start, end: self.service.get_top_categories(start, end, limit),
+            )
+            if format is None:
+                return categories
+            return export_response(
+                self.service.export_rows(categories, TOP_CATEGORIES_COLUMNS, format),
+                format,
+                "top_categories",
+            )
 
         @self.router.get("/top-customers")
         async def get_top_customers(
             start_date: datetime = Query(None),
             end_date: datetime = Query(None),
             limit: int = Query(10),
+            format: Optional[ReportFormat] = Query(None),
             _: dict = Depends(has_role([UserRole.administrador])),
         ) -> List[Dict[str, Any]]:
             """Obtiene los clientes que más han gastado en un período específico."""
-            return self.service.get_top_customers(start_date, end_date, limit)
+            customers = await self.cache.get_or_compute(
+                "top-customers",
+                start_date,
+                end_date,
+                limit,
+                lambda start, end: self.service.get_top_customers(start, end, limit),
+            )
+            if format is None:
+                return customers
+            return export_response(
+                self.service.export_rows(customers, TOP_CUSTOMERS_COLUMNS, format),
+                format,
+                "top_customers",
+            )
 
         @self.router.get("/revenue")
         async def get_revenue_by_period(
@@ -44,7 +136,54 @@ class ReportController:
             _: dict = Depends(has_role([UserRole.administrador])),
         ) -> Dict[str, Any]:
             """Obtiene los ingresos totales en un período específico."""
-            return self.service.get_revenue_by_period(start_date, end_date)
+            revenue = await self.cache.get_or_compute(
+                "revenue",
+                start_date,
+                end_date,
+                None,
+                self.service.get_revenue_by_period,
+            )
+            return {**revenue, "start_date": start_date, "end_date": end_date}
+
+        @self.router.get("/series", response_model=ReportSeriesSchema)
+        async def get_series(
+            start_date: datetime,
+            end_date: datetime,
+            bucket: SeriesBucket = Query(SeriesBucket.day),
+            timezone: str = Query(settings.app_timezone),
+            _: dict = Depends(has_role([UserRole.administrador])),
+        ) -> ReportSeriesSchema:
+            """Obtiene ingresos, gastos, pedidos y ticket promedio por hora, día, semana o mes."""
+            return await self.cache.get_or_compute(
+                "series",
+                start_date,
+                end_date,
+                (bucket, timezone),
+                lambda start, end: self.service.get_series(
+                    start, end, bucket, timezone
+                ),
+            )
+
+        @self.router.get("/cache-metrics", response_model=ReportCacheMetricsSchema)
+        async def get_cache_metrics(
+            _: dict = Depends(has_role([UserRole.administrador])),
+        ) -> ReportCacheMetricsSchema:
+            """Obtiene los aciertos y descartes de la caché de reportes."""
+            return self.cache.metrics()
+
+        @self.router.get("/revenue/export")
+        async def export_revenue_report(
+            format: ReportFormat,
+            start_date: datetime = Query(None),
+            end_date: datetime = Query(None),
+            _: dict = Depends(has_role([UserRole.administrador])),
+        ) -> StreamingResponse:
+            """Exporta las compras e ingresos del período en CSV, Parquet o NDJSON."""
+            return export_response(
+                self.service.export_revenue_report(start_date, end_date, format),
+                format,
+                "revenue_report",
+            )
 
         @self.router.get("/revenue/excel")
         async def get_excel_revenue_report(
@@ -53,11 +192,11 @@ class ReportController:
             _: dict = Depends(has_role([UserRole.administrador])),
         ) -> StreamingResponse:
             """Genera un reporte de ingresos en formato Excel para el período especificado."""
-            buffer = BytesIO()
-            self.service.get_excel_revenue_report(start_date, end_date, buffer)
-            buffer.seek(0)
+            file = await run_in_threadpool(
+                self.service.get_excel_revenue_report, start_date, end_date
+            )
             return StreamingResponse(
-                buffer,
+                iter_file(file),
                 media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 headers={
                     "Content-Disposition": f"attachment; filename=revenue_report_"
@@ -1,13 +1,16 @@
 from typing import Any, Dict
 
-from fastapi import Body, Depends, HTTPException
+from fastapi import Body, Depends, HTTPException, Request
 
+from src.config.settings import settings
 from src.controllers.base_implementation import BaseControllerImplementation
 from src.models.user import UserRole
 from src.schemas.pagination import PaginatedResponseSchema
 from src.schemas.user import CreateUserSchema, ResponseUserSchema
+from src.services.image_uploader import ImageUploader
+from src.services.password_hasher import PasswordHasher
 from src.services.user import UserService
-from src.utils.auth import hash_password
+from src.utils.multipart_upload import receive_image_upload
 from src.utils.rbac import get_current_user, has_role
 
 
@@ -21,6 +24,8 @@ class UserController(BaseControllerImplementation):
             service=UserService(),
             tags=["User"],
         )
+        self.image_uploader = ImageUploader()
+        self.password_hasher = PasswordHasher()
 
         @self.router.get("/employees/all", response_model=PaginatedResponseSchema)
         async def get_employees(
@@ -46,7 +51,9 @@ class UserController(BaseControllerImplementation):
             current_user: Dict[str, Any] = Depends(get_current_user),
         ) -> ResponseUserSchema:
             """Actualiza la informacion de un usuario en base a su sesion."""
-            return self.service.update(current_user["id"], schema_in)
+            return self.service.update(
+                current_user["id"], await self.prepare_schema(schema_in)
+            )
 
         @self.router.put("/employee/password", response_model=ResponseUserSchema)
         async def update_employee_password(
@@ -62,7 +69,7 @@ class UserController(BaseControllerImplementation):
                 )
 
             return self.service.update_employee_password(
-                current_user["id"], hash_password(password)
+                current_user["id"], await self.password_hasher.hash(password)
             )
 
         @self.router.get("/employees/search", response_model=PaginatedResponseSchema)
@@ -84,3 +91,20 @@ class UserController(BaseControllerImplementation):
         ) -> PaginatedResponseSchema:
             """Busca clientes por nombre."""
             return self.service.search_clients_by_name(search_term, offset, limit)
+
+        @self.router.post("/image")
+        async def upload_image(
+            request: Request,
+            _: Dict[str, Any] = Depends(get_current_user),
+        ) -> Dict[str, str]:
+            """Sube la imagen de un usuario y devuelve su URL."""
+            file = await receive_image_upload(
+                request, settings.image_upload_max_bytes or 5 * 1024 * 1024
+            )
+            return {"image_url": await self.image_uploader.store(file, "users")}
+
+    async def prepare_schema(self, schema: CreateUserSchema) -> CreateUserSchema:
+        """Hashea la contraseña recibida en el pool, salvo que ya sea un hash."""
+        if schema.password and not self.password_hasher.is_hashed(schema.password):
+            schema.password = await self.password_hasher.hash(schema.password)
+        return schema
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+
+from src.models.base import BaseModel
+
+
+class CacheVersionModel(BaseModel):
+    __tablename__ = "cache_version"
+
+    name = Column(String, nullable=False, unique=True)
+    version = Column(Integer, default=0, server_default="0", nullable=False)
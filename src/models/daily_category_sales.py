@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint
+
+from src.models.base import BaseModel
+
+
+class DailyCategorySalesModel(BaseModel):
+    __tablename__ = "daily_category_sales"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "item_type", "category_id", name="uq_daily_category_sales_category"
+        ),
+    )
+
+    day = Column(Date, nullable=False)
+    item_type = Column(String, nullable=False)
+    category_id = Column(Integer, nullable=False)
+    quantity = Column(Float, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, Float, Integer, UniqueConstraint
+
+from src.models.base import BaseModel
+
+
+class DailyCustomerSalesModel(BaseModel):
+    __tablename__ = "daily_customer_sales"
+    __table_args__ = (
+        UniqueConstraint("day", "user_id", name="uq_daily_customer_sales_user"),
+    )
+
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
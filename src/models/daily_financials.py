@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Date, Float, Integer
+
+from src.models.base import BaseModel
+
+
+class DailyFinancialsModel(BaseModel):
+    __tablename__ = "daily_financials"
+
+    day = Column(Date, nullable=False, unique=True)
+    revenue = Column(Float, nullable=False, default=0)
+    invoice_count = Column(Integer, nullable=False, default=0)
+    expenses = Column(Float, nullable=False, default=0)
+    purchase_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint
+
+from src.models.base import BaseModel
+
+
+class DailyProductSalesModel(BaseModel):
+    __tablename__ = "daily_product_sales"
+    __table_args__ = (
+        UniqueConstraint(
+            "day",
+            "item_type",
+            "item_id",
+            "delivery_method",
+            name="uq_daily_product_sales_item",
+        ),
+    )
+
+    day = Column(Date, nullable=False)
+    item_type = Column(String, nullable=False)
+    item_id = Column(Integer, nullable=False)
+    delivery_method = Column(String, nullable=False)
+    quantity = Column(Float, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
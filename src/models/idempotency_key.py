@@ -0,0 +1,21 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.sql import func
+
+from src.models.base import BaseModel
+
+
+class IdempotencyKeyModel(BaseModel):
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        UniqueConstraint("key", "user_id", "endpoint", name="uq_idempotency_key"),
+    )
+
+    key = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    endpoint = Column(String, nullable=False)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer)
+    response_body = Column(JSON)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    claimed_at = Column(DateTime, server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
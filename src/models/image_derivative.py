@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, UniqueConstraint
+
+from src.models.base import BaseModel
+
+
+class ImageDerivativeModel(BaseModel):
+    __tablename__ = "image_derivative"
+    __table_args__ = (
+        UniqueConstraint("source_url", "variant", name="uq_image_derivative"),
+    )
+
+    source_url = Column(String, nullable=False, index=True)
+    variant = Column(String, nullable=False)
+    url = Column(String, nullable=False)
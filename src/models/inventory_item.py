@@ -2,6 +2,7 @@ from sqlalchemy import Boolean, Column, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.models.base import BaseModel
+from src.models.inventory_movement import InventoryMovementModel  # noqa
 
 
 class InventoryItemModel(BaseModel):
@@ -40,3 +41,5 @@ class InventoryItemModel(BaseModel):
     order_inventory_details = relationship(
         "OrderInventoryDetailModel", back_populates="inventory_item"
     )
+
+    movements = relationship("InventoryMovementModel", back_populates="inventory_item")
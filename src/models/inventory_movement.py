@@ -0,0 +1,61 @@
+import enum
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
+
+from src.models.base import BaseModel
+
+
+class InventoryMovementType(enum.Enum):
+    consumo_pedido = "consumo_pedido"
+    compra = "compra"
+    nota_credito = "nota_credito"
+    ajuste_manual = "ajuste_manual"
+
+
+class InventoryMovementModel(BaseModel):
+    __tablename__ = "inventory_movement"
+    __table_args__ = (
+        Index("ix_inventory_movement_item_date", "inventory_item_id", "date"),
+        Index(
+            "ix_inventory_movement_pending",
+            "inventory_item_id",
+            postgresql_where=text("compacted = false"),
+        ),
+    )
+
+    quantity = Column(Float, nullable=False)
+    type = Column(Enum(InventoryMovementType), nullable=False)
+    date = Column(DateTime, server_default=func.now(), nullable=False)
+    compacted = Column(Boolean, default=False, nullable=False)
+    notes = Column(String)
+
+    inventory_item_id = Column(
+        Integer,
+        ForeignKey("inventory_item.id_key", ondelete="CASCADE"),
+        nullable=False,
+    )
+    inventory_item = relationship("InventoryItemModel", back_populates="movements")
+
+    order_id = Column(
+        Integer,
+        ForeignKey("order.id_key", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    inventory_purchase_id = Column(
+        Integer,
+        ForeignKey("inventory_purchase.id_key", ondelete="SET NULL"),
+        nullable=True,
+    )
@@ -0,0 +1,28 @@
+import enum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from src.models.base import BaseModel
+
+
+class JobStatus(enum.Enum):
+    pendiente = "pendiente"
+    en_proceso = "en_proceso"
+    completado = "completado"
+    fallido = "fallido"
+
+
+class JobModel(BaseModel):
+    __tablename__ = "job"
+    __table_args__ = (Index("ix_job_status_run_at", "status", "run_at"),)
+
+    type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.pendiente)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, server_default=func.now(), nullable=False)
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from src.models.base import BaseModel
+
+
+class MpPreferenceModel(BaseModel):
+    __tablename__ = "mp_preference"
+
+    order_id = Column(
+        Integer,
+        ForeignKey("order.id_key", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    preference_id = Column(String, nullable=False)
+    init_point = Column(String, nullable=False)
+    items_hash = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -0,0 +1,17 @@
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from src.models.base import BaseModel
+
+
+class MpWebhookEventModel(BaseModel):
+    __tablename__ = "mp_webhook_event"
+
+    notification_id = Column(String, nullable=False, unique=True)
+    type = Column(String, nullable=False)
+    action = Column(String)
+    resource_id = Column(String, nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+    payment_status = Column(String)
+    received_at = Column(DateTime, server_default=func.now(), nullable=False)
+    processed_at = Column(DateTime)
@@ -44,6 +44,7 @@ class OrderModel(BaseModel):
     final_total = Column(Float, default=0.0, nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.a_confirmar, nullable=False)
     estimated_time = Column(Integer)
+    delay_minutes = Column(Integer, default=0, server_default="0", nullable=False)
     delivery_method = Column(Enum(DeliveryMethod), nullable=False)
     payment_method = Column(Enum(PaymentMethod), nullable=False)
     payment_id = Column(String)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+
+from src.models.base import BaseModel
+
+
+class SalesRollupStateModel(BaseModel):
+    __tablename__ = "sales_rollup_state"
+
+    name = Column(String, nullable=False, unique=True)
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime)
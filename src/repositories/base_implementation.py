@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from typing import Any, Dict, Generic, Iterator, List, Optional, Type, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from src.config.database import Database
@@ -12,6 +12,8 @@ from src.schemas.base import BaseSchema
 T = TypeVar("T", bound=BaseModel)
 S = TypeVar("S", bound=BaseSchema)
 
+REPORT_BATCH_SIZE = 1000
+
 
 class RecordNotFoundError(Exception):
     """Excepción personalizada para indicar que no se encontró un registro."""
@@ -64,6 +66,19 @@ class BaseRepositoryImplementation(Generic[T, S], BaseRepository[T, S]):
         finally:
             session.close()
 
+    @contextmanager
+    def stream_scope(self) -> Iterator[Session]:
+        """Sesión de sólo lectura para recorrer resultados por partes.
+
+        No depende del hilo actual, así el iterador puede consumirse desde
+        distintos hilos (por ejemplo, al enviar una respuesta por partes).
+        """
+        session = Session(bind=Database().engine)
+        try:
+            yield session
+        finally:
+            session.close()
+
     def count_all(self) -> int:
         """Cuenta todos los registros activos en la tabla del modelo."""
         with self.session_scope() as session:
@@ -184,6 +199,22 @@ class BaseRepositoryImplementation(Generic[T, S], BaseRepository[T, S]):
             session.refresh(model)
             return self.schema.model_validate(model)
 
+    def replace_value(
+        self, id_key: int, field_name: str, expected: Any, value: Any
+    ) -> bool:
+        """Cambia un campo sólo si todavía tiene el valor esperado.
+
+        Devuelve False si otro cambio lo modificó antes.
+        """
+        column = getattr(self.model, field_name)
+        stmt = (
+            update(self.model)
+            .where(self.model.id_key == id_key, column == expected)
+            .values({field_name: value})
+        )
+        with self.session_scope() as session:
+            return session.execute(stmt).rowcount > 0
+
     def remove(self, id_key: int) -> S:
         """Marca un registro como inactivo en lugar de eliminarlo físicamente."""
         with self.session_scope() as session:
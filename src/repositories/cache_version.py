@@ -0,0 +1,40 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.models.cache_version import CacheVersionModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.cache_version import (
+    CreateCacheVersionSchema,
+    ResponseCacheVersionSchema,
+)
+
+
+class CacheVersionRepository(BaseRepositoryImplementation):
+    """Repositorio de las versiones compartidas de las cachés en memoria."""
+
+    def __init__(self):
+        super().__init__(
+            model=CacheVersionModel,
+            create_schema=CreateCacheVersionSchema,
+            response_schema=ResponseCacheVersionSchema,
+        )
+
+    def get_version(self, name: str) -> int:
+        """Devuelve la versión actual de una caché (0 si nunca se invalidó)."""
+        stmt = select(self.model.version).where(self.model.name == name)
+        with self.session_scope() as session:
+            return session.scalar(stmt) or 0
+
+    def bump(self, name: str) -> int:
+        """Incrementa la versión de una caché y devuelve la nueva."""
+        table = self.model.__table__
+        stmt = (
+            insert(table)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=["name"], set_={"version": table.c.version + 1}
+            )
+            .returning(table.c.version)
+        )
+        with self.session_scope() as session:
+            return session.scalar(stmt)
@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.idempotency_key import IdempotencyKeyModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.idempotency_key import (
+    CreateIdempotencyKeySchema,
+    ResponseIdempotencyKeySchema,
+)
+
+
+class IdempotencyKeyRepository(BaseRepositoryImplementation):
+    """Repositorio para las claves de idempotencia de los endpoints."""
+
+    def __init__(self):
+        super().__init__(
+            model=IdempotencyKeyModel,
+            create_schema=CreateIdempotencyKeySchema,
+            response_schema=ResponseIdempotencyKeySchema,
+        )
+
+    def reserve(
+        self, schema: CreateIdempotencyKeySchema
+    ) -> Optional[ResponseIdempotencyKeySchema]:
+        """Reserva una clave. Si ya existía, devuelve el registro existente."""
+        try:
+            self.save(self.model(**schema.model_dump()))
+            return None
+        except IntegrityError:
+            return self.find_by_key(schema.key, schema.user_id, schema.endpoint)
+
+    def find_by_key(
+        self, key: str, user_id: int, endpoint: str
+    ) -> Optional[ResponseIdempotencyKeySchema]:
+        """Busca una clave de idempotencia de un usuario para un endpoint."""
+        stmt = select(self.model).where(
+            self.model.key == key,
+            self.model.user_id == user_id,
+            self.model.endpoint == endpoint,
+        )
+        with self.session_scope() as session:
+            model = session.scalar(stmt)
+            return self.schema.model_validate(model) if model else None
+
+    def complete(
+        self, key: str, user_id: int, endpoint: str, status_code: int, body: Any
+    ) -> None:
+        """Guarda la respuesta de una operación completada."""
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.key == key,
+                self.model.user_id == user_id,
+                self.model.endpoint == endpoint,
+            )
+            .values(status_code=status_code, response_body=body)
+        )
+        with self.session_scope() as session:
+            session.execute(stmt)
+
+    def take_over(
+        self, existing: ResponseIdempotencyKeySchema, claimed_at: datetime
+    ) -> bool:
+        """Toma una reserva abandonada si nadie la completó ni la tomó antes."""
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.id_key == existing.id_key,
+                self.model.status_code.is_(None),
+                self.model.claimed_at == existing.claimed_at,
+            )
+            .values(claimed_at=claimed_at)
+        )
+        with self.session_scope() as session:
+            return session.execute(stmt).rowcount > 0
+
+    def release(self, key: str, user_id: int, endpoint: str) -> None:
+        """Libera una clave reservada cuya operación no se completó."""
+        stmt = delete(self.model).where(
+            self.model.key == key,
+            self.model.user_id == user_id,
+            self.model.endpoint == endpoint,
+            self.model.status_code.is_(None),
+        )
+        with self.session_scope() as session:
+            session.execute(stmt)
+
+    def delete_expired(self, now: datetime) -> int:
+        """Elimina las claves vencidas y devuelve cuántas se borraron."""
+        stmt = delete(self.model).where(self.model.expires_at < now)
+        with self.session_scope() as session:
+            return session.execute(stmt).rowcount
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, select, union
+
+from src.models.image_derivative import ImageDerivativeModel
+from src.models.inventory_item import InventoryItemModel
+from src.models.manufactured_item import ManufacturedItemModel
+from src.models.user import UserModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.image_derivative import (
+    CreateImageDerivativeSchema,
+    ResponseImageDerivativeSchema,
+)
+
+
+class ImageDerivativeRepository(BaseRepositoryImplementation):
+    """Repositorio para las versiones reducidas de las imágenes."""
+
+    def __init__(self):
+        super().__init__(
+            model=ImageDerivativeModel,
+            create_schema=CreateImageDerivativeSchema,
+            response_schema=ResponseImageDerivativeSchema,
+        )
+
+    def find_by_sources(self, source_urls: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Busca las variantes de varias imágenes de una sola vez."""
+        source_urls = list(source_urls)
+        if not source_urls:
+            return {}
+
+        stmt = select(self.model.source_url, self.model.variant, self.model.url).where(
+            self.model.source_url.in_(source_urls)
+        )
+        derivatives: Dict[str, Dict[str, str]] = defaultdict(dict)
+        with self.session_scope() as session:
+            for source_url, variant, url in session.execute(stmt):
+                derivatives[source_url][variant] = url
+        return dict(derivatives)
+
+    def find_missing_sources(self) -> List[str]:
+        """Imágenes de items y usuarios que todavía no tienen variantes."""
+        with_derivatives = select(self.model.source_url)
+        stmt = union(
+            *(
+                select(model.image_url).where(
+                    model.image_url.isnot(None),
+                    model.image_url.not_in(with_derivatives),
+                )
+                for model in (ManufacturedItemModel, InventoryItemModel, UserModel)
+            )
+        )
+        with self.session_scope() as session:
+            return list(session.scalars(stmt))
+
+    def replace(self, source_url: str, variants: Dict[str, str]) -> List[str]:
+        """Guarda las variantes de una imagen y devuelve las URLs que reemplazó."""
+        with self.session_scope() as session:
+            previous = list(
+                session.scalars(
+                    delete(self.model)
+                    .where(self.model.source_url == source_url)
+                    .returning(self.model.url)
+                )
+            )
+            session.add_all(
+                self.model(source_url=source_url, variant=variant, url=url)
+                for variant, url in variants.items()
+            )
+        return previous
+
+    def delete_by_source(self, source_url: str) -> List[str]:
+        """Elimina las variantes de una imagen y devuelve sus URLs."""
+        stmt = (
+            delete(self.model)
+            .where(self.model.source_url == source_url)
+            .returning(self.model.url)
+        )
+        with self.session_scope() as session:
+            return list(session.scalars(stmt))
@@ -1,4 +1,10 @@
+from collections import defaultdict
+from typing import Dict
+
+from sqlalchemy import insert
+
 from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_movement import InventoryMovementModel, InventoryMovementType
 from src.repositories.base_implementation import BaseRepositoryImplementation
 from src.schemas.inventory_item import (
     CreateInventoryItemSchema,
@@ -18,23 +24,31 @@ class InventoryItemRepository(BaseRepositoryImplementation):
         )
 
     def restore_inventory_stock(self, order: ResponseOrderSchema) -> None:
-        """Restaura el stock de inventario basado en los detalles del pedido."""
-        with self.session_scope() as session:
-            for detail in order.details:
-                for manufactured_item_detail in detail.manufactured_item.details:
-                    quantity_to_add = (
-                        manufactured_item_detail.quantity * detail.quantity
-                    )
+        """Registra la devolución al inventario del stock consumido por un pedido."""
+        quantities_to_add: Dict[int, float] = defaultdict(float)
 
-                    inventory_item = session.get(
-                        self.model, manufactured_item_detail.inventory_item.id_key
-                    )
+        for detail in order.details:
+            for manufactured_item_detail in detail.manufactured_item.details:
+                quantities_to_add[manufactured_item_detail.inventory_item.id_key] += (
+                    manufactured_item_detail.quantity * detail.quantity
+                )
 
-                    if inventory_item:
-                        inventory_item.current_stock += quantity_to_add
+        for detail in order.inventory_details:
+            quantities_to_add[detail.inventory_item.id_key] += detail.quantity
 
-            for detail in order.inventory_details:
-                inventory_item = session.get(self.model, detail.inventory_item.id_key)
+        if not quantities_to_add:
+            return
 
-                if inventory_item:
-                    inventory_item.current_stock += detail.quantity
+        with self.session_scope() as session:
+            session.execute(
+                insert(InventoryMovementModel),
+                [
+                    {
+                        "inventory_item_id": inventory_item_id,
+                        "quantity": quantity,
+                        "type": InventoryMovementType.nota_credito,
+                        "order_id": order.id_key,
+                    }
+                    for inventory_item_id, quantity in quantities_to_add.items()
+                ],
+            )
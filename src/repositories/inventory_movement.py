@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Select, bindparam, desc, func, insert, select, update
+
+from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_movement import InventoryMovementModel
+from src.repositories.base_implementation import (
+    BaseRepositoryImplementation,
+    RecordNotFoundError,
+)
+from src.schemas.inventory_movement import (
+    CreateInventoryMovementSchema,
+    ResponseInventoryMovementSchema,
+)
+
+
+class InventoryMovementRepository(BaseRepositoryImplementation):
+    """Repositorio para el libro de movimientos de inventario."""
+
+    def __init__(self):
+        super().__init__(
+            model=InventoryMovementModel,
+            create_schema=CreateInventoryMovementSchema,
+            response_schema=ResponseInventoryMovementSchema,
+        )
+
+    def save_batch(self, movements: List[CreateInventoryMovementSchema]) -> None:
+        """Inserta un lote de movimientos en una sola sentencia."""
+        if not movements:
+            return
+
+        with self.session_scope() as session:
+            session.execute(
+                insert(self.model),
+                [movement.model_dump(exclude_none=True) for movement in movements],
+            )
+
+    def get_live_stock(
+        self, inventory_item_ids: List[int]
+    ) -> Dict[int, Tuple[str, float]]:
+        """Obtiene el stock real (saldo compactado + movimientos pendientes) de varios items."""
+        if not inventory_item_ids:
+            return {}
+
+        with self.session_scope() as session:
+            return {
+                row.id_key: (row.name, row.stock)
+                for row in session.execute(self.live_stock_query(inventory_item_ids))
+            }
+
+    def live_stock_query(self, inventory_item_ids: List[int]) -> Select:
+        """Consulta (id, nombre, stock real) de varios items, para usar en otra sesión."""
+        pending = (
+            select(
+                self.model.inventory_item_id,
+                func.sum(self.model.quantity).label("pending_quantity"),
+            )
+            .where(
+                self.model.compacted.is_(False),
+                self.model.inventory_item_id.in_(inventory_item_ids),
+            )
+            .group_by(self.model.inventory_item_id)
+            .subquery()
+        )
+
+        return (
+            select(
+                InventoryItemModel.id_key,
+                InventoryItemModel.name,
+                (
+                    InventoryItemModel.current_stock
+                    + func.coalesce(pending.c.pending_quantity, 0)
+                ).label("stock"),
+            )
+            .outerjoin(
+                pending, pending.c.inventory_item_id == InventoryItemModel.id_key
+            )
+            .where(InventoryItemModel.id_key.in_(inventory_item_ids))
+        )
+
+    def get_stock_at(self, inventory_item_id: int, date: datetime) -> float:
+        """Obtiene el stock que tenía un item en una fecha determinada."""
+        with self.session_scope() as session:
+            pending = (
+                select(func.coalesce(func.sum(self.model.quantity), 0))
+                .where(
+                    self.model.inventory_item_id == inventory_item_id,
+                    self.model.compacted.is_(False),
+                )
+                .scalar_subquery()
+            )
+            after_date = (
+                select(func.coalesce(func.sum(self.model.quantity), 0))
+                .where(
+                    self.model.inventory_item_id == inventory_item_id,
+                    self.model.date > date,
+                )
+                .scalar_subquery()
+            )
+
+            stock = session.scalar(
+                select(InventoryItemModel.current_stock + pending - after_date).where(
+                    InventoryItemModel.id_key == inventory_item_id
+                )
+            )
+            if stock is None:
+                raise RecordNotFoundError(
+                    f"No record found with id {inventory_item_id}"
+                )
+            return stock
+
+    def find_by_inventory_item(
+        self, inventory_item_id: int, offset: int, limit: int
+    ) -> List[ResponseInventoryMovementSchema]:
+        """Obtiene los movimientos de un item, del más reciente al más antiguo."""
+        stmt = (
+            select(self.model)
+            .where(self.model.inventory_item_id == inventory_item_id)
+            .order_by(desc(self.model.date), desc(self.model.id_key))
+            .offset(offset)
+            .limit(limit)
+        )
+
+        with self.session_scope() as session:
+            result = session.execute(stmt)
+            return [self.schema.model_validate(row) for row in result.scalars()]
+
+    def compact(self) -> int:
+        """Aplica los movimientos pendientes sobre el saldo materializado de cada item."""
+        with self.session_scope() as session:
+            rows = session.execute(
+                update(self.model)
+                .where(self.model.compacted.is_(False))
+                .values(compacted=True)
+                .returning(self.model.inventory_item_id, self.model.quantity)
+                .execution_options(synchronize_session=False)
+            ).all()
+
+            totals: Dict[int, float] = defaultdict(float)
+            for inventory_item_id, quantity in rows:
+                totals[inventory_item_id] += quantity
+
+            if totals:
+                inventory_item_table = InventoryItemModel.__table__
+                session.execute(
+                    update(inventory_item_table)
+                    .where(inventory_item_table.c.id_key == bindparam("item_id"))
+                    .values(
+                        current_stock=inventory_item_table.c.current_stock
+                        + bindparam("delta")
+                    ),
+                    [
+                        {"item_id": item_id, "delta": delta}
+                        for item_id, delta in totals.items()
+                    ],
+                )
+
+            return len(rows)
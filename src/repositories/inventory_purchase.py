@@ -1,12 +1,15 @@
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, Tuple
 
 from sqlalchemy import and_, func, select
 from sqlalchemy.orm import aliased
 
 from src.models.inventory_item import InventoryItemModel
 from src.models.inventory_purchase import InventoryPurchaseModel
-from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.repositories.base_implementation import (
+    REPORT_BATCH_SIZE,
+    BaseRepositoryImplementation,
+)
 from src.schemas.inventory_purchase import (
     CreateInventoryPurchaseSchema,
     ResponseInventoryPurchaseSchema,
@@ -42,10 +45,17 @@ class InventoryPurchaseRepository(BaseRepositoryImplementation):
             }
 
     def get_purchases_report_data(
-        self, start_date: datetime, end_date: datetime
-    ) -> List[Tuple[datetime, int, float, str]]:
-        """Obtiene los detalles de las compras de inventario en un rango de fechas para Excel."""
-        with self.session_scope() as session:
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        batch_size: int = REPORT_BATCH_SIZE,
+    ) -> Iterator[Tuple[datetime, int, float, str]]:
+        """Recorre las compras de inventario de un rango de fechas para los reportes.
+
+        Las filas se leen con un cursor del lado del servidor de a ``batch_size``,
+        por lo que la sesión queda abierta mientras se consume el iterador.
+        """
+        with self.stream_scope() as session:
             Purchase = aliased(InventoryPurchaseModel)
             Item = aliased(InventoryItemModel)
 
@@ -60,10 +70,10 @@ class InventoryPurchaseRepository(BaseRepositoryImplementation):
                 .select_from(Purchase)
                 .join(Item, Purchase.inventory_item_id == Item.id_key)
                 .where(self._build_date_filter(start_date, end_date))
+                .execution_options(yield_per=batch_size)
             )
 
-            result = session.execute(stmt)
-            return result.all()
+            yield from session.execute(stmt)
 
     def _build_date_filter(self, start_date: datetime, end_date: datetime):
         """Construye un filtro de fecha para las compras de inventario."""
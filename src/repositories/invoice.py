@@ -1,13 +1,31 @@
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import (
+    DateTime,
+    Interval,
+    String,
+    and_,
+    cast,
+    func,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.orm import selectinload
 
+from src.models.inventory_purchase import InventoryPurchaseModel
 from src.models.invoice import InvoiceModel, InvoiceType
 from src.models.invoice_detail import InvoiceDetailModel
-from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.models.job import JobModel
+from src.models.order import OrderModel, OrderStatus
+from src.repositories.base_implementation import (
+    REPORT_BATCH_SIZE,
+    BaseRepositoryImplementation,
+)
 from src.schemas.invoice import CreateInvoiceSchema, ResponseInvoiceSchema
 from src.schemas.invoice_detail import CreateInvoiceDetailSchema
+from src.schemas.job import CreateJobSchema
 
 
 class InvoiceRepository(BaseRepositoryImplementation):
@@ -21,9 +39,15 @@ class InvoiceRepository(BaseRepositoryImplementation):
         )
 
     def save_with_details(
-        self, invoice_model: InvoiceModel, details: List[CreateInvoiceDetailSchema]
+        self,
+        invoice_model: InvoiceModel,
+        details: List[CreateInvoiceDetailSchema],
+        job: Optional[CreateJobSchema] = None,
     ) -> ResponseInvoiceSchema:
-        """Guarda una factura junto con sus detalles en la base de datos."""
+        """Guarda una factura junto con sus detalles y su trabajo en la misma transacción.
+
+        El id de la factura se agrega al payload del trabajo como ``invoice_id``.
+        """
         with self.session_scope() as session:
             session.add(invoice_model)
             session.flush()
@@ -34,6 +58,14 @@ class InvoiceRepository(BaseRepositoryImplementation):
                 detail_model = InvoiceDetailModel(**detail_dict)
                 session.add(detail_model)
 
+            if job is not None:
+                job_dict = job.model_dump(exclude_none=True)
+                job_dict["payload"] = {
+                    **job.payload,
+                    "invoice_id": invoice_model.id_key,
+                }
+                session.add(JobModel(**job_dict))
+
             session.flush()
             session.refresh(invoice_model)
 
@@ -60,11 +92,106 @@ class InvoiceRepository(BaseRepositoryImplementation):
                 "invoice_count": result.invoice_count,
             }
 
-    def get_invoices_report_data(
-        self, start_date: datetime, end_date: datetime
-    ) -> List[Tuple[datetime, float, str]]:
-        """Obtiene los detalles de las facturas en un rango de fechas para Excel."""
+    def get_series(
+        self,
+        unit: str,
+        timezone: str,
+        storage_timezone: str,
+        start_local: datetime,
+        end_local: datetime,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Any]:
+        """Obtiene ingresos, gastos y pedidos entregados por intervalo en una sola consulta.
+
+        Las fechas guardadas (en hora de ``storage_timezone``) se pasan a
+        ``timezone`` antes de truncarlas con ``date_trunc``, y los intervalos
+        salen de ``generate_series`` para que los que no tienen movimientos
+        también aparezcan. ``start_local`` y ``end_local`` son los extremos en
+        hora de ``timezone``; ``start_date`` y ``end_date``, en hora guardada.
+        """
+
+        def bucket_of(column):
+            return func.date_trunc(
+                unit, func.timezone(timezone, func.timezone(storage_timezone, column))
+            )
+
+        buckets = select(
+            func.generate_series(
+                func.date_trunc(unit, cast(start_local, DateTime)),
+                func.date_trunc(unit, cast(end_local, DateTime)),
+                cast(literal(f"1 {unit}", String), Interval),
+            ).label("bucket")
+        ).subquery("buckets")
+
+        revenue = (
+            select(
+                bucket_of(InvoiceModel.date).label("bucket"),
+                func.sum(InvoiceModel.total).label("revenue"),
+                func.count(InvoiceModel.id_key).label("invoice_count"),
+            )
+            .where(
+                InvoiceModel.type == InvoiceType.factura,
+                InvoiceModel.date.between(start_date, end_date),
+            )
+            .group_by(text("1"))
+            .subquery("revenue")
+        )
+        expenses = (
+            select(
+                bucket_of(InventoryPurchaseModel.purchase_date).label("bucket"),
+                func.sum(InventoryPurchaseModel.total_cost).label("expenses"),
+                func.count(InventoryPurchaseModel.id_key).label("purchase_count"),
+            )
+            .where(InventoryPurchaseModel.purchase_date.between(start_date, end_date))
+            .group_by(text("1"))
+            .subquery("expenses")
+        )
+        orders = (
+            select(
+                bucket_of(OrderModel.date).label("bucket"),
+                func.count(OrderModel.id_key).label("order_count"),
+                func.sum(OrderModel.final_total).label("order_total"),
+            )
+            .where(
+                OrderModel.status == OrderStatus.entregado,
+                OrderModel.date.between(start_date, end_date),
+            )
+            .group_by(text("1"))
+            .subquery("orders")
+        )
+
+        stmt = (
+            select(
+                buckets.c.bucket,
+                func.coalesce(revenue.c.revenue, 0).label("revenue"),
+                func.coalesce(revenue.c.invoice_count, 0).label("invoice_count"),
+                func.coalesce(expenses.c.expenses, 0).label("expenses"),
+                func.coalesce(expenses.c.purchase_count, 0).label("purchase_count"),
+                func.coalesce(orders.c.order_count, 0).label("order_count"),
+                func.coalesce(orders.c.order_total, 0).label("order_total"),
+            )
+            .select_from(buckets)
+            .outerjoin(revenue, revenue.c.bucket == buckets.c.bucket)
+            .outerjoin(expenses, expenses.c.bucket == buckets.c.bucket)
+            .outerjoin(orders, orders.c.bucket == buckets.c.bucket)
+            .order_by(buckets.c.bucket)
+        )
         with self.session_scope() as session:
+            return session.execute(stmt).all()
+
+    def get_invoices_report_data(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        batch_size: int = REPORT_BATCH_SIZE,
+    ) -> Iterator[Tuple[datetime, float, InvoiceType]]:
+        """Recorre las facturas de un rango de fechas para los reportes.
+
+        Las filas se leen con un cursor del lado del servidor de a ``batch_size``,
+        por lo que la sesión queda abierta mientras se consume el iterador.
+        """
+        with self.stream_scope() as session:
             stmt = (
                 select(InvoiceModel.date, InvoiceModel.total, InvoiceModel.type)
                 .where(
@@ -74,10 +201,48 @@ class InvoiceRepository(BaseRepositoryImplementation):
                     )
                 )
                 .order_by(InvoiceModel.date.desc())
+                .execution_options(yield_per=batch_size)
             )
 
-            result = session.execute(stmt)
-            return result.all()
+            yield from session.execute(stmt)
+
+    def find_ids_for_export(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        invoice_ids: Optional[List[int]],
+    ) -> List[int]:
+        """Obtiene los IDs de las facturas a exportar, ordenados por fecha."""
+        stmt = (
+            select(self.model.id_key)
+            .where(
+                self._build_invoice_date_filter(start_date, end_date),
+                self.model.active.is_(True),
+            )
+            .order_by(self.model.date, self.model.id_key)
+        )
+        if invoice_ids:
+            stmt = stmt.where(self.model.id_key.in_(invoice_ids))
+
+        with self.session_scope() as session:
+            return list(session.scalars(stmt))
+
+    def find_many(self, invoice_ids: List[int]) -> List[ResponseInvoiceSchema]:
+        """Obtiene varias facturas con sus detalles en el orden de los IDs recibidos."""
+        stmt = (
+            select(self.model)
+            .where(self.model.id_key.in_(invoice_ids))
+            .options(
+                selectinload(self.model.details),
+                selectinload(self.model.order),
+            )
+        )
+        with self.session_scope() as session:
+            invoices = {
+                invoice.id_key: self.schema.model_validate(invoice)
+                for invoice in session.scalars(stmt)
+            }
+            return [invoices[id_key] for id_key in invoice_ids if id_key in invoices]
 
     def _build_invoice_date_filter(self, start_date: datetime, end_date: datetime):
         """Construye un filtro para las fechas de las facturas."""
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, select, update
+
+from src.models.job import JobModel, JobStatus
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.job import CreateJobSchema, ResponseJobSchema
+
+
+class JobRepository(BaseRepositoryImplementation):
+    """Repositorio para la cola de trabajos en segundo plano."""
+
+    def __init__(self):
+        super().__init__(
+            model=JobModel,
+            create_schema=CreateJobSchema,
+            response_schema=ResponseJobSchema,
+        )
+
+    def claim(
+        self, now: datetime, stale_before: datetime, limit: int = 1
+    ) -> List[ResponseJobSchema]:
+        """Toma trabajos listos para ejecutar y los marca en proceso.
+
+        También recupera los trabajos en proceso cuyo worker dejó de responder.
+        Las filas tomadas por otro worker se saltean con SKIP LOCKED.
+        """
+        stmt = (
+            select(self.model)
+            .where(
+                or_(
+                    and_(
+                        self.model.status == JobStatus.pendiente,
+                        self.model.run_at <= now,
+                    ),
+                    and_(
+                        self.model.status == JobStatus.en_proceso,
+                        self.model.locked_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(self.model.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        with self.session_scope() as session:
+            jobs = session.scalars(stmt).all()
+            for job in jobs:
+                job.status = JobStatus.en_proceso
+                job.locked_at = now
+                job.attempts += 1
+            session.flush()
+            return [self.schema.model_validate(job) for job in jobs]
+
+    def mark_completed(self, job_id: int) -> None:
+        """Marca un trabajo como completado."""
+        self._set_result(job_id, status=JobStatus.completado, locked_at=None)
+
+    def mark_failed(
+        self, job_id: int, error: str, retry_at: Optional[datetime]
+    ) -> None:
+        """Registra el error de un trabajo y lo reprograma o lo marca como fallido."""
+        if retry_at is None:
+            self._set_result(
+                job_id, status=JobStatus.fallido, locked_at=None, last_error=error
+            )
+        else:
+            self._set_result(
+                job_id,
+                status=JobStatus.pendiente,
+                locked_at=None,
+                last_error=error,
+                run_at=retry_at,
+            )
+
+    def _set_result(self, job_id: int, **values) -> None:
+        """Actualiza el estado de un trabajo."""
+        with self.session_scope() as session:
+            session.execute(
+                update(self.model).where(self.model.id_key == job_id).values(**values)
+            )
@@ -1,5 +1,9 @@
-from typing import List
+from typing import Dict, List
 
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from src.models.inventory_item import InventoryItemModel
 from src.models.manufactured_item import ManufacturedItemModel
 from src.models.manufactured_item_detail import ManufacturedItemDetailModel
 from src.repositories.base_implementation import (
@@ -23,6 +27,33 @@ class ManufacturedItemRepository(BaseRepositoryImplementation):
             response_schema=ResponseManufacturedItemSchema,
         )
 
+    def find_many(self, ids: List[int]) -> Dict[int, ResponseManufacturedItemSchema]:
+        """Busca varios artículos activos en una sola consulta, indexados por ID."""
+        if not ids:
+            return {}
+
+        stmt = (
+            select(self.model)
+            .where(self.model.id_key.in_(ids), self.model.active.is_(True))
+            .options(
+                selectinload(self.model.category),
+                selectinload(self.model.details)
+                .selectinload(ManufacturedItemDetailModel.inventory_item)
+                .selectinload(InventoryItemModel.category),
+            )
+        )
+
+        with self.session_scope() as session:
+            items = {
+                model.id_key: self.schema.model_validate(model)
+                for model in session.scalars(stmt)
+            }
+
+        missing_ids = set(ids) - set(items)
+        if missing_ids:
+            raise RecordNotFoundError(f"No record found with id {min(missing_ids)}")
+        return items
+
     def save_with_details(
         self,
         manufactured_item_model: ManufacturedItemModel,
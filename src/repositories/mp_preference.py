@@ -0,0 +1,54 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from src.models.mp_preference import MpPreferenceModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.mp_preference import (
+    CreateMpPreferenceSchema,
+    ResponseMpPreferenceSchema,
+)
+
+
+class MpPreferenceRepository(BaseRepositoryImplementation):
+    """Repositorio para las preferencias de Mercado Pago creadas por pedido."""
+
+    def __init__(self):
+        super().__init__(
+            model=MpPreferenceModel,
+            create_schema=CreateMpPreferenceSchema,
+            response_schema=ResponseMpPreferenceSchema,
+        )
+
+    def find_by_order(self, order_id: int) -> Optional[ResponseMpPreferenceSchema]:
+        """Busca la preferencia guardada de un pedido."""
+        stmt = select(self.model).where(self.model.order_id == order_id)
+        with self.session_scope() as session:
+            model = session.scalar(stmt)
+            return self.schema.model_validate(model) if model else None
+
+    def store(self, schema: CreateMpPreferenceSchema) -> ResponseMpPreferenceSchema:
+        """Guarda la preferencia de un pedido, reemplazando la anterior si había."""
+        values = schema.model_dump()
+        stmt = select(self.model).where(self.model.order_id == schema.order_id)
+        try:
+            with self.session_scope() as session:
+                model = session.scalar(stmt)
+                if model is None:
+                    model = self.model(**values)
+                    session.add(model)
+                else:
+                    for key, value in values.items():
+                        setattr(model, key, value)
+                session.flush()
+                session.refresh(model)
+                return self.schema.model_validate(model)
+        except IntegrityError:
+            # Otro pedido concurrente guardó la preferencia primero: se pisa.
+            with self.session_scope() as session:
+                model = session.scalar(stmt)
+                for key, value in values.items():
+                    setattr(model, key, value)
+                session.flush()
+                return self.schema.model_validate(model)
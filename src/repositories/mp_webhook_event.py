@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.job import JobModel
+from src.models.mp_webhook_event import MpWebhookEventModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.job import CreateJobSchema
+from src.schemas.mp_webhook_event import (
+    CreateMpWebhookEventSchema,
+    ResponseMpWebhookEventSchema,
+)
+
+
+class MpWebhookEventRepository(BaseRepositoryImplementation):
+    """Repositorio para las notificaciones recibidas de Mercado Pago."""
+
+    def __init__(self):
+        super().__init__(
+            model=MpWebhookEventModel,
+            create_schema=CreateMpWebhookEventSchema,
+            response_schema=ResponseMpWebhookEventSchema,
+        )
+
+    def save_with_job(
+        self, schema: CreateMpWebhookEventSchema, job: Optional[CreateJobSchema]
+    ) -> Optional[ResponseMpWebhookEventSchema]:
+        """Guarda la notificación y su trabajo en la misma transacción.
+
+        Si la notificación ya se había recibido no guarda nada y devuelve None,
+        así los reintentos de Mercado Pago no encolan el trabajo dos veces.
+        """
+        try:
+            with self.session_scope() as session:
+                event = self.model(**schema.model_dump())
+                session.add(event)
+                if job is not None:
+                    session.add(JobModel(**job.model_dump(exclude_none=True)))
+                session.flush()
+                session.refresh(event)
+                return self.schema.model_validate(event)
+        except IntegrityError:
+            return None
+
+    def mark_processed(self, resource_id: str, payment_status: Optional[str]) -> None:
+        """Registra el resultado en las notificaciones pendientes de un recurso.
+
+        El estado se consulta en Mercado Pago al procesar, así que vale para
+        todas las notificaciones del mismo pago recibidas hasta ese momento.
+        """
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.resource_id == resource_id,
+                self.model.processed_at.is_(None),
+            )
+            .values(payment_status=payment_status, processed_at=datetime.now())
+        )
+        with self.session_scope() as session:
+            session.execute(stmt)
@@ -1,15 +1,24 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import String, desc, func, select
+from sqlalchemy import String, desc, func, insert, select, update
+from sqlalchemy.orm import Session
 
+from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_movement import InventoryMovementModel
+from src.models.manufactured_item import ManufacturedItemModel
 from src.models.order import OrderModel, OrderStatus
 from src.models.order_detail import OrderDetailModel
 from src.models.order_inventory_detail import OrderInventoryDetailModel
 from src.models.user import UserModel
-from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.repositories.base_implementation import (
+    BaseRepositoryImplementation,
+    RecordNotFoundError,
+)
 from src.repositories.inventory_item import InventoryItemRepository
+from src.repositories.inventory_movement import InventoryMovementRepository
 from src.repositories.manufactured_item import ManufacturedItemRepository
+from src.schemas.inventory_movement import CreateInventoryMovementSchema
 from src.schemas.order import CreateOrderSchema, ResponseOrderSchema
 from src.schemas.order_detail import CreateOrderDetailSchema
 from src.schemas.order_inventory_detail import CreateOrderInventoryDetailSchema
@@ -26,14 +35,20 @@ class OrderRepository(BaseRepositoryImplementation):
         )
         self.manufactured_item_repository = ManufacturedItemRepository()
         self.inventory_item_repository = InventoryItemRepository()
+        self.inventory_movement_repository = InventoryMovementRepository()
 
     def save_with_details(
         self,
         order_model: OrderModel,
         details: List[CreateOrderDetailSchema],
         inventory_details: List[CreateOrderInventoryDetailSchema],
+        movements: Optional[List[CreateInventoryMovementSchema]] = None,
     ) -> ResponseOrderSchema:
-        """Guarda un pedido con sus detalles y detalles de inventario."""
+        """Guarda un pedido con sus detalles, detalles de inventario y movimientos de stock.
+
+        El stock se valida en la misma transacción que registra el consumo; si
+        no alcanza se lanza ValueError y no se guarda nada.
+        """
         with self.session_scope() as session:
             session.add(order_model)
             session.flush()
@@ -50,11 +65,129 @@ class OrderRepository(BaseRepositoryImplementation):
                 inventory_detail_model = OrderInventoryDetailModel(**detail_dict)
                 session.add(inventory_detail_model)
 
+            if movements:
+                self._consume_stock(session, order_model.id_key, movements)
+
             session.flush()
             session.refresh(order_model)
 
             return self.schema.model_validate(order_model)
 
+    def _consume_stock(
+        self,
+        session: Session,
+        order_id: int,
+        movements: List[CreateInventoryMovementSchema],
+    ) -> None:
+        """Valida el stock real de los items y registra los movimientos de consumo.
+
+        Las filas de los items se bloquean en orden de id antes de sumar los
+        movimientos pendientes, así dos pedidos concurrentes no pueden validar
+        contra el mismo stock y el orden fijo evita deadlocks entre ellos.
+        """
+        required_quantities = {
+            movement.inventory_item_id: -movement.quantity for movement in movements
+        }
+        inventory_item_ids = sorted(required_quantities)
+        session.execute(
+            select(InventoryItemModel.id_key)
+            .where(InventoryItemModel.id_key.in_(inventory_item_ids))
+            .order_by(InventoryItemModel.id_key)
+            .with_for_update()
+        )
+        live_stock = {
+            row.id_key: (row.name, row.stock)
+            for row in session.execute(
+                self.inventory_movement_repository.live_stock_query(inventory_item_ids)
+            )
+        }
+
+        for inventory_item_id in inventory_item_ids:
+            if inventory_item_id not in live_stock:
+                raise RecordNotFoundError(
+                    f"No record found with id {inventory_item_id}"
+                )
+            name, stock = live_stock[inventory_item_id]
+            if stock < required_quantities[inventory_item_id]:
+                raise ValueError(f"Stock insuficiente para el item {name}.")
+
+        session.execute(
+            insert(InventoryMovementModel),
+            [
+                {**movement.model_dump(exclude_none=True), "order_id": order_id}
+                for movement in movements
+            ],
+        )
+
+    def update_status(
+        self, order_id: int, status: OrderStatus
+    ) -> Tuple[str, ResponseOrderSchema]:
+        """Actualiza el estado de un pedido y devuelve también el estado anterior."""
+        with self.session_scope() as session:
+            model = session.get(self.model, order_id, with_for_update=True)
+            if model is None:
+                raise RecordNotFoundError(f"No record found with id {order_id}")
+
+            previous_status = model.status.value
+            model.status = status
+
+            session.flush()
+            session.refresh(model)
+            return previous_status, self.schema.model_validate(model)
+
+    def add_delay(self, order_id: int, delay_minutes: int) -> ResponseOrderSchema:
+        """Suma un retraso al tiempo estimado y al retraso acumulado de un pedido."""
+        with self.session_scope() as session:
+            model = session.get(self.model, order_id, with_for_update=True)
+            if model is None:
+                raise RecordNotFoundError(f"No record found with id {order_id}")
+
+            model.estimated_time = (model.estimated_time or 0) + delay_minutes
+            model.delay_minutes += delay_minutes
+
+            session.flush()
+            session.refresh(model)
+            return self.schema.model_validate(model)
+
+    def mark_paid(self, order_id: int, payment_id: str) -> bool:
+        """Marca un pedido como pagado si todavía no lo estaba.
+
+        Devuelve False si ya estaba pagado, para no procesar el pago dos veces
+        cuando llegan notificaciones concurrentes.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id_key == order_id, self.model.is_paid.isnot(True))
+            .values(payment_id=payment_id, is_paid=True)
+        )
+        with self.session_scope() as session:
+            return session.execute(stmt).rowcount > 0
+
+    def get_kitchen_queue_rows(
+        self,
+    ) -> List[Tuple[int, int, Optional[int], Optional[int]]]:
+        """Obtiene (pedido, retraso, tiempo de preparación, cantidad) de los pedidos en cocina."""
+        stmt = (
+            select(
+                self.model.id_key,
+                self.model.delay_minutes,
+                ManufacturedItemModel.preparation_time,
+                OrderDetailModel.quantity,
+            )
+            .outerjoin(OrderDetailModel, OrderDetailModel.order_id == self.model.id_key)
+            .outerjoin(
+                ManufacturedItemModel,
+                ManufacturedItemModel.id_key == OrderDetailModel.manufactured_item_id,
+            )
+            .where(
+                self.model.status == OrderStatus.en_cocina,
+                self.model.active.is_(True),
+            )
+            .order_by(self.model.date, self.model.id_key)
+        )
+        with self.session_scope() as session:
+            return session.execute(stmt).all()
+
     def count_all_by_user(self, user_id: int, status: OrderStatus | None) -> int:
         """Cuenta todos los pedidos de un usuario, opcionalmente filtrando por estado."""
         stmt = select(func.count()).where(self.model.user_id == user_id)
@@ -84,7 +217,7 @@ class OrderRepository(BaseRepositoryImplementation):
             return [self.schema.model_validate(row) for row in result.scalars()]
 
     def get_top_customers(
-        self, start_date: datetime, end_date: datetime, limit: int = 10
+        self, start_date: datetime, end_date: datetime, limit: Optional[int] = 10
     ) -> List[Dict[str, Any]]:
         """Obtiene los clientes con más pedidos en un rango de fechas."""
         with self.session_scope() as session:
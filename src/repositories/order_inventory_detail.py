@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import desc, func
 
@@ -25,7 +25,7 @@ class OrderInventoryDetailRepository(BaseRepositoryImplementation):
         )
 
     def get_top_inventory_products(
-        self, start_date: datetime, end_date: datetime, limit: int = 10
+        self, start_date: datetime, end_date: datetime, limit: Optional[int] = 10
     ) -> List[Dict[str, Any]]:
         """Obtiene los productos de inventario más vendidos en un rango de fechas."""
         with self.session_scope() as session:
@@ -1,5 +1,9 @@
-from typing import List
+from typing import Any, List
 
+from sqlalchemy import literal, select, union_all
+
+from src.models.inventory_item import InventoryItemModel
+from src.models.manufactured_item import ManufacturedItemModel
 from src.models.promotion import PromotionModel
 from src.models.promotion_inventory_item_detail import PromotionInventoryItemDetailModel
 from src.models.promotion_manufactured_item_detail import (
@@ -96,3 +100,62 @@ class PromotionRepository(BaseRepositoryImplementation):
             session.refresh(promotion_model)
 
             return self.schema.model_validate(promotion_model)
+
+    def get_expansion_rows(self, promotion_ids: List[int]) -> List[Any]:
+        """Obtiene en una sola consulta los items, cantidades y precios de varias promociones.
+
+        Cada fila contiene promotion_id, discount_percentage, item_type, item_id,
+        quantity y price. Las promociones sin items devuelven una fila con item_id nulo.
+        """
+        manufactured_stmt = (
+            select(
+                PromotionModel.id_key.label("promotion_id"),
+                PromotionModel.discount_percentage,
+                literal("manufactured").label("item_type"),
+                ManufacturedItemModel.id_key.label("item_id"),
+                PromotionManufacturedItemDetailModel.quantity,
+                ManufacturedItemModel.price,
+            )
+            .outerjoin(
+                PromotionManufacturedItemDetailModel,
+                PromotionManufacturedItemDetailModel.promotion_id
+                == PromotionModel.id_key,
+            )
+            .outerjoin(
+                ManufacturedItemModel,
+                ManufacturedItemModel.id_key
+                == PromotionManufacturedItemDetailModel.manufactured_item_id,
+            )
+            .where(
+                PromotionModel.id_key.in_(promotion_ids),
+                PromotionModel.active.is_(True),
+            )
+        )
+
+        inventory_stmt = (
+            select(
+                PromotionModel.id_key.label("promotion_id"),
+                PromotionModel.discount_percentage,
+                literal("inventory").label("item_type"),
+                InventoryItemModel.id_key.label("item_id"),
+                PromotionInventoryItemDetailModel.quantity,
+                InventoryItemModel.price,
+            )
+            .outerjoin(
+                PromotionInventoryItemDetailModel,
+                PromotionInventoryItemDetailModel.promotion_id == PromotionModel.id_key,
+            )
+            .outerjoin(
+                InventoryItemModel,
+                InventoryItemModel.id_key
+                == PromotionInventoryItemDetailModel.inventory_item_id,
+            )
+            .where(
+                PromotionModel.id_key.in_(promotion_ids),
+                PromotionModel.active.is_(True),
+            )
+        )
+
+        with self.session_scope() as session:
+            result = session.execute(union_all(manufactured_stmt, inventory_stmt))
+            return result.all()
@@ -0,0 +1,592 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import (
+    Date,
+    String,
+    and_,
+    cast,
+    delete,
+    desc,
+    func,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from src.models.base import BaseModel
+from src.models.daily_category_sales import DailyCategorySalesModel
+from src.models.daily_customer_sales import DailyCustomerSalesModel
+from src.models.daily_financials import DailyFinancialsModel
+from src.models.daily_product_sales import DailyProductSalesModel
+from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_item_category import InventoryItemCategoryModel
+from src.models.inventory_purchase import InventoryPurchaseModel
+from src.models.invoice import InvoiceModel, InvoiceType
+from src.models.manufactured_item import ManufacturedItemModel
+from src.models.manufactured_item_category import ManufacturedItemCategoryModel
+from src.models.order import OrderModel, OrderStatus
+from src.models.order_detail import OrderDetailModel
+from src.models.order_inventory_detail import OrderInventoryDetailModel
+from src.models.sales_rollup_state import SalesRollupStateModel
+from src.models.user import UserModel
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.schemas.daily_financials import (
+    CreateDailyFinancialsSchema,
+    ResponseDailyFinancialsSchema,
+)
+from src.schemas.sales_rollup import ProductBreakdown
+
+BACKFILL_STATE = "backfill"
+
+# Clave del advisory lock de los acumulados: los incrementos lo toman
+# compartido y los recálculos exclusivo.
+ROLLUP_LOCK_KEY = 740_040
+
+MANUFACTURED_ITEM = "manufactured_item"
+INVENTORY_ITEM = "inventory_item"
+
+# Columnas clave y columnas acumuladas de cada tabla diaria.
+ROLLUP_TABLES: Dict[Type[BaseModel], Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    DailyProductSalesModel: (
+        ("day", "item_type", "item_id", "delivery_method"),
+        ("quantity", "revenue"),
+    ),
+    DailyCategorySalesModel: (
+        ("day", "item_type", "category_id"),
+        ("quantity", "revenue"),
+    ),
+    DailyCustomerSalesModel: (("day", "user_id"), ("order_count", "total_amount")),
+    DailyFinancialsModel: (
+        ("day",),
+        ("revenue", "invoice_count", "expenses", "purchase_count"),
+    ),
+}
+
+RollupRows = Dict[Type[BaseModel], Dict[Tuple[Any, ...], Dict[str, float]]]
+
+ITEM_SOURCES = (
+    (
+        MANUFACTURED_ITEM,
+        OrderDetailModel,
+        OrderDetailModel.manufactured_item_id,
+        ManufacturedItemModel,
+        ManufacturedItemCategoryModel,
+    ),
+    (
+        INVENTORY_ITEM,
+        OrderInventoryDetailModel,
+        OrderInventoryDetailModel.inventory_item_id,
+        InventoryItemModel,
+        InventoryItemCategoryModel,
+    ),
+)
+
+
+class SalesRollupRepository(BaseRepositoryImplementation):
+    """Repositorio para los acumulados diarios de ventas, clientes, ingresos y gastos."""
+
+    def __init__(self):
+        super().__init__(
+            model=DailyFinancialsModel,
+            create_schema=CreateDailyFinancialsSchema,
+            response_schema=ResponseDailyFinancialsSchema,
+        )
+
+    def increment(self, rows: RollupRows) -> None:
+        """Suma los valores a las filas diarias, creándolas si todavía no existen.
+
+        Las filas se ordenan por clave para que dos transacciones concurrentes
+        bloqueen las mismas filas en el mismo orden. El lock compartido sólo
+        espera a un recálculo en curso, no a otros incrementos.
+        """
+        with self.session_scope() as session:
+            session.execute(select(func.pg_advisory_xact_lock_shared(ROLLUP_LOCK_KEY)))
+            for model, model_rows in rows.items():
+                if not model_rows:
+                    continue
+                keys, values = ROLLUP_TABLES[model]
+                session.execute(
+                    self._increment_statement(model),
+                    [
+                        {**dict(zip(keys, key)), **dict.fromkeys(values, 0), **row}
+                        for key, row in sorted(model_rows.items())
+                    ],
+                )
+
+    @staticmethod
+    def _increment_statement(model: Type[BaseModel]):
+        """Construye el INSERT ... ON CONFLICT que suma sobre la fila existente."""
+        keys, values = ROLLUP_TABLES[model]
+        table = model.__table__
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in keys],
+            set_={name: table.c[name] + stmt.excluded[name] for name in values},
+        )
+
+    def get_top_products(
+        self,
+        days: Optional[Tuple[Optional[date], Optional[date]]],
+        edges: List[Tuple[Optional[datetime], Optional[datetime]]],
+        limit: int,
+        breakdown: Optional[ProductBreakdown] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene los productos más vendidos con una sola consulta.
+
+        Une con UNION ALL los acumulados de los días completos y los detalles de
+        pedidos entregados de los tramos sueltos, agrupa por producto y numera
+        las filas en SQL. Con un desglose, el ranking se arma dentro de cada
+        categoría o forma de entrega.
+        """
+        rollup = DailyProductSalesModel
+        parts = []
+        if days is not None:
+            parts.append(
+                select(
+                    rollup.item_type,
+                    rollup.item_id,
+                    rollup.delivery_method,
+                    rollup.quantity,
+                    rollup.revenue,
+                ).where(*self._day_filter(rollup, *days))
+            )
+        for start, end in edges:
+            for item_type, detail_model, item_column, _, _ in ITEM_SOURCES:
+                parts.append(
+                    select(
+                        literal(item_type, String).label("item_type"),
+                        item_column.label("item_id"),
+                        cast(OrderModel.delivery_method, String).label(
+                            "delivery_method"
+                        ),
+                        detail_model.quantity,
+                        detail_model.subtotal.label("revenue"),
+                    )
+                    .join(OrderModel, OrderModel.id_key == detail_model.order_id)
+                    .where(
+                        OrderModel.status == OrderStatus.entregado,
+                        item_column.isnot(None),
+                        *self._datetime_filter(OrderModel.date, start, end, True),
+                    )
+                )
+        if not parts:
+            return []
+
+        lines = union_all(*parts).subquery()
+        manufactured = aliased(ManufacturedItemModel)
+        manufactured_category = aliased(ManufacturedItemCategoryModel)
+        inventory = aliased(InventoryItemModel)
+        inventory_category = aliased(InventoryItemCategoryModel)
+        group_columns = [
+            lines.c.item_type,
+            lines.c.item_id,
+            func.coalesce(manufactured.name, inventory.name).label("name"),
+            func.coalesce(
+                manufactured_category.name, inventory_category.name, "Unknown"
+            ).label("category"),
+        ]
+        if breakdown == ProductBreakdown.delivery_method:
+            group_columns.append(lines.c.delivery_method)
+
+        totals = (
+            select(
+                *group_columns,
+                func.sum(lines.c.quantity).label("quantity"),
+                func.sum(lines.c.revenue).label("revenue"),
+            )
+            .outerjoin(
+                manufactured,
+                and_(
+                    lines.c.item_type == MANUFACTURED_ITEM,
+                    manufactured.id_key == lines.c.item_id,
+                ),
+            )
+            .outerjoin(
+                manufactured_category,
+                manufactured_category.id_key == manufactured.category_id,
+            )
+            .outerjoin(
+                inventory,
+                and_(
+                    lines.c.item_type == INVENTORY_ITEM,
+                    inventory.id_key == lines.c.item_id,
+                ),
+            )
+            .outerjoin(
+                inventory_category, inventory_category.id_key == inventory.category_id
+            )
+            .group_by(*group_columns)
+            .having(func.sum(lines.c.quantity) != 0)
+            .subquery()
+        )
+
+        partition = None
+        if breakdown == ProductBreakdown.category:
+            partition = totals.c.category
+        elif breakdown == ProductBreakdown.delivery_method:
+            partition = totals.c.delivery_method
+        ranked = select(
+            totals,
+            func.row_number()
+            .over(
+                partition_by=partition,
+                order_by=(
+                    desc(totals.c.quantity),
+                    totals.c.item_type,
+                    totals.c.item_id,
+                ),
+            )
+            .label("rank"),
+        ).subquery()
+        stmt = (
+            select(ranked)
+            .where(ranked.c.rank <= limit)
+            .order_by(
+                *([ranked.c[partition.name]] if partition is not None else []),
+                ranked.c.rank,
+            )
+        )
+
+        with self.session_scope() as session:
+            return [
+                {
+                    "id": r.item_id,
+                    "name": r.name,
+                    "quantity": r.quantity,
+                    "revenue": r.revenue,
+                    "category": r.category,
+                    "type": r.item_type,
+                    **(
+                        {"delivery_method": r.delivery_method}
+                        if breakdown == ProductBreakdown.delivery_method
+                        else {}
+                    ),
+                }
+                for r in session.execute(stmt)
+            ]
+
+    def get_category_totals(
+        self,
+        start_day: Optional[date],
+        end_day: Optional[date],
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene las ventas por categoría en un rango de días desde los acumulados."""
+        rollup = DailyCategorySalesModel
+        categories = []
+        with self.session_scope() as session:
+            for item_type, _, _, _, category_model in ITEM_SOURCES:
+                stmt = (
+                    select(
+                        category_model.name.label("category_name"),
+                        func.sum(rollup.quantity).label("total_quantity"),
+                        func.sum(rollup.revenue).label("total_revenue"),
+                    )
+                    .select_from(rollup)
+                    .outerjoin(
+                        category_model, category_model.id_key == rollup.category_id
+                    )
+                    .where(
+                        rollup.item_type == item_type,
+                        *self._day_filter(rollup, start_day, end_day),
+                    )
+                    .group_by(category_model.name)
+                    .having(func.sum(rollup.quantity) != 0)
+                    .order_by(desc(func.sum(rollup.revenue)))
+                    .limit(limit)
+                )
+                categories += [
+                    {
+                        "category": r.category_name or "Unknown",
+                        "type": item_type,
+                        "quantity": r.total_quantity,
+                        "revenue": r.total_revenue,
+                    }
+                    for r in session.execute(stmt)
+                ]
+        return categories
+
+    def get_customer_totals(
+        self,
+        start_day: Optional[date],
+        end_day: Optional[date],
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene los pedidos por cliente en un rango de días desde los acumulados."""
+        rollup = DailyCustomerSalesModel
+        stmt = (
+            select(
+                UserModel.id_key,
+                UserModel.full_name,
+                UserModel.email,
+                func.sum(rollup.order_count).label("order_count"),
+                func.sum(rollup.total_amount).label("total_amount"),
+            )
+            .join(UserModel, UserModel.id_key == rollup.user_id)
+            .where(*self._day_filter(rollup, start_day, end_day))
+            .group_by(UserModel.id_key, UserModel.full_name, UserModel.email)
+            .having(func.sum(rollup.order_count) != 0)
+            .order_by(desc(func.sum(rollup.order_count)))
+            .limit(limit)
+        )
+        with self.session_scope() as session:
+            return [
+                {
+                    "id": r.id_key,
+                    "name": r.full_name,
+                    "email": r.email,
+                    "order_count": r.order_count,
+                    "total_amount": r.total_amount,
+                }
+                for r in session.execute(stmt)
+            ]
+
+    def get_financial_totals(
+        self, start_day: Optional[date], end_day: Optional[date]
+    ) -> Dict[str, float]:
+        """Obtiene los ingresos y gastos de un rango de días desde los acumulados."""
+        rollup = DailyFinancialsModel
+        stmt = select(
+            func.coalesce(func.sum(rollup.revenue), 0).label("total_revenue"),
+            func.coalesce(func.sum(rollup.invoice_count), 0).label("invoice_count"),
+            func.coalesce(func.sum(rollup.expenses), 0).label("purchase_costs"),
+            func.coalesce(func.sum(rollup.purchase_count), 0).label("purchase_count"),
+        ).where(*self._day_filter(rollup, start_day, end_day))
+        with self.session_scope() as session:
+            return dict(session.execute(stmt).one()._mapping)
+
+    def get_first_day(self) -> Optional[date]:
+        """Primer día con datos en las tablas originales o en los acumulados."""
+        candidates = [
+            select(func.min(OrderModel.date)),
+            select(func.min(InvoiceModel.date)),
+            select(func.min(InventoryPurchaseModel.purchase_date)),
+            *(select(func.min(model.day)) for model in ROLLUP_TABLES),
+        ]
+        with self.session_scope() as session:
+            days = [
+                value.date() if isinstance(value, datetime) else value
+                for value in (session.scalar(stmt) for stmt in candidates)
+                if value is not None
+            ]
+        return min(days, default=None)
+
+    def get_stored_rollups(
+        self, start_day: Optional[date], end_day: Optional[date]
+    ) -> RollupRows:
+        """Lee los acumulados guardados de un rango de días."""
+        stored: RollupRows = {}
+        with self.session_scope() as session:
+            for model, (keys, values) in ROLLUP_TABLES.items():
+                stmt = select(*(getattr(model, name) for name in keys + values)).where(
+                    *self._day_filter(model, start_day, end_day)
+                )
+                stored[model] = {
+                    tuple(row[: len(keys)]): dict(zip(values, row[len(keys) :]))
+                    for row in session.execute(stmt)
+                }
+        return stored
+
+    def compute_rollups(
+        self, start_day: Optional[date], end_day: Optional[date]
+    ) -> RollupRows:
+        """Calcula los acumulados de un rango de días desde las tablas originales."""
+        with self.session_scope() as session:
+            return self._compute_rollups(session, start_day, end_day)
+
+    def rebuild(self, start_day: Optional[date], end_day: Optional[date]) -> None:
+        """Recalcula y reemplaza los acumulados de un rango de días en una transacción.
+
+        Toma el lock exclusivo de los acumulados antes de calcular, así ningún
+        incremento se confirma entre el cálculo y el reemplazo y se pierde.
+        """
+        with self.session_scope() as session:
+            session.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+            rows = self._compute_rollups(session, start_day, end_day)
+            self._replace(session, start_day, end_day, rows)
+
+    def _compute_rollups(
+        self, session: Session, start_day: Optional[date], end_day: Optional[date]
+    ) -> RollupRows:
+        """Calcula los acumulados de un rango de días en la sesión dada."""
+        start = datetime.combine(start_day, time.min) if start_day else None
+        end = (
+            datetime.combine(end_day + timedelta(days=1), time.min) if end_day else None
+        )
+        computed: RollupRows = {model: {} for model in ROLLUP_TABLES}
+        products = computed[DailyProductSalesModel]
+        categories = computed[DailyCategorySalesModel]
+
+        for item_type, detail_model, item_column, item_model, _ in ITEM_SOURCES:
+            day = func.date(OrderModel.date, type_=Date)
+            stmt = (
+                select(
+                    day,
+                    item_column,
+                    item_model.category_id,
+                    OrderModel.delivery_method,
+                    func.sum(detail_model.quantity),
+                    func.sum(detail_model.subtotal),
+                )
+                .select_from(detail_model)
+                .join(OrderModel, OrderModel.id_key == detail_model.order_id)
+                .join(item_model, item_model.id_key == item_column)
+                .where(
+                    OrderModel.status == OrderStatus.entregado,
+                    *self._datetime_filter(OrderModel.date, start, end),
+                )
+                .group_by(
+                    day,
+                    item_column,
+                    item_model.category_id,
+                    OrderModel.delivery_method,
+                )
+            )
+            category_totals = defaultdict(lambda: {"quantity": 0, "revenue": 0})
+            for (
+                row_day,
+                item_id,
+                category_id,
+                delivery_method,
+                quantity,
+                revenue,
+            ) in session.execute(stmt):
+                products[(row_day, item_type, item_id, delivery_method.value)] = {
+                    "quantity": quantity,
+                    "revenue": revenue,
+                }
+                totals = category_totals[(row_day, item_type, category_id)]
+                totals["quantity"] += quantity
+                totals["revenue"] += revenue
+            categories.update(category_totals)
+
+        day = func.date(OrderModel.date, type_=Date)
+        stmt = (
+            select(
+                day,
+                OrderModel.user_id,
+                func.count(OrderModel.id_key),
+                func.sum(OrderModel.final_total),
+            )
+            .where(
+                OrderModel.status == OrderStatus.entregado,
+                *self._datetime_filter(OrderModel.date, start, end),
+            )
+            .group_by(day, OrderModel.user_id)
+        )
+        computed[DailyCustomerSalesModel] = {
+            (row_day, user_id): {"order_count": count, "total_amount": total}
+            for row_day, user_id, count, total in session.execute(stmt)
+        }
+
+        financials = defaultdict(dict)
+        day = func.date(InvoiceModel.date, type_=Date)
+        stmt = (
+            select(day, func.sum(InvoiceModel.total), func.count(InvoiceModel.id_key))
+            .where(
+                InvoiceModel.type == InvoiceType.factura,
+                *self._datetime_filter(InvoiceModel.date, start, end),
+            )
+            .group_by(day)
+        )
+        for row_day, revenue, count in session.execute(stmt):
+            financials[(row_day,)].update(revenue=revenue, invoice_count=count)
+
+        day = func.date(InventoryPurchaseModel.purchase_date, type_=Date)
+        stmt = (
+            select(
+                day,
+                func.sum(InventoryPurchaseModel.total_cost),
+                func.count(InventoryPurchaseModel.id_key),
+            )
+            .where(
+                *self._datetime_filter(InventoryPurchaseModel.purchase_date, start, end)
+            )
+            .group_by(day)
+        )
+        for row_day, expenses, count in session.execute(stmt):
+            financials[(row_day,)].update(expenses=expenses, purchase_count=count)
+        computed[DailyFinancialsModel] = dict(financials)
+
+        return computed
+
+    def _replace(
+        self,
+        session: Session,
+        start_day: Optional[date],
+        end_day: Optional[date],
+        rows: RollupRows,
+    ) -> None:
+        """Reemplaza los acumulados de un rango de días en la sesión dada."""
+        for model, (keys, values) in ROLLUP_TABLES.items():
+            session.execute(
+                delete(model).where(*self._day_filter(model, start_day, end_day))
+            )
+            if rows.get(model):
+                session.execute(
+                    insert(model.__table__),
+                    [
+                        {**dict(zip(keys, key)), **dict.fromkeys(values, 0), **row}
+                        for key, row in sorted(rows[model].items())
+                    ],
+                )
+
+    def claim_backfill(self) -> bool:
+        """Registra el inicio del recálculo inicial. Devuelve False si ya se registró."""
+        stmt = (
+            insert(SalesRollupStateModel.__table__)
+            .values(name=BACKFILL_STATE)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        with self.session_scope() as session:
+            return session.execute(stmt).rowcount > 0
+
+    def mark_backfilled(self) -> None:
+        """Registra que los acumulados cubren todo el historial."""
+        stmt = insert(SalesRollupStateModel.__table__).values(
+            name=BACKFILL_STATE, completed_at=func.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"], set_={"completed_at": stmt.excluded.completed_at}
+        )
+        with self.session_scope() as session:
+            session.execute(stmt)
+
+    def is_backfilled(self) -> bool:
+        """Indica si el recálculo inicial de los acumulados ya terminó."""
+        stmt = select(SalesRollupStateModel.completed_at).where(
+            SalesRollupStateModel.name == BACKFILL_STATE
+        )
+        with self.session_scope() as session:
+            return session.scalar(stmt) is not None
+
+    @staticmethod
+    def _day_filter(
+        model: Type[BaseModel], start_day: Optional[date], end_day: Optional[date]
+    ) -> List[Any]:
+        """Construye el filtro por día de una tabla de acumulados."""
+        conditions = []
+        if start_day:
+            conditions.append(model.day >= start_day)
+        if end_day:
+            conditions.append(model.day <= end_day)
+        return conditions
+
+    @staticmethod
+    def _datetime_filter(
+        column: Any,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        include_end: bool = False,
+    ) -> List[Any]:
+        """Construye el filtro [inicio, fin) sobre una columna de fecha, o [inicio, fin]."""
+        conditions = []
+        if start:
+            conditions.append(column >= start)
+        if end:
+            conditions.append(column <= end if include_end else column < end)
+        return conditions
@@ -1,8 +1,6 @@
-import re
 from typing import Optional
 
-import bcrypt
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr
 
 from src.models.user import UserRole
 
@@ -17,15 +15,6 @@ class RegisterRequest(BaseModel):
     role: UserRole = UserRole.cliente
     active: bool = True
 
-    @field_validator("password")
-    def hash_password(cls, value: str) -> str:
-        """Hash the password using bcrypt."""
-        if not value or re.compile(r"^\$2[aby]\$.{56}$").match(value):
-            return value
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(value.encode("utf-8"), salt)
-        return hashed_password.decode("utf-8")
-
 
 class LoginRequest(BaseModel):
     """Schema for user login requests."""
@@ -0,0 +1,14 @@
+from src.schemas.base import BaseSchema
+
+
+class BaseCacheVersionSchema(BaseSchema):
+    name: str
+    version: int = 0
+
+
+class CreateCacheVersionSchema(BaseCacheVersionSchema):
+    pass
+
+
+class ResponseCacheVersionSchema(BaseCacheVersionSchema):
+    id_key: int
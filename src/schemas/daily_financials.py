@@ -0,0 +1,19 @@
+from datetime import date
+
+from src.schemas.base import BaseSchema
+
+
+class BaseDailyFinancialsSchema(BaseSchema):
+    day: date
+    revenue: float = 0
+    invoice_count: int = 0
+    expenses: float = 0
+    purchase_count: int = 0
+
+
+class CreateDailyFinancialsSchema(BaseDailyFinancialsSchema):
+    pass
+
+
+class ResponseDailyFinancialsSchema(BaseDailyFinancialsSchema):
+    id_key: int
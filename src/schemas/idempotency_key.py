@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from src.schemas.base import BaseSchema
+
+
+class BaseIdempotencyKeySchema(BaseSchema):
+    key: str
+    user_id: int
+    endpoint: str
+    request_hash: str
+    claimed_at: datetime
+    expires_at: datetime
+
+
+class CreateIdempotencyKeySchema(BaseIdempotencyKeySchema):
+    pass
+
+
+class ResponseIdempotencyKeySchema(BaseIdempotencyKeySchema):
+    id_key: int
+    status_code: Optional[int] = None
+    response_body: Optional[Any] = None
+    created_at: datetime
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from src.schemas.base import BaseSchema
+
+
+class BaseImageDerivativeSchema(BaseSchema):
+    source_url: str
+    variant: str
+    url: str
+
+
+class CreateImageDerivativeSchema(BaseImageDerivativeSchema):
+    pass
+
+
+class ResponseImageDerivativeSchema(BaseImageDerivativeSchema):
+    id_key: int
+
+
+class ImageDerivativesSchema(BaseSchema):
+    thumbnail_url: Optional[str] = None
+    thumbnail_webp_url: Optional[str] = None
+    medium_url: Optional[str] = None
+    medium_webp_url: Optional[str] = None
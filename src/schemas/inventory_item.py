@@ -1,6 +1,7 @@
 from typing import Optional
 
 from src.schemas.base import BaseSchema
+from src.schemas.image_derivative import ImageDerivativesSchema
 from src.schemas.inventory_item_category import ResponseInventoryItemCategorySchema
 from src.schemas.measurement_unit import ResponseMeasurementUnitSchema
 
@@ -24,6 +25,7 @@ class CreateInventoryItemSchema(BaseInventoryItemSchema):
 class ResponseInventoryItemSchema(BaseInventoryItemSchema):
     measurement_unit: Optional[ResponseMeasurementUnitSchema] = None
     category: ResponseInventoryItemCategorySchema
+    image_derivatives: Optional[ImageDerivativesSchema] = None
     id_key: int
 
 
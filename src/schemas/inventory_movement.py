@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+
+from src.models.inventory_movement import InventoryMovementType
+from src.schemas.base import BaseSchema
+
+
+class BaseInventoryMovementSchema(BaseSchema):
+    quantity: float
+    type: InventoryMovementType
+    notes: Optional[str] = None
+
+
+class CreateInventoryMovementSchema(BaseInventoryMovementSchema):
+    inventory_item_id: int
+    order_id: Optional[int] = None
+    inventory_purchase_id: Optional[int] = None
+    date: Optional[datetime] = None
+
+
+class ResponseInventoryMovementSchema(BaseInventoryMovementSchema):
+    id_key: int
+    inventory_item_id: int
+    order_id: Optional[int] = None
+    inventory_purchase_id: Optional[int] = None
+    date: datetime
+    compacted: bool
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.models.job import JobStatus
+from src.schemas.base import BaseSchema
+
+
+class BaseJobSchema(BaseSchema):
+    type: str
+    payload: Dict[str, Any]
+    max_attempts: int = 5
+
+
+class CreateJobSchema(BaseJobSchema):
+    run_at: Optional[datetime] = None
+
+
+class ResponseJobSchema(BaseJobSchema):
+    id_key: int
+    status: JobStatus
+    attempts: int
+    run_at: datetime
+    locked_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime
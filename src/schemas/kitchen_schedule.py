@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List
+
+from src.schemas.base import BaseSchema
+
+
+class KitchenScheduleEntrySchema(BaseSchema):
+    order_id: int
+    position: int
+    prep_minutes: float
+    delay_minutes: float = 0.0
+    projected_start: datetime
+    projected_finish: datetime
+
+
+class KitchenScheduleSchema(BaseSchema):
+    generated_at: datetime
+    cook_count: int
+    backlog_minutes: float
+    orders: List[KitchenScheduleEntrySchema] = []
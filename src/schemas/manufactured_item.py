@@ -1,6 +1,7 @@
 from typing import List, Optional
 
 from src.schemas.base import BaseSchema
+from src.schemas.image_derivative import ImageDerivativesSchema
 from src.schemas.manufactured_item_category import (
     ResponseManufacturedItemCategorySchema,
 )
@@ -28,6 +29,7 @@ class CreateManufacturedItemSchema(BaseManufacturedItemSchema):
 class ResponseManufacturedItemSchema(BaseManufacturedItemSchema):
     category: ResponseManufacturedItemCategorySchema
     details: List[ResponseManufacturedItemDetailSchema] = []
+    image_derivatives: Optional[ImageDerivativesSchema] = None
     id_key: int
 
 
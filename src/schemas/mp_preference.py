@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from src.schemas.base import BaseSchema
+
+
+class BaseMpPreferenceSchema(BaseSchema):
+    order_id: int
+    preference_id: str
+    init_point: str
+    items_hash: str
+    expires_at: datetime
+
+
+class CreateMpPreferenceSchema(BaseMpPreferenceSchema):
+    pass
+
+
+class ResponseMpPreferenceSchema(BaseMpPreferenceSchema):
+    id_key: int
+    created_at: datetime
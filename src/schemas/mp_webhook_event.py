@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.schemas.base import BaseSchema
+
+
+class BaseMpWebhookEventSchema(BaseSchema):
+    notification_id: str
+    type: str
+    action: Optional[str] = None
+    resource_id: str
+    payload: Dict[str, Any]
+
+
+class CreateMpWebhookEventSchema(BaseMpWebhookEventSchema):
+    pass
+
+
+class ResponseMpWebhookEventSchema(BaseMpWebhookEventSchema):
+    id_key: int
+    payment_status: Optional[str] = None
+    received_at: datetime
+    processed_at: Optional[datetime] = None
@@ -31,6 +31,7 @@ class ResponseOrderSchema(BaseOrderSchema):
     date: Optional[datetime] = None
     payment_id: Optional[str] = None
     estimated_time: Optional[int] = None
+    delay_minutes: int = 0
     final_total: Optional[float] = None
     discount: Optional[float] = None
     total: Optional[float] = None
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from src.models.order import OrderStatus
+from src.schemas.base import BaseSchema
+
+
+class OrderEventSchema(BaseSchema):
+    type: str
+    order_id: int
+    user_id: int
+    status: OrderStatus
+    previous_status: Optional[OrderStatus] = None
+    estimated_time: Optional[int] = None
+    is_paid: Optional[bool] = None
+    payment_status: Optional[str] = None
+    timestamp: datetime
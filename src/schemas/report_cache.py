@@ -0,0 +1,11 @@
+from src.schemas.base import BaseSchema
+
+
+class ReportCacheMetricsSchema(BaseSchema):
+    hits: int
+    coalesced: int
+    misses: int
+    invalidations: int
+    evictions: int
+    entries: int
+    hit_rate: float
@@ -0,0 +1,30 @@
+import enum
+from datetime import datetime
+from typing import List
+
+from src.schemas.base import BaseSchema
+
+
+class SeriesBucket(enum.Enum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class ReportSeriesPointSchema(BaseSchema):
+    bucket: datetime
+    revenue: float
+    invoice_count: int
+    expenses: float
+    purchase_count: int
+    order_count: int
+    average_ticket: float
+
+
+class ReportSeriesSchema(BaseSchema):
+    bucket: SeriesBucket
+    timezone: str
+    start_date: datetime
+    end_date: datetime
+    points: List[ReportSeriesPointSchema] = []
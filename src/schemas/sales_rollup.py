@@ -0,0 +1,16 @@
+import enum
+from typing import Any, Dict, List
+
+from src.schemas.base import BaseSchema
+
+
+class ProductBreakdown(enum.Enum):
+    category = "category"
+    delivery_method = "delivery_method"
+
+
+class RollupMismatchSchema(BaseSchema):
+    table: str
+    key: List[Any]
+    expected: Dict[str, float]
+    actual: Dict[str, float]
@@ -1,8 +1,6 @@
-import re
 from typing import Optional
 
-import bcrypt
-from pydantic import EmailStr, field_validator
+from pydantic import EmailStr
 
 from src.models.user import UserRole
 from src.schemas.base import BaseSchema
@@ -26,15 +24,6 @@ class CreateUserSchema(BaseUserSchema):
     image_url: Optional[str] = None
     first_login: Optional[bool] = False
 
-    @field_validator("password")
-    def hash_password(cls, value: Optional[str]) -> Optional[str]:
-        """Hash the password using bcrypt if it's not already hashed."""
-        if not value or re.compile(r"^\$2[aby]\$.{56}$").match(value):
-            return value
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(value.encode("utf-8"), salt)
-        return hashed_password.decode("utf-8")
-
 
 class ResponseUserSchema(CreateUserSchema):
     """Schema for user responses."""
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.models.idempotency_key import IdempotencyKeyModel
+from src.repositories.idempotency_key import IdempotencyKeyRepository
+from src.schemas.idempotency_key import (
+    CreateIdempotencyKeySchema,
+    ResponseIdempotencyKeySchema,
+)
+from src.services.base_implementation import BaseServiceImplementation
+
+
+class IdempotencyService(
+    BaseServiceImplementation[IdempotencyKeyModel, ResponseIdempotencyKeySchema]
+):
+    """Servicio para ejecutar operaciones una única vez por Idempotency-Key."""
+
+    def __init__(self):
+        super().__init__(
+            repository=IdempotencyKeyRepository(),
+            model=IdempotencyKeyModel,
+            create_schema=CreateIdempotencyKeySchema,
+            response_schema=ResponseIdempotencyKeySchema,
+        )
+
+    async def execute(
+        self,
+        key: Optional[str],
+        user_id: int,
+        endpoint: str,
+        request_payload: Any,
+        handler: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Ejecuta la operación o devuelve la respuesta guardada si la clave ya se usó.
+
+        Si la operación falla, la clave se libera para que el cliente pueda reintentar.
+        Una reserva sin respuesta más vieja que ``idempotency_claim_timeout_seconds``
+        se considera abandonada (el proceso se cayó) y la toma el nuevo intento.
+        """
+        if not key:
+            return await handler()
+
+        now = datetime.now()
+        schema = CreateIdempotencyKeySchema(
+            key=key,
+            user_id=user_id,
+            endpoint=endpoint,
+            request_hash=self._hash_payload(request_payload),
+            claimed_at=now,
+            expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours or 24),
+        )
+
+        existing = self.repository.reserve(schema)
+        if existing and existing.expires_at < datetime.now():
+            self.repository.delete_expired(datetime.now())
+            existing = self.repository.reserve(schema)
+
+        if existing and not self._take_over_abandoned(existing, schema):
+            return self._replay(existing, schema.request_hash)
+
+        try:
+            result = await handler()
+        except BaseException:
+            self.repository.release(key, user_id, endpoint)
+            raise
+
+        self.repository.complete(key, user_id, endpoint, 200, jsonable_encoder(result))
+        return result
+
+    def _take_over_abandoned(
+        self,
+        existing: ResponseIdempotencyKeySchema,
+        schema: CreateIdempotencyKeySchema,
+    ) -> bool:
+        """Toma la reserva de una solicitud que nunca terminó con el mismo cuerpo."""
+        claim_timeout = timedelta(
+            seconds=settings.idempotency_claim_timeout_seconds or 120
+        )
+        return (
+            existing.status_code is None
+            and existing.request_hash == schema.request_hash
+            and existing.claimed_at + claim_timeout < schema.claimed_at
+            and self.repository.take_over(existing, schema.claimed_at)
+        )
+
+    def delete_expired(self) -> int:
+        """Elimina las claves de idempotencia vencidas."""
+        return self.repository.delete_expired(datetime.now())
+
+    async def run_cleanup_loop(self, interval_seconds: int) -> None:
+        """Elimina periódicamente las claves vencidas."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.delete_expired)
+            except Exception as e:
+                print(f"Error al limpiar las claves de idempotencia: {e}")
+
+    @staticmethod
+    def _replay(
+        existing: ResponseIdempotencyKeySchema, request_hash: str
+    ) -> JSONResponse:
+        """Devuelve la respuesta guardada de una clave ya utilizada."""
+        if existing.request_hash != request_hash:
+            raise HTTPException(
+                status_code=422,
+                detail="La Idempotency-Key ya fue usada con un cuerpo distinto.",
+            )
+
+        if existing.status_code is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Hay una solicitud en curso con la misma Idempotency-Key.",
+            )
+
+        return JSONResponse(
+            status_code=existing.status_code,
+            content=existing.response_body,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    @staticmethod
+    def _hash_payload(request_payload: Any) -> str:
+        """Calcula un hash estable del cuerpo de la solicitud."""
+        serialized = json.dumps(
+            jsonable_encoder(request_payload), sort_keys=True, default=str
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
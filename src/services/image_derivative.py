@@ -0,0 +1,120 @@
+import io
+from typing import Any, Dict, Iterable, Optional
+
+from PIL import Image, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.repositories.image_derivative import ImageDerivativeRepository
+from src.schemas.image_derivative import ImageDerivativesSchema
+from src.services.job_queue import JobQueue, PermanentJobError
+from src.utils.image_storage import get_image_storage
+from src.utils.pillow import render_derivatives
+
+IMAGE_DERIVATIVES_JOB = "image_derivatives"
+DERIVATIVES_FOLDER = "derivatives"
+
+# Variante generada -> campo del esquema de respuesta.
+VARIANT_FIELDS = {
+    "thumbnail_jpg": "thumbnail_url",
+    "thumbnail_webp": "thumbnail_webp_url",
+    "medium_jpg": "medium_url",
+    "medium_webp": "medium_webp_url",
+}
+
+
+class ImageDerivativeService:
+    """Genera y sirve versiones reducidas (miniatura y mediana, WebP y JPEG) de las imágenes.
+
+    Las variantes se generan con Pillow en un trabajo de la cola después de
+    cada subida y se guardan en el mismo almacenamiento que la original. Los
+    listados del catálogo piden las variantes de toda la página en una sola
+    consulta, sin caché en memoria que pueda quedar desactualizada en otros
+    workers cuando se borra o regenera una imagen.
+    """
+
+    _instance: Optional["ImageDerivativeService"] = None
+
+    def __new__(cls) -> "ImageDerivativeService":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(ImageDerivativeService, cls).__new__(cls)
+            cls._instance.repository = ImageDerivativeRepository()
+            cls._instance.storage = get_image_storage()
+            cls._instance.job_queue = JobQueue()
+            cls._instance.job_queue.register(
+                IMAGE_DERIVATIVES_JOB, cls._instance._generate
+            )
+        return cls._instance
+
+    def schedule(self, image_url: str) -> None:
+        """Encola la generación de las variantes de una imagen recién subida."""
+        if self.storage.owns(image_url):
+            self.job_queue.enqueue(IMAGE_DERIVATIVES_JOB, {"image_url": image_url})
+
+    def schedule_missing(self) -> int:
+        """Encola las variantes de las imágenes subidas antes de que existieran."""
+        image_urls = [
+            image_url
+            for image_url in self.repository.find_missing_sources()
+            if self.storage.owns(image_url)
+        ]
+        for image_url in image_urls:
+            self.schedule(image_url)
+        return len(image_urls)
+
+    def get_many(
+        self, image_urls: Iterable[Optional[str]]
+    ) -> Dict[str, ImageDerivativesSchema]:
+        """Devuelve las variantes disponibles de varias imágenes."""
+        sources = list(set(filter(None, image_urls)))
+        return {
+            image_url: self._to_schema(variants)
+            for image_url, variants in self.repository.find_by_sources(sources).items()
+        }
+
+    def delete(self, image_url: str) -> None:
+        """Elimina las variantes de una imagen que se borró."""
+        for url in self.repository.delete_by_source(image_url):
+            self.storage.delete(url)
+
+    async def _generate(self, payload: Dict[str, Any]) -> None:
+        """Trabajo en segundo plano: genera y guarda las variantes de una imagen."""
+        await run_in_threadpool(self._generate_sync, payload["image_url"])
+
+    def _generate_sync(self, image_url: str) -> None:
+        """Lee la imagen, genera las variantes con Pillow y las sube."""
+        try:
+            image_data = self.storage.read(image_url)
+        except (FileNotFoundError, ValueError) as e:
+            raise PermanentJobError(f"No se puede leer la imagen {image_url}: {e}")
+
+        try:
+            rendered = render_derivatives(
+                image_data,
+                {
+                    "thumbnail": settings.image_thumbnail_size or 240,
+                    "medium": settings.image_medium_size or 720,
+                },
+                settings.image_derivative_quality or 80,
+            )
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+            raise PermanentJobError(f"No se puede procesar la imagen {image_url}: {e}")
+
+        variants = {
+            variant: self.storage.upload(io.BytesIO(data), DERIVATIVES_FOLDER)
+            for variant, data in rendered.items()
+        }
+        for previous_url in self.repository.replace(image_url, variants):
+            self.storage.delete(previous_url)
+
+    @staticmethod
+    def _to_schema(variants: Dict[str, str]) -> ImageDerivativesSchema:
+        """Convierte las variantes guardadas en el esquema de respuesta."""
+        return ImageDerivativesSchema(
+            **{
+                field: variants[variant]
+                for variant, field in VARIANT_FIELDS.items()
+                if variant in variants
+            }
+        )
@@ -0,0 +1,164 @@
+import asyncio
+import base64
+import binascii
+import io
+import logging
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Optional, Tuple
+
+from src.config.settings import settings
+from src.repositories.base_implementation import BaseRepositoryImplementation
+from src.services.image_derivative import ImageDerivativeService
+from src.utils.image_storage import get_image_storage
+
+logger = logging.getLogger(__name__)
+
+
+def decode_base64_image(base64_str: str) -> bytes:
+    """Decodifica una imagen en base64, con o sin el prefijo ``data:``."""
+    if "," in base64_str:
+        base64_str = base64_str.split(",", 1)[1]
+    try:
+        return base64.b64decode(base64_str, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"La imagen no es un base64 válido: {e}")
+
+
+class ImageUploader:
+    """Sube y elimina imágenes en un pool de hilos fuera del request.
+
+    Mientras la subida está en curso el registro guarda una URL provisoria
+    (la imagen de ``image_placeholder_url`` con un identificador único). Al
+    terminar se reemplaza por la URL definitiva sólo si el registro sigue
+    teniendo esa URL provisoria, así una actualización posterior no se pisa.
+    """
+
+    _instance: Optional["ImageUploader"] = None
+
+    def __new__(cls) -> "ImageUploader":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(ImageUploader, cls).__new__(cls)
+            cls._instance._executor = None
+            cls._instance.storage = get_image_storage()
+            cls._instance.derivatives = ImageDerivativeService()
+        return cls._instance
+
+    @staticmethod
+    def placeholder_url() -> str:
+        """URL provisoria única para un registro con una subida pendiente."""
+        separator = "&" if "?" in settings.image_placeholder_url else "?"
+        return (
+            f"{settings.image_placeholder_url}{separator}" f"pending={uuid.uuid4().hex}"
+        )
+
+    @staticmethod
+    def is_placeholder(image: str) -> bool:
+        """Indica si la URL es una URL provisoria de una subida pendiente."""
+        return image.startswith(settings.image_placeholder_url)
+
+    def prepare_upload(
+        self, schema: Any, current_url: Optional[str] = None
+    ) -> Optional[Tuple[str, bytes]]:
+        """Valida la imagen del payload y la reemplaza por una URL provisoria.
+
+        Las URLs devueltas por los endpoints de subida se guardan tal cual; el
+        resto se decodifica como base64 acá, así un payload inválido se rechaza
+        en el request. Si el cliente reenvía una URL provisoria (por ejemplo,
+        una leída antes de que terminara la subida) se conserva la imagen
+        actual. Devuelve la URL provisoria y la imagen a subir, o None si no
+        hay nada que subir.
+        """
+        image = schema.image_url
+        if not image or image == current_url:
+            return None
+        if self.is_placeholder(image):
+            schema.image_url = current_url
+            return None
+        if self.storage.owns(image):
+            return None
+        if image.startswith(("http://", "https://")):
+            raise ValueError("La URL de la imagen no pertenece al almacenamiento.")
+
+        image_data = decode_base64_image(image)
+        schema.image_url = self.placeholder_url()
+        return schema.image_url, image_data
+
+    async def store(self, file: BinaryIO, folder: str) -> str:
+        """Guarda una imagen ya recibida en el pool y devuelve su URL."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), self._store, file, folder
+            )
+        finally:
+            file.close()
+
+    def schedule_upload(
+        self,
+        repository: BaseRepositoryImplementation,
+        id_key: int,
+        placeholder: str,
+        image_data: bytes,
+        folder: str,
+    ) -> Future:
+        """Sube la imagen en segundo plano y reemplaza la URL provisoria del registro."""
+        return self._get_executor().submit(
+            self._upload, repository, id_key, placeholder, image_data, folder
+        )
+
+    def schedule_delete(self, image_url: str) -> Future:
+        """Elimina una imagen en segundo plano."""
+        return self._get_executor().submit(self._delete, image_url)
+
+    def shutdown(self) -> None:
+        """Espera las subidas en curso y detiene el pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _upload(
+        self,
+        repository: BaseRepositoryImplementation,
+        id_key: int,
+        placeholder: str,
+        image_data: bytes,
+        folder: str,
+    ) -> Optional[str]:
+        """Sube la imagen; si falla, quita la URL provisoria del registro."""
+        try:
+            image_url = self._store(io.BytesIO(image_data), folder)
+        except Exception:
+            logger.exception("Error al subir la imagen de %s/%s", folder, id_key)
+            repository.replace_value(id_key, "image_url", placeholder, None)
+            return None
+
+        if not repository.replace_value(id_key, "image_url", placeholder, image_url):
+            # El registro cambió de imagen mientras se subía: esta ya no se usa.
+            self._delete(image_url)
+            return None
+        return image_url
+
+    def _store(self, file: BinaryIO, folder: str) -> str:
+        """Guarda la imagen y encola la generación de sus variantes."""
+        image_url = self.storage.upload(file, folder)
+        self.derivatives.schedule(image_url)
+        return image_url
+
+    def _delete(self, image_url: str) -> None:
+        """Elimina la imagen y sus variantes, registrando el error si falla."""
+        try:
+            self.derivatives.delete(image_url)
+            self.storage.delete(image_url)
+        except Exception:
+            logger.exception("Error al eliminar la imagen %s", image_url)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Crea el pool de hilos la primera vez que se usa."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.image_upload_workers or 4,
+                thread_name_prefix="image-upload",
+            )
+        return self._executor
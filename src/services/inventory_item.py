@@ -1,11 +1,18 @@
+from typing import Any, List
+
 from src.models.inventory_item import InventoryItemModel
+from src.models.inventory_movement import InventoryMovementType
 from src.repositories.inventory_item import InventoryItemRepository
 from src.schemas.inventory_item import (
     CreateInventoryItemSchema,
     ResponseInventoryItemSchema,
 )
+from src.schemas.inventory_movement import CreateInventoryMovementSchema
+from src.schemas.pagination import PaginatedResponseSchema
 from src.services.base_implementation import BaseServiceImplementation
-from src.utils.cloudinary import upload_base64_image_to_cloudinary
+from src.services.image_derivative import ImageDerivativeService
+from src.services.image_uploader import ImageUploader
+from src.services.inventory_movement import InventoryMovementService
 
 
 class InventoryItemService(BaseServiceImplementation):
@@ -18,24 +25,106 @@ class InventoryItemService(BaseServiceImplementation):
             create_schema=CreateInventoryItemSchema,
             response_schema=ResponseInventoryItemSchema,
         )
+        self.inventory_movement_service = InventoryMovementService()
+        self.image_uploader = ImageUploader()
+        self.image_derivative_service = ImageDerivativeService()
 
-    def save(self, schema: CreateInventoryItemSchema) -> ResponseInventoryItemSchema:
-        """Guarda un nuevo artículo de inventario, subiendo la imagen si es necesario."""
-        if schema.image_url:
-            schema.image_url = upload_base64_image_to_cloudinary(
-                schema.image_url, "inventory_items"
+    def get_one(self, id_key: int) -> ResponseInventoryItemSchema:
+        """Obtiene un artículo con su stock real."""
+        return self._with_live_stock([super().get_one(id_key)])[0]
+
+    def get_all(self, offset: int = 0, limit: int = 10) -> PaginatedResponseSchema:
+        """Obtiene todos los artículos con su stock real."""
+        result = super().get_all(offset, limit)
+        result.items = self._with_live_stock(result.items)
+        return result
+
+    def search_by_name(
+        self, search_term: str, offset: int = 0, limit: int = 10
+    ) -> PaginatedResponseSchema:
+        """Busca artículos por nombre, con su stock real."""
+        result = super().search_by_name(search_term, offset, limit)
+        result.items = self._with_live_stock(result.items)
+        return result
+
+    def get_all_by(
+        self, field_name: str, field_value: Any, offset: int, limit: int
+    ) -> PaginatedResponseSchema:
+        """Obtiene los artículos por un campo, con su stock real y las variantes de sus imágenes."""
+        result = super().get_all_by(field_name, field_value, offset, limit)
+        derivatives = self.image_derivative_service.get_many(
+            item.image_url for item in result.items
+        )
+        result.items = [
+            item.model_copy(
+                update={"image_derivatives": derivatives.get(item.image_url)}
             )
+            for item in self._with_live_stock(result.items)
+        ]
+        return result
+
+    def save(self, schema: CreateInventoryItemSchema) -> ResponseInventoryItemSchema:
+        """Guarda un nuevo artículo de inventario, subiendo la imagen en segundo plano."""
+        pending_upload = self.image_uploader.prepare_upload(schema)
+
+        inventory_item = super().save(schema)
 
-        return super().save(schema)
+        if pending_upload:
+            self.image_uploader.schedule_upload(
+                self.repository,
+                inventory_item.id_key,
+                *pending_upload,
+                "inventory_items",
+            )
+        return inventory_item
 
     def update(
         self, id_key: int, schema: CreateInventoryItemSchema
     ) -> ResponseInventoryItemSchema:
-        """Actualiza un artículo de inventario existente, subiendo la imagen si es necesario."""
+        """Actualiza un artículo de inventario, subiendo la imagen en segundo plano.
+
+        Los cambios de stock se registran como ajuste manual en el libro de
+        movimientos, medidos contra el stock real que devuelven las lecturas.
+        """
         inventory_item = self.repository.find(id_key)
-        if schema.image_url and schema.image_url != inventory_item.image_url:
-            schema.image_url = upload_base64_image_to_cloudinary(
-                schema.image_url, "inventory_items"
+        pending_upload = self.image_uploader.prepare_upload(
+            schema, inventory_item.image_url
+        )
+
+        _, live_stock = self.inventory_movement_service.get_live_stock([id_key])[id_key]
+        if schema.current_stock != live_stock:
+            self.inventory_movement_service.record(
+                [
+                    CreateInventoryMovementSchema(
+                        inventory_item_id=id_key,
+                        quantity=schema.current_stock - live_stock,
+                        type=InventoryMovementType.ajuste_manual,
+                    )
+                ]
             )
 
-        return super().update(id_key, schema)
+        changes = schema.model_dump(exclude_unset=True)
+        changes.pop("current_stock", None)
+        updated_item = self.repository.update(id_key, changes)
+
+        if pending_upload:
+            self.image_uploader.schedule_upload(
+                self.repository, id_key, *pending_upload, "inventory_items"
+            )
+        return self._with_live_stock([updated_item])[0]
+
+    def _with_live_stock(
+        self, inventory_items: List[ResponseInventoryItemSchema]
+    ) -> List[ResponseInventoryItemSchema]:
+        """Reemplaza el saldo compactado por el stock real de cada artículo.
+
+        El saldo de la tabla no incluye los movimientos sin compactar; el
+        cliente tiene que ver (y reenviar al editar) el stock real.
+        """
+        live_stock = self.inventory_movement_service.get_live_stock(
+            [item.id_key for item in inventory_items]
+        )
+        return [
+            item.model_copy(update={"current_stock": live_stock[item.id_key][1]})
+            for item in inventory_items
+        ]
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.models.inventory_movement import InventoryMovementModel
+from src.repositories.inventory_movement import InventoryMovementRepository
+from src.schemas.inventory_movement import (
+    CreateInventoryMovementSchema,
+    ResponseInventoryMovementSchema,
+)
+from src.schemas.pagination import PaginatedResponseSchema
+from src.services.base_implementation import BaseServiceImplementation
+
+
+class InventoryMovementService(
+    BaseServiceImplementation[InventoryMovementModel, ResponseInventoryMovementSchema]
+):
+    """Servicio para registrar y consultar los movimientos de inventario."""
+
+    def __init__(self):
+        super().__init__(
+            repository=InventoryMovementRepository(),
+            model=InventoryMovementModel,
+            create_schema=CreateInventoryMovementSchema,
+            response_schema=ResponseInventoryMovementSchema,
+        )
+
+    def record(self, movements: List[CreateInventoryMovementSchema]) -> None:
+        """Registra un lote de movimientos de inventario."""
+        self.repository.save_batch(movements)
+
+    def get_live_stock(
+        self, inventory_item_ids: List[int]
+    ) -> Dict[int, Tuple[str, float]]:
+        """Obtiene el stock real de los items, incluyendo movimientos sin compactar."""
+        return self.repository.get_live_stock(inventory_item_ids)
+
+    def get_stock_at(self, inventory_item_id: int, date: datetime) -> float:
+        """Obtiene el stock de un item en una fecha determinada."""
+        return self.repository.get_stock_at(inventory_item_id, date)
+
+    def get_by_inventory_item(
+        self, inventory_item_id: int, offset: int, limit: int
+    ) -> PaginatedResponseSchema:
+        """Obtiene los movimientos de un item con paginación."""
+        total = self.repository.count_all_by("inventory_item_id", inventory_item_id)
+        items = self.repository.find_by_inventory_item(inventory_item_id, offset, limit)
+        return PaginatedResponseSchema(
+            total=total, offset=offset, limit=limit, items=items
+        )
+
+    def compact(self) -> int:
+        """Compacta los movimientos pendientes en el saldo de cada item."""
+        return self.repository.compact()
+
+    async def run_compaction_loop(self, interval_seconds: int) -> None:
+        """Compacta periódicamente los movimientos pendientes."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_threadpool(self.compact)
+            except Exception as e:
+                print(f"Error al compactar los movimientos de inventario: {e}")
@@ -1,13 +1,17 @@
 from datetime import datetime
 
+from src.models.inventory_movement import InventoryMovementType
 from src.models.inventory_purchase import InventoryPurchaseModel
 from src.repositories.inventory_item import InventoryItemRepository
 from src.repositories.inventory_purchase import InventoryPurchaseRepository
+from src.schemas.inventory_movement import CreateInventoryMovementSchema
 from src.schemas.inventory_purchase import (
     CreateInventoryPurchaseSchema,
     ResponseInventoryPurchaseSchema,
 )
 from src.services.base_implementation import BaseServiceImplementation
+from src.services.inventory_movement import InventoryMovementService
+from src.services.sales_rollup import SalesRollupService
 
 
 class InventoryPurchaseService(BaseServiceImplementation):
@@ -21,6 +25,8 @@ class InventoryPurchaseService(BaseServiceImplementation):
             response_schema=ResponseInventoryPurchaseSchema,
         )
         self.inventory_item_repository = InventoryItemRepository()
+        self.inventory_movement_service = InventoryMovementService()
+        self.sales_rollup_service = SalesRollupService()
 
     def add_stock(
         self,
@@ -33,7 +39,10 @@ class InventoryPurchaseService(BaseServiceImplementation):
         if purchase_data.purchase_date is None:
             purchase_data.purchase_date = datetime.now()
 
-        new_stock = inventory_item.current_stock + purchase_data.quantity
+        _, current_stock = self.inventory_movement_service.get_live_stock(
+            [inventory_item_id]
+        )[inventory_item_id]
+        new_stock = current_stock + purchase_data.quantity
 
         if new_stock < 0:
             raise ValueError("La cantidad de stock no puede ser negativa.")
@@ -45,8 +54,7 @@ class InventoryPurchaseService(BaseServiceImplementation):
             new_inventory_item_cost = purchase_data.unit_cost
 
         self.inventory_item_repository.update(
-            inventory_item_id,
-            {"current_stock": new_stock, "purchase_cost": new_inventory_item_cost},
+            inventory_item_id, {"purchase_cost": new_inventory_item_cost}
         )
         dict_purchase_data = purchase_data.model_dump(exclude_unset=True)
         dict_purchase_data["inventory_item_id"] = inventory_item_id
@@ -55,4 +63,19 @@ class InventoryPurchaseService(BaseServiceImplementation):
         )
         model_purchase_data = self.model(**dict_purchase_data)
 
-        return self.repository.save(model_purchase_data)
+        purchase = self.repository.save(model_purchase_data)
+        self.inventory_movement_service.record(
+            [
+                CreateInventoryMovementSchema(
+                    inventory_item_id=inventory_item_id,
+                    quantity=purchase_data.quantity,
+                    type=InventoryMovementType.compra,
+                    inventory_purchase_id=purchase.id_key,
+                    date=purchase_data.purchase_date,
+                    notes=purchase_data.notes,
+                )
+            ]
+        )
+        self.sales_rollup_service.on_purchase_recorded(purchase)
+
+        return purchase
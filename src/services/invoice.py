@@ -1,8 +1,14 @@
-import io
+import asyncio
+import hashlib
+import json
 import uuid
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
 from src.models.invoice import InvoiceModel, InvoiceType
 from src.repositories.inventory_item import InventoryItemRepository
 from src.repositories.invoice import InvoiceRepository
@@ -10,11 +16,21 @@ from src.repositories.manufactured_item import ManufacturedItemRepository
 from src.repositories.order import OrderRepository
 from src.schemas.invoice import CreateInvoiceSchema, ResponseInvoiceSchema
 from src.schemas.invoice_detail import CreateInvoiceDetailSchema
+from src.schemas.job import CreateJobSchema
 from src.schemas.order import ResponseOrderSchema
 from src.schemas.pagination import PaginatedResponseSchema
 from src.services.base_implementation import BaseServiceImplementation
+from src.services.job_queue import JobQueue, PermanentJobError
+from src.services.pdf_renderer import PdfRenderer
+from src.services.sales_rollup import SalesRollupService
+from src.utils.document_store import get_document_store
 from src.utils.email import send_credit_note_email, send_invoice_email
-from src.utils.reportlab import generate_pdf_report
+from src.utils.smtp import PermanentEmailError
+from src.utils.zip_stream import stream_zip
+
+INVOICE_EMAIL_JOB = "invoice_email"
+CREDIT_NOTE_EMAIL_JOB = "credit_note_email"
+PDF_RENDERER_VERSION = 1
 
 
 class InvoiceService(BaseServiceImplementation[InvoiceModel, ResponseInvoiceSchema]):
@@ -30,6 +46,12 @@ class InvoiceService(BaseServiceImplementation[InvoiceModel, ResponseInvoiceSche
         self.order_repository = OrderRepository()
         self.inventory_item_repository = InventoryItemRepository()
         self.manufactured_item_repository = ManufacturedItemRepository()
+        self.document_store = get_document_store()
+        self.pdf_renderer = PdfRenderer()
+        self.job_queue = JobQueue()
+        self.sales_rollup_service = SalesRollupService()
+        self.job_queue.register(INVOICE_EMAIL_JOB, self._send_invoice_email)
+        self.job_queue.register(CREDIT_NOTE_EMAIL_JOB, self._send_credit_note_email)
 
     async def generate_invoice(self, order_id: int) -> ResponseInvoiceSchema:
         """Genera una factura para un pedido dado."""
@@ -71,15 +93,20 @@ class InvoiceService(BaseServiceImplementation[InvoiceModel, ResponseInvoiceSche
             )
             invoice_details.append(invoice_detail)
 
+        # El envío por correo se encola en la misma transacción que la factura:
+        # si algo falla después de guardarla, el correo igual se envía.
+        email_job = CreateJobSchema(
+            type=INVOICE_EMAIL_JOB,
+            payload={},
+            max_attempts=settings.job_max_attempts or 5,
+        )
         invoice_model = self.to_model(invoice_schema)
         saved_invoice = self.repository.save_with_details(
-            invoice_model, invoice_details
+            invoice_model, invoice_details, email_job
         )
 
-        try:
-            await self._send_invoice_email(saved_invoice)
-        except Exception as e:
-            print(f"Error al enviar el correo de la factura: {str(e)}")
+        self.job_queue.notify()
+        self.sales_rollup_service.on_invoice_created(saved_invoice)
 
         return saved_invoice
 
@@ -95,43 +122,130 @@ class InvoiceService(BaseServiceImplementation[InvoiceModel, ResponseInvoiceSche
                 "type": InvoiceType.nota_credito,
             },
         )
+        self.sales_rollup_service.on_credit_note(invoice)
 
-        try:
-            await self._send_credit_note_email(updated_invoice)
-        except Exception as e:
-            print(f"Error al enviar el correo de la nota de crédito: {str(e)}")
+        self.job_queue.enqueue(
+            CREDIT_NOTE_EMAIL_JOB, {"invoice_id": updated_invoice.id_key}
+        )
 
         return updated_invoice
 
-    async def _send_invoice_email(self, invoice: ResponseInvoiceSchema) -> None:
-        """Envía un correo electrónico con la factura en formato PDF."""
-        invoice_data = self._proces_invoice_details(invoice)
-        buffer = io.BytesIO()
-        generate_pdf_report(invoice_data, buffer, "Factura")
-        pdf_data = buffer.getvalue()
-        buffer.close()
-
-        await send_invoice_email(
-            customer_email=invoice.order.user.email,
-            customer_name=invoice.order.user.full_name,
-            invoice_number=invoice.number,
-            pdf_data=pdf_data,
-        )
+    async def _send_invoice_email(self, payload: Dict[str, Any]) -> None:
+        """Trabajo en segundo plano: envía la factura en formato PDF por correo."""
+        invoice = self.repository.find(payload["invoice_id"])
+        pdf_data = await self.get_pdf(invoice)
+
+        try:
+            await send_invoice_email(
+                customer_email=invoice.order.user.email,
+                customer_name=invoice.order.user.full_name,
+                invoice_number=invoice.number,
+                pdf_data=pdf_data,
+            )
+        except PermanentEmailError as e:
+            raise PermanentJobError(str(e)) from e
+
+    async def _send_credit_note_email(self, payload: Dict[str, Any]) -> None:
+        """Trabajo en segundo plano: envía la nota de crédito en formato PDF por correo."""
+        invoice = self.repository.find(payload["invoice_id"])
+        pdf_data = await self.get_pdf(invoice)
+
+        try:
+            await send_credit_note_email(
+                customer_email=invoice.order.user.email,
+                customer_name=invoice.order.user.full_name,
+                credit_note_number=invoice.number,
+                pdf_data=pdf_data,
+            )
+        except PermanentEmailError as e:
+            raise PermanentJobError(str(e)) from e
 
-    async def _send_credit_note_email(self, invoice: ResponseInvoiceSchema) -> None:
-        """Envía un correo electrónico con la nota de crédito en formato PDF."""
+    async def get_document_key(
+        self, invoice: ResponseInvoiceSchema, wait: bool = True
+    ) -> str:
+        """Devuelve la clave del PDF guardado, generándolo sólo si no existe.
+
+        La clave incluye un hash del contenido, así una factura convertida en
+        nota de crédito genera un documento nuevo en lugar de servir el anterior.
+        Con ``wait=False`` se lanza RenderQueueFullError si la cola está llena.
+        """
+        report_type = self.get_report_type(invoice)
         invoice_data = self._proces_invoice_details(invoice)
-        buffer = io.BytesIO()
-        generate_pdf_report(invoice_data, buffer, "Nota de Crédito")
-        pdf_data = buffer.getvalue()
-        buffer.close()
-
-        await send_credit_note_email(
-            customer_email=invoice.order.user.email,
-            customer_name=invoice.order.user.full_name,
-            credit_note_number=invoice.number,
-            pdf_data=pdf_data,
+        content = json.dumps(
+            {
+                "renderer": PDF_RENDERER_VERSION,
+                "report_type": report_type,
+                "invoice": invoice_data,
+            },
+            sort_keys=True,
+            default=str,
         )
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        key = f"invoices/{invoice.id_key}/{content_hash}.pdf"
+
+        if not await run_in_threadpool(self.document_store.exists, key):
+            pdf_data = await self.pdf_renderer.render(invoice_data, report_type, wait)
+            await run_in_threadpool(self.document_store.put, key, pdf_data)
+        return key
+
+    async def get_pdf(self, invoice: ResponseInvoiceSchema) -> bytes:
+        """Obtiene el PDF de una factura o nota de crédito."""
+        key = await self.get_document_key(invoice)
+        return await run_in_threadpool(self.document_store.get, key)
+
+    def get_export_ids(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        invoice_ids: Optional[List[int]],
+    ) -> List[int]:
+        """Obtiene los IDs de las facturas a exportar por rango de fechas o por ID."""
+        return self.repository.find_ids_for_export(start_date, end_date, invoice_ids)
+
+    def stream_documents_zip(self, invoice_ids: List[int]) -> AsyncIterator[bytes]:
+        """Genera un ZIP con los PDFs de las facturas y lo devuelve por partes."""
+        return stream_zip(self._iter_documents(invoice_ids))
+
+    async def _iter_documents(
+        self, invoice_ids: List[int]
+    ) -> AsyncIterator[Tuple[str, bytes]]:
+        """Devuelve los PDFs en orden, generando varios en paralelo.
+
+        Las facturas se cargan por lotes y se mantiene una ventana acotada de
+        PDFs en generación, así la memoria no crece con el tamaño del rango.
+        """
+        window = settings.invoice_export_window or 8
+        pending: Deque[Tuple[str, asyncio.Task]] = deque()
+
+        try:
+            for start in range(0, len(invoice_ids), window):
+                invoices = await run_in_threadpool(
+                    self.repository.find_many, invoice_ids[start : start + window]
+                )
+                for invoice in invoices:
+                    pending.append(
+                        (
+                            f"{invoice.number}.pdf",
+                            asyncio.create_task(self.get_pdf(invoice)),
+                        )
+                    )
+                    if len(pending) >= window:
+                        filename, task = pending.popleft()
+                        yield filename, await task
+
+            while pending:
+                filename, task = pending.popleft()
+                yield filename, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    @staticmethod
+    def get_report_type(invoice: ResponseInvoiceSchema) -> str:
+        """Título del documento según el tipo de comprobante."""
+        if invoice.type == InvoiceType.factura.value:
+            return "Factura"
+        return "Nota de Crédito"
 
     @staticmethod
     def _proces_invoice_details(invoice: ResponseInvoiceSchema) -> Dict[str, Any]:
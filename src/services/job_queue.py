@@ -0,0 +1,137 @@
+import asyncio
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.repositories.job import JobRepository
+from src.schemas.job import CreateJobSchema, ResponseJobSchema
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """Error de un trabajo que no tiene sentido reintentar."""
+
+
+class JobQueue:
+    """Cola de trabajos persistida en la base de datos con workers en el proceso.
+
+    Los trabajos se guardan en la tabla ``job`` y sobreviven a reinicios. Cada
+    worker toma un trabajo por vez y, si falla, lo reprograma con espera
+    exponencial hasta agotar los intentos.
+    """
+
+    _instance: Optional["JobQueue"] = None
+
+    def __new__(cls) -> "JobQueue":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(JobQueue, cls).__new__(cls)
+            cls._instance._handlers = {}
+            cls._instance._wake_up = None
+            cls._instance._loop = None
+            cls._instance.repository = JobRepository()
+        return cls._instance
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        """Registra la función que procesa un tipo de trabajo."""
+        self._handlers[job_type] = handler
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        run_at: Optional[datetime] = None,
+    ) -> ResponseJobSchema:
+        """Agrega un trabajo a la cola."""
+        job = self.repository.save(
+            self.repository.model(
+                **CreateJobSchema(
+                    type=job_type,
+                    payload=payload,
+                    max_attempts=settings.job_max_attempts or 5,
+                    run_at=run_at,
+                ).model_dump(exclude_none=True)
+            )
+        )
+        self.notify()
+        return job
+
+    def notify(self) -> None:
+        """Despierta a los workers cuando se agregan trabajos por fuera de ``enqueue``.
+
+        Puede llamarse desde otros hilos (por ejemplo, el pool de imágenes).
+        """
+        if self._wake_up is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake_up.set)
+        except RuntimeError:
+            pass
+
+    async def run_worker(self, poll_interval_seconds: float) -> None:
+        """Procesa trabajos de la cola hasta que se cancela la tarea."""
+        if self._wake_up is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake_up = asyncio.Event()
+
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                print(f"Error al procesar la cola de trabajos: {e}")
+                processed = False
+
+            if processed:
+                continue
+
+            self._wake_up.clear()
+            try:
+                await asyncio.wait_for(self._wake_up.wait(), poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> bool:
+        """Toma y procesa un trabajo. Devuelve False si la cola estaba vacía."""
+        now = datetime.now()
+        jobs = await run_in_threadpool(
+            self.repository.claim,
+            now,
+            now - timedelta(seconds=settings.job_lock_timeout_seconds or 300),
+        )
+        if not jobs:
+            return False
+
+        await self._process(jobs[0])
+        return True
+
+    async def _process(self, job: ResponseJobSchema) -> None:
+        """Ejecuta un trabajo y registra su resultado."""
+        handler = self._handlers.get(job.type)
+
+        try:
+            if handler is None:
+                raise LookupError(f"No hay un handler para el trabajo {job.type}.")
+            await handler(job.payload)
+        except Exception as e:
+            retry_at = None
+            if job.attempts < job.max_attempts and not isinstance(e, PermanentJobError):
+                retry_at = datetime.now() + self._backoff(job.attempts)
+            await run_in_threadpool(
+                self.repository.mark_failed,
+                job.id_key,
+                "".join(traceback.format_exception_only(type(e), e)).strip(),
+                retry_at,
+            )
+            return
+
+        await run_in_threadpool(self.repository.mark_completed, job.id_key)
+
+    @staticmethod
+    def _backoff(attempts: int) -> timedelta:
+        """Espera exponencial antes del próximo intento."""
+        base_seconds = settings.job_retry_base_seconds or 30
+        return timedelta(seconds=base_seconds * 2 ** (attempts - 1))
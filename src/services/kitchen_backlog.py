@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Optional
+
+from src.config.settings import settings
+from src.models.user import UserRole
+from src.repositories.user import UserRepository
+from src.schemas.user import ResponseUserSchema
+
+
+class KitchenBacklog:
+    """Cantidad en memoria de cocineros activos, para simular la cola de cocina.
+
+    Se actualiza de forma incremental en cada cambio de rol o estado de un
+    usuario. Se vuelve a sincronizar con la base de datos cada
+    ``kitchen_backlog_refresh_seconds`` para corregir la deriva entre procesos.
+    Los minutos pendientes en cocina los calcula ``KitchenScheduler``.
+    """
+
+    _instance: Optional["KitchenBacklog"] = None
+
+    def __new__(cls) -> "KitchenBacklog":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(KitchenBacklog, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._cook_count = 0
+            cls._instance._loaded_at = None
+            cls._instance.user_repository = UserRepository()
+        return cls._instance
+
+    def cook_count(self) -> int:
+        """Devuelve la cantidad de cocineros activos."""
+        if self._is_stale():
+            self.refresh()
+
+        with self._lock:
+            return self._cook_count
+
+    def refresh(self) -> None:
+        """Vuelve a contar los cocineros activos en la base de datos."""
+        cook_count = self.user_repository.count_all_cookies()
+
+        with self._lock:
+            self._cook_count = cook_count or 0
+            self._loaded_at = time.monotonic()
+
+    def on_user_change(
+        self,
+        previous_user: Optional[ResponseUserSchema],
+        updated_user: Optional[ResponseUserSchema],
+    ) -> None:
+        """Ajusta la cantidad de cocineros cuando cambia el rol o el estado de un usuario."""
+        delta = self._is_active_cook(updated_user) - self._is_active_cook(previous_user)
+        if not delta:
+            return
+
+        with self._lock:
+            if self._loaded_at is not None:
+                self._cook_count = max(self._cook_count + delta, 0)
+
+    def _is_stale(self) -> bool:
+        """Indica si el agregado nunca se cargó o superó el tiempo de refresco."""
+        if self._loaded_at is None:
+            return True
+        refresh_seconds = settings.kitchen_backlog_refresh_seconds
+        return bool(refresh_seconds) and (
+            time.monotonic() - self._loaded_at > refresh_seconds
+        )
+
+    @staticmethod
+    def _is_active_cook(user: Optional[ResponseUserSchema]) -> int:
+        """Devuelve 1 si el usuario es un cocinero activo, 0 en caso contrario."""
+        return int(
+            user is not None
+            and bool(user.active)
+            and user.role == UserRole.cocinero.value
+        )
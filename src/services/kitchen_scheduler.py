@@ -0,0 +1,305 @@
+import heapq
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config.settings import settings
+from src.models.order import OrderStatus
+from src.repositories.order import OrderRepository
+from src.schemas.kitchen_schedule import (
+    KitchenScheduleEntrySchema,
+    KitchenScheduleSchema,
+)
+from src.schemas.order import ResponseOrderSchema
+from src.services.kitchen_backlog import KitchenBacklog
+
+
+@dataclass
+class QueuedOrder:
+    """Pedido en cocina con los minutos de preparación de cada línea."""
+
+    order_id: int
+    prep_minutes: List[float]
+    delay_minutes: float = 0.0
+    started_at: Optional[float] = None
+    start: float = 0.0
+    finish: float = 0.0
+    tasks: List[float] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.tasks = sorted(
+            (minutes * 60 for minutes in self.prep_minutes if minutes > 0),
+            reverse=True,
+        )
+
+
+class KitchenScheduler:
+    """Simulador de la cola de cocina con los cocineros como trabajadores paralelos.
+
+    Los pedidos se atienden en orden de llegada y cada línea de preparación se
+    asigna al cocinero que se libera primero (cola de prioridad). Se guarda el
+    estado de los cocineros antes de cada pedido, de modo que un alta, baja o
+    retraso sólo vuelve a simular desde la posición afectada en adelante. Los
+    pedidos que ya empezaron conservan su hora de inicio.
+
+    La cola se vuelve a cargar desde la base de datos cada
+    ``kitchen_backlog_refresh_seconds`` para incorporar los cambios hechos por
+    otros procesos; los retrasos se leen de la columna ``delay_minutes`` de
+    cada pedido.
+    """
+
+    _instance: Optional["KitchenScheduler"] = None
+
+    def __new__(cls) -> "KitchenScheduler":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(KitchenScheduler, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._orders = []
+            cls._instance._checkpoints = []
+            cls._instance._dirty_from = 0
+            cls._instance._cook_count = 0
+            cls._instance._loaded_at = None
+            cls._instance.order_repository = OrderRepository()
+            cls._instance.kitchen_backlog = KitchenBacklog()
+        return cls._instance
+
+    def get_schedule(self) -> KitchenScheduleSchema:
+        """Devuelve el horario proyectado de inicio y fin de cada pedido en cocina."""
+        now = time.time()
+        cook_count = self.kitchen_backlog.cook_count()
+
+        with self._lock:
+            self._ensure_loaded()
+            self._simulate(now, cook_count)
+            backlog_minutes = sum(
+                sum(order.prep_minutes) + order.delay_minutes for order in self._orders
+            )
+            entries = [
+                KitchenScheduleEntrySchema(
+                    order_id=order.order_id,
+                    position=position,
+                    prep_minutes=sum(order.prep_minutes),
+                    delay_minutes=order.delay_minutes,
+                    projected_start=datetime.fromtimestamp(order.start),
+                    projected_finish=datetime.fromtimestamp(order.finish),
+                )
+                for position, order in enumerate(self._orders)
+            ]
+
+        return KitchenScheduleSchema(
+            generated_at=datetime.fromtimestamp(now),
+            cook_count=max(cook_count, 1),
+            backlog_minutes=backlog_minutes,
+            orders=entries,
+        )
+
+    def project_finish_minutes(self, prep_minutes: List[float]) -> float:
+        """Minutos hasta terminar un pedido hipotético que entra ahora a la cola."""
+        now = time.time()
+        cook_count = self.kitchen_backlog.cook_count()
+
+        with self._lock:
+            self._ensure_loaded()
+            self._simulate(now, cook_count)
+            cooks = list(self._checkpoints[-1])
+
+        candidate = QueuedOrder(order_id=0, prep_minutes=prep_minutes)
+        self._simulate_order(cooks, candidate, now)
+        return (candidate.finish - now) / 60
+
+    def on_status_change(
+        self,
+        previous_status: Optional[str],
+        order: ResponseOrderSchema,
+    ) -> None:
+        """Agrega o quita un pedido de la cola cuando entra o sale de cocina."""
+        in_kitchen = OrderStatus.en_cocina.value
+        if previous_status == order.status:
+            return
+
+        if order.status == in_kitchen:
+            self.enqueue(order)
+        elif previous_status == in_kitchen:
+            self.remove(order.id_key)
+
+    def enqueue(self, order: ResponseOrderSchema) -> None:
+        """Agrega un pedido al final de la cola de cocina."""
+        queued_order = QueuedOrder(
+            order_id=order.id_key,
+            prep_minutes=[
+                detail.manufactured_item.preparation_time * detail.quantity
+                for detail in order.details
+            ],
+            delay_minutes=order.delay_minutes,
+        )
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._remove(order.id_key)
+            self._orders.append(queued_order)
+            self._mark_dirty(len(self._orders) - 1)
+
+    def remove(self, order_id: int) -> None:
+        """Quita un pedido de la cola de cocina."""
+        with self._lock:
+            self._remove(order_id)
+
+    def add_delay(self, order_id: int, delay_minutes: float) -> None:
+        """Registra en la cola un retraso que ya se guardó en el pedido."""
+        with self._lock:
+            position = self._position(order_id)
+            if position is None:
+                return
+            self._orders[position].delay_minutes += delay_minutes
+            self._mark_dirty(position)
+
+    def reload(self) -> None:
+        """Reconstruye la cola a partir de los pedidos en cocina de la base de datos."""
+        with self._lock:
+            self._loaded_at = None
+            self._ensure_loaded()
+
+    def _ensure_loaded(self) -> None:
+        """Carga la cola desde la base de datos si nunca se cargó o está vencida.
+
+        Los pedidos que ya estaban en la cola conservan su hora de inicio.
+        """
+        if not self._is_stale():
+            return
+
+        prep_minutes: Dict[int, List[float]] = {}
+        delays: Dict[int, float] = {}
+        for (
+            order_id,
+            delay_minutes,
+            preparation_time,
+            quantity,
+        ) in self.order_repository.get_kitchen_queue_rows():
+            minutes = prep_minutes.setdefault(order_id, [])
+            delays[order_id] = delay_minutes or 0
+            if preparation_time is not None:
+                minutes.append(preparation_time * quantity)
+
+        previous_orders = {order.order_id: order for order in self._orders}
+        self._orders = []
+        for order_id, minutes in prep_minutes.items():
+            queued_order = QueuedOrder(
+                order_id=order_id,
+                prep_minutes=minutes,
+                delay_minutes=delays[order_id],
+            )
+            previous_order = previous_orders.get(order_id)
+            if previous_order is not None:
+                queued_order.started_at = previous_order.started_at
+            self._orders.append(queued_order)
+        self._checkpoints = []
+        self._dirty_from = 0
+        self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        """Indica si la cola nunca se cargó o superó el tiempo de refresco."""
+        if self._loaded_at is None:
+            return True
+        refresh_seconds = settings.kitchen_backlog_refresh_seconds
+        return bool(refresh_seconds) and (
+            time.monotonic() - self._loaded_at > refresh_seconds
+        )
+
+    def _position(self, order_id: int) -> Optional[int]:
+        """Obtiene la posición de un pedido en la cola."""
+        for position, order in enumerate(self._orders):
+            if order.order_id == order_id:
+                return position
+        return None
+
+    def _remove(self, order_id: int) -> None:
+        """Quita un pedido de la cola. Debe llamarse con el lock tomado.
+
+        El estado de los cocineros antes del pedido sigue siendo válido, así que
+        la simulación se retoma desde ese punto.
+        """
+        position = self._position(order_id)
+        if position is None:
+            return
+        del self._orders[position]
+        del self._checkpoints[position + 1 :]
+        self._mark_dirty(position)
+
+    def _mark_dirty(self, position: int) -> None:
+        """Marca la simulación como desactualizada desde una posición."""
+        self._dirty_from = min(self._dirty_from, position)
+
+    def _simulate(self, now: float, cook_count: int) -> None:
+        """Vuelve a simular la cola desde la primera posición desactualizada.
+
+        ``_checkpoints[i]`` guarda el momento en que se libera cada cocinero
+        antes de atender el pedido ``i``; el último elemento es el estado final.
+        """
+        cook_count = max(cook_count, 1)
+        if cook_count != self._cook_count:
+            self._cook_count = cook_count
+            self._checkpoints = []
+            self._dirty_from = 0
+
+        if (
+            self._dirty_from >= len(self._orders)
+            and len(self._checkpoints) == len(self._orders) + 1
+        ):
+            return
+
+        # Los pedidos cuyo inicio proyectado ya pasó están en preparación.
+        for order in self._orders:
+            if order.started_at is None and order.tasks and 0 < order.start <= now:
+                order.started_at = order.start
+
+        start_position = min(self._dirty_from, len(self._checkpoints) - 1)
+        if start_position < 0:
+            # Sin estado previo: los cocineros están libres desde que empezó el
+            # primer pedido en curso, o desde ahora si no hay ninguno.
+            start_position = 0
+            started = [
+                order.started_at
+                for order in self._orders
+                if order.started_at is not None
+            ]
+            self._checkpoints = [[min(started + [now])] * cook_count]
+        else:
+            del self._checkpoints[start_position + 1 :]
+
+        cooks = list(self._checkpoints[start_position])
+        for order in self._orders[start_position:]:
+            self._simulate_order(cooks, order, now)
+            self._checkpoints.append(list(cooks))
+
+        self._dirty_from = len(self._orders)
+
+    @staticmethod
+    def _simulate_order(cooks: List[float], order: QueuedOrder, now: float) -> None:
+        """Asigna cada línea del pedido al cocinero que se libera primero.
+
+        Las líneas más largas se asignan primero para acortar el tiempo total
+        del pedido. El retraso se suma al cocinero que termina último. Un pedido
+        que ya empezó conserva su hora de inicio en lugar de arrancar ahora.
+        """
+        earliest = order.started_at if order.started_at is not None else now
+        start = finish = max(cooks[0], earliest)
+        for index, seconds in enumerate(order.tasks):
+            task_start = max(cooks[0], earliest)
+            task_finish = task_start + seconds
+            heapq.heapreplace(cooks, task_finish)
+            if index == 0:
+                start = task_start
+            finish = max(finish, task_finish)
+
+        if order.delay_minutes:
+            delayed_finish = finish + order.delay_minutes * 60
+            if order.tasks:
+                cooks[cooks.index(finish)] = delayed_finish
+                heapq.heapify(cooks)
+            finish = delayed_finish
+
+        order.start = start
+        order.finish = finish
@@ -1,3 +1,5 @@
+from typing import Dict, Iterable
+
 from src.models.manufactured_item import ManufacturedItemModel
 from src.repositories.inventory_item import InventoryItemRepository
 from src.repositories.manufactured_item import ManufacturedItemRepository
@@ -9,10 +11,9 @@ from src.schemas.manufactured_item import (
 )
 from src.schemas.pagination import PaginatedResponseSchema
 from src.services.base_implementation import BaseServiceImplementation
-from src.utils.cloudinary import (
-    delete_image_from_cloudinary,
-    upload_base64_image_to_cloudinary,
-)
+from src.services.image_derivative import ImageDerivativeService
+from src.services.image_uploader import ImageUploader
+from src.services.inventory_movement import InventoryMovementService
 
 
 class ManufacturedItemService(BaseServiceImplementation):
@@ -27,24 +28,37 @@ class ManufacturedItemService(BaseServiceImplementation):
         )
         self.manufactured_item_detail_repository = ManufacturedItemDetailRepository()
         self.inventory_item_repository = InventoryItemRepository()
+        self.image_uploader = ImageUploader()
+        self.image_derivative_service = ImageDerivativeService()
+        self.inventory_movement_service = InventoryMovementService()
 
     def get_one(self, id_key: int) -> ResponseManufacturedItemSchema:
         """Obtiene un item manufacturado por su ID."""
         manufactured_item = super().get_one(id_key)
-        is_available = self._check_item_availability(manufactured_item)
+        is_available = self._check_item_availability(
+            manufactured_item, self.get_live_stock([manufactured_item])
+        )
         item_dict = manufactured_item.model_dump()
         item_dict["is_available"] = is_available
+        item_dict["image_derivatives"] = self.image_derivative_service.get_many(
+            [manufactured_item.image_url]
+        ).get(manufactured_item.image_url)
         return ResponseManufacturedItemWithAvailabilitySchema(**item_dict)
 
     def get_all(self, offset: int = 0, limit: int = 10) -> PaginatedResponseSchema:
         """Obtiene todos los items manufacturados con su disponibilidad."""
         paginated_result = super().get_all(offset, limit)
+        derivatives = self.image_derivative_service.get_many(
+            item.image_url for item in paginated_result.items
+        )
 
+        live_stock = self.get_live_stock(paginated_result.items)
         items_with_availability = []
         for item in paginated_result.items:
-            is_available = self._check_item_availability(item)
+            is_available = self._check_item_availability(item, live_stock)
             item_dict = item.model_dump()
             item_dict["is_available"] = is_available
+            item_dict["image_derivatives"] = derivatives.get(item.image_url)
             items_with_availability.append(
                 ResponseManufacturedItemWithAvailabilitySchema(**item_dict)
             )
@@ -59,45 +73,80 @@ class ManufacturedItemService(BaseServiceImplementation):
     def save(
         self, schema: CreateManufacturedItemSchema
     ) -> ResponseManufacturedItemSchema:
-        """Guarda un nuevo item manufacturado en la base de datos."""
-        if schema.image_url:
-            schema.image_url = upload_base64_image_to_cloudinary(
-                schema.image_url, "manufactured_items"
-            )
+        """Guarda un nuevo item manufacturado en la base de datos.
+
+        La imagen se sube en segundo plano; mientras tanto se guarda una URL provisoria.
+        """
+        pending_upload = self.image_uploader.prepare_upload(schema)
 
         details = schema.details
         schema.details = []
-        return self.repository.save_with_details(self.to_model(schema), details)
+        manufactured_item = self.repository.save_with_details(
+            self.to_model(schema), details
+        )
+
+        if pending_upload:
+            self.image_uploader.schedule_upload(
+                self.repository,
+                manufactured_item.id_key,
+                *pending_upload,
+                "manufactured_items",
+            )
+        return manufactured_item
 
     def update(
         self, id_key: int, schema: CreateManufacturedItemSchema
     ) -> ResponseManufacturedItemSchema:
         """Actualiza un item manufacturado existente en la base de datos."""
         manufactured_item = self.repository.find(id_key)
-        if schema.image_url and schema.image_url != manufactured_item.image_url:
-            schema.image_url = upload_base64_image_to_cloudinary(
-                schema.image_url, "manufactured_items"
-            )
+        pending_upload = self.image_uploader.prepare_upload(
+            schema, manufactured_item.image_url
+        )
         details = schema.details
         schema.details = []
 
-        return self.repository.update_with_details(id_key, schema, details)
+        updated_item = self.repository.update_with_details(id_key, schema, details)
+
+        if pending_upload:
+            self.image_uploader.schedule_upload(
+                self.repository, id_key, *pending_upload, "manufactured_items"
+            )
+        return updated_item
 
     def delete(self, id_key: int) -> ResponseManufacturedItemSchema:
         """Elimina un item manufacturado de la base de datos."""
         manufactured_item = self.repository.find(id_key)
         if manufactured_item.image_url:
-            delete_image_from_cloudinary(manufactured_item.image_url)
+            self.image_uploader.schedule_delete(manufactured_item.image_url)
 
         return self.repository.remove(id_key)
 
+    def get_live_stock(
+        self, manufactured_items: Iterable[ResponseManufacturedItemSchema]
+    ) -> Dict[int, float]:
+        """Obtiene en una sola consulta el stock real de los ingredientes de varios items."""
+        inventory_item_ids = {
+            detail.inventory_item.id_key
+            for manufactured_item in manufactured_items
+            for detail in manufactured_item.details
+        }
+        return {
+            inventory_item_id: stock
+            for inventory_item_id, (_, stock) in (
+                self.inventory_movement_service.get_live_stock(
+                    list(inventory_item_ids)
+                ).items()
+            )
+        }
+
     @staticmethod
     def _check_item_availability(
         manufactured_item: ResponseManufacturedItemSchema,
+        live_stock: Dict[int, float],
     ) -> bool:
         """Verifica si un item manufacturado tiene suficiente stock para elaborarse."""
         for detail in manufactured_item.details:
-            if detail.inventory_item.current_stock < detail.quantity:
+            if live_stock[detail.inventory_item.id_key] < detail.quantity:
                 return False
 
         return True
@@ -1,12 +1,23 @@
-from typing import Dict
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from zoneinfo import ZoneInfo
+
+from starlette.concurrency import run_in_threadpool
 
-from src.config.mercado_pago import sdk
 from src.config.settings import settings
+from src.repositories.mp_preference import MpPreferenceRepository
+from src.schemas.mp_preference import CreateMpPreferenceSchema
 from src.schemas.order import ResponseOrderSchema
+from src.utils.mercado_pago import MercadoPagoClient
+
+# Una preferencia a punto de vencer no se reutiliza: el cliente no llegaría a pagar.
+PREFERENCE_REUSE_MARGIN = timedelta(minutes=5)
 
 
-def create_mp_preference(order: ResponseOrderSchema) -> Dict[str, str]:
-    """Creacion de la preferencia de pago de Mercado Pago."""
+def build_preference_items(order: ResponseOrderSchema) -> List[Dict[str, Any]]:
+    """Arma los items de la preferencia de pago a partir del pedido."""
     items = []
     discount_factor = settings.pickup_discount if order.discount else 0
 
@@ -40,9 +51,69 @@ def create_mp_preference(order: ResponseOrderSchema) -> Dict[str, str]:
             detail.unit_price,
         )
 
-    preference_response = sdk.preference().create({"items": items})
+    return items
+
+
+def hash_preference_items(items: List[Dict[str, Any]]) -> str:
+    """Calcula un hash estable de los items para detectar cambios en el pedido."""
+    serialized = json.dumps(items, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+async def create_mp_preference(order: ResponseOrderSchema) -> Dict[str, str]:
+    """Creacion de la preferencia de pago de Mercado Pago.
+
+    Si el pedido ya tiene una preferencia vigente creada con los mismos items,
+    se devuelve la guardada sin volver a llamar a Mercado Pago.
+    """
+    repository = MpPreferenceRepository()
+    items = build_preference_items(order)
+    items_hash = hash_preference_items(items)
+
+    cached = await run_in_threadpool(repository.find_by_order, order.id_key)
+    if (
+        cached
+        and cached.items_hash == items_hash
+        and cached.expires_at > datetime.now() + PREFERENCE_REUSE_MARGIN
+    ):
+        return {"preference_id": cached.preference_id, "payment_url": cached.init_point}
+
+    ttl = timedelta(minutes=settings.mp_preference_ttl_minutes or 60)
+    expiration_from = datetime.now(ZoneInfo(settings.app_timezone))
+    expiration_to = expiration_from + ttl
+    preference_data = {
+        "items": items,
+        "external_reference": str(order.id_key),
+        "expires": True,
+        "expiration_date_from": expiration_from.isoformat(timespec="milliseconds"),
+        "expiration_date_to": expiration_to.isoformat(timespec="milliseconds"),
+    }
+    if settings.mp_notification_url:
+        preference_data["notification_url"] = settings.mp_notification_url
+
+    # La clave depende sólo del pedido y sus items para que Mercado Pago
+    # descarte los reintentos y los pedidos simultáneos. Al renovar una
+    # preferencia vencida con los mismos items se incluye la anterior, porque
+    # si no Mercado Pago devolvería la vencida.
+    renewed = cached.preference_id if cached and cached.items_hash == items_hash else ""
+    key_hash = hashlib.sha256(f"{items_hash}:{renewed}".encode("utf-8")).hexdigest()
+
+    preference = await MercadoPagoClient().create_preference(
+        preference_data, idempotency_key=f"order-{order.id_key}-{key_hash[:32]}"
+    )
+
+    await run_in_threadpool(
+        repository.store,
+        CreateMpPreferenceSchema(
+            order_id=order.id_key,
+            preference_id=preference["id"],
+            init_point=preference["init_point"],
+            items_hash=items_hash,
+            expires_at=datetime.now() + ttl,
+        ),
+    )
 
     return {
-        "preference_id": preference_response["response"]["id"],
-        "payment_url": preference_response["response"]["init_point"],
+        "preference_id": preference["id"],
+        "payment_url": preference["init_point"],
     }
@@ -0,0 +1,143 @@
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.models.mp_webhook_event import MpWebhookEventModel
+from src.repositories.base_implementation import RecordNotFoundError
+from src.repositories.mp_webhook_event import MpWebhookEventRepository
+from src.repositories.order import OrderRepository
+from src.schemas.job import CreateJobSchema
+from src.schemas.mp_webhook_event import (
+    CreateMpWebhookEventSchema,
+    ResponseMpWebhookEventSchema,
+)
+from src.services.base_implementation import BaseServiceImplementation
+from src.services.invoice import InvoiceService
+from src.services.job_queue import JobQueue, PermanentJobError
+from src.services.order_events import OrderEventBroker
+from src.utils.mercado_pago import MercadoPagoClient
+
+MP_PAYMENT_JOB = "mp_payment"
+
+# Estados finales de un pago que se le notifican al cliente.
+NOTIFIED_PAYMENT_STATUSES = {"approved", "rejected", "cancelled", "refunded"}
+
+
+class MpWebhookService(
+    BaseServiceImplementation[MpWebhookEventModel, ResponseMpWebhookEventSchema]
+):
+    """Servicio para las notificaciones de pagos de Mercado Pago.
+
+    El webhook sólo guarda la notificación y encola un trabajo; consultar el
+    pago, facturar y avisar al cliente se hace en los workers de la cola.
+    """
+
+    def __init__(self):
+        super().__init__(
+            repository=MpWebhookEventRepository(),
+            model=MpWebhookEventModel,
+            create_schema=CreateMpWebhookEventSchema,
+            response_schema=ResponseMpWebhookEventSchema,
+        )
+        self.order_repository = OrderRepository()
+        self.invoice_service = InvoiceService()
+        self.order_event_broker = OrderEventBroker()
+        self.mercado_pago_client = MercadoPagoClient()
+        self.job_queue = JobQueue()
+        self.job_queue.register(MP_PAYMENT_JOB, self._process_payment)
+
+    async def receive(
+        self, notification: Dict[str, Any], data_id: str, request_id: Optional[str]
+    ) -> Optional[ResponseMpWebhookEventSchema]:
+        """Guarda una notificación y encola su procesamiento.
+
+        Las notificaciones se identifican por el ``data.id`` y el
+        ``x-request-id`` firmados, no por el ``id`` del cuerpo, que no está
+        firmado. Devuelve None si la notificación ya se había recibido.
+        """
+        notification_type = notification.get("type") or notification.get("topic")
+        if not notification_type:
+            raise ValueError("La notificación no indica su tipo.")
+
+        action = notification.get("action")
+        schema = CreateMpWebhookEventSchema(
+            notification_id=f"{data_id}:{request_id}" if request_id else data_id,
+            type=notification_type,
+            action=action,
+            resource_id=data_id,
+            payload=notification,
+        )
+
+        # Sólo los pagos tienen un trabajo asociado; el resto se guarda para auditoría.
+        job = None
+        if notification_type == "payment":
+            job = CreateJobSchema(
+                type=MP_PAYMENT_JOB,
+                payload={"payment_id": data_id},
+                max_attempts=settings.job_max_attempts or 5,
+            )
+        event = await run_in_threadpool(self.repository.save_with_job, schema, job)
+
+        if event is not None and job is not None:
+            self.job_queue.notify()
+        return event
+
+    async def _process_payment(self, payload: Dict[str, Any]) -> None:
+        """Trabajo en segundo plano: aplica el resultado de un pago al pedido."""
+        payment = await self.mercado_pago_client.get_payment(payload["payment_id"])
+        payment_status = payment.get("status")
+
+        try:
+            order_id = int(payment.get("external_reference"))
+        except (TypeError, ValueError):
+            raise PermanentJobError(
+                f"El pago {payload['payment_id']} no referencia a un pedido."
+            )
+
+        try:
+            order = await run_in_threadpool(self.order_repository.find, order_id)
+        except RecordNotFoundError as e:
+            raise PermanentJobError(str(e)) from e
+
+        if payment_status == "approved":
+            amount = payment.get("transaction_amount") or 0
+            if amount + 0.01 < (order.final_total or 0):
+                raise PermanentJobError(
+                    f"El pago {payload['payment_id']} de {amount} no cubre "
+                    f"el total del pedido {order_id}."
+                )
+            await self._apply_approved_payment(order_id, payload["payment_id"])
+            order = await run_in_threadpool(self.order_repository.find, order_id)
+
+        if payment_status in NOTIFIED_PAYMENT_STATUSES:
+            self.order_event_broker.publish_payment(order, payment_status)
+
+        await run_in_threadpool(
+            self.repository.mark_processed,
+            payload["payment_id"],
+            payment_status,
+        )
+
+    async def _apply_approved_payment(self, order_id: int, payment_id: str) -> None:
+        """Marca el pedido como pagado y lo factura una sola vez.
+
+        Sólo factura la notificación que efectivamente marcó el pedido como
+        pagado; si la factura no llegó a guardarse, se desmarca para que el
+        reintento la genere. Si ya se guardó, el pedido queda pagado y el
+        reintento no factura de nuevo.
+        """
+        if not await run_in_threadpool(
+            self.order_repository.mark_paid, order_id, f"MP-{payment_id}"
+        ):
+            return
+
+        try:
+            await self.invoice_service.generate_invoice(order_id)
+        except Exception:
+            order = await run_in_threadpool(self.order_repository.find, order_id)
+            if order.invoice_id is None:
+                await run_in_threadpool(
+                    self.order_repository.update, order_id, {"is_paid": False}
+                )
+            raise
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from src.models.order import OrderStatus
+from src.models.user import UserRole
+from src.schemas.order import ResponseOrderSchema
+from src.schemas.order_event import OrderEventSchema
+
+ROLE_STATUSES: Dict[str, Set[str]] = {
+    UserRole.administrador.value: {status.value for status in OrderStatus},
+    UserRole.cajero.value: {status.value for status in OrderStatus},
+    UserRole.cocinero.value: {OrderStatus.en_cocina.value, OrderStatus.listo.value},
+    UserRole.delivery.value: {
+        OrderStatus.listo.value,
+        OrderStatus.en_delivery.value,
+        OrderStatus.entregado.value,
+    },
+}
+
+
+@dataclass(eq=False)
+class OrderSubscription:
+    """Suscripción de una pantalla a los cambios de pedidos."""
+
+    user_id: int
+    role: str
+    loop: asyncio.AbstractEventLoop
+    statuses: Optional[Set[str]] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+
+    def matches(self, event: OrderEventSchema) -> bool:
+        """Indica si el evento corresponde al rol o al usuario suscripto."""
+        if event.user_id == self.user_id:
+            return True
+        if self.role not in ROLE_STATUSES:
+            return False
+
+        allowed_statuses = ROLE_STATUSES[self.role]
+        if self.statuses is not None:
+            allowed_statuses = allowed_statuses & self.statuses
+        return (
+            event.status in allowed_statuses
+            or event.previous_status in allowed_statuses
+        )
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """Encola un evento descartando el más antiguo si la cola está llena."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class OrderEventBroker:
+    """Distribuye los cambios de pedidos a las suscripciones WebSocket/SSE del proceso."""
+
+    _instance: Optional["OrderEventBroker"] = None
+
+    def __new__(cls) -> "OrderEventBroker":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(OrderEventBroker, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._subscriptions = []
+        return cls._instance
+
+    @contextmanager
+    def subscribe(
+        self, user_id: int, role: str, statuses: Optional[Set[str]] = None
+    ) -> Iterator[OrderSubscription]:
+        """Registra una suscripción mientras dure el contexto."""
+        subscription = OrderSubscription(
+            user_id=user_id,
+            role=role,
+            loop=asyncio.get_running_loop(),
+            statuses=statuses,
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions.remove(subscription)
+
+    def publish_created(self, order: ResponseOrderSchema) -> None:
+        """Publica la creación de un pedido."""
+        self._publish("order.created", order)
+
+    def publish_status(
+        self, order: ResponseOrderSchema, previous_status: Optional[str]
+    ) -> None:
+        """Publica un cambio de estado de un pedido."""
+        self._publish("order.status", order, previous_status)
+
+    def publish_delay(self, order: ResponseOrderSchema) -> None:
+        """Publica un cambio en el tiempo estimado de un pedido."""
+        self._publish("order.delay", order)
+
+    def publish_deleted(self, order: ResponseOrderSchema) -> None:
+        """Publica la baja de un pedido para que las pantallas lo quiten."""
+        self._publish("order.deleted", order, order.status)
+
+    def publish_payment(self, order: ResponseOrderSchema, payment_status: str) -> None:
+        """Publica el resultado de un pago de Mercado Pago."""
+        self._publish("order.payment", order, payment_status=payment_status)
+
+    def _publish(
+        self,
+        event_type: str,
+        order: ResponseOrderSchema,
+        previous_status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+    ) -> None:
+        """Envía el delta del pedido a las suscripciones que corresponda."""
+        with self._lock:
+            subscriptions: List[OrderSubscription] = list(self._subscriptions)
+        if not subscriptions:
+            return
+
+        event = OrderEventSchema(
+            type=event_type,
+            order_id=order.id_key,
+            user_id=order.user.id_key,
+            status=order.status,
+            previous_status=previous_status,
+            estimated_time=order.estimated_time,
+            is_paid=order.is_paid,
+            payment_status=payment_status,
+            timestamp=datetime.now(),
+        )
+        payload = event.model_dump(mode="json", exclude_none=True)
+
+        for subscription in subscriptions:
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, payload)
+            except RuntimeError:
+                pass
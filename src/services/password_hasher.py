@@ -0,0 +1,109 @@
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from src.config.settings import settings
+
+BCRYPT_HASH_PATTERN = re.compile(r"^\$2[aby]\$(\d{2})\$.{53}$")
+
+
+class PasswordHashQueueFullError(Exception):
+    """La cola de hasheo de contraseñas está llena."""
+
+
+def hash_password_sync(password: str, rounds: int) -> str:
+    """Hashea una contraseña con bcrypt usando el costo indicado."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    """Verifica una contraseña contra un hash de bcrypt."""
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # El hash guardado no es un hash de bcrypt válido.
+        return False
+
+
+class PasswordHasher:
+    """Hashea y verifica contraseñas en un pool de hilos.
+
+    bcrypt libera el GIL mientras calcula el hash, así que los hilos del pool
+    trabajan en paralelo sin bloquear el event loop. La cantidad de
+    operaciones en espera o en curso está acotada: cuando se llena, los
+    pedidos reciben PasswordHashQueueFullError en lugar de acumularse.
+    """
+
+    _instance: Optional["PasswordHasher"] = None
+
+    def __new__(cls) -> "PasswordHasher":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(PasswordHasher, cls).__new__(cls)
+            cls._instance._executor = None
+            cls._instance._slots = None
+        return cls._instance
+
+    @staticmethod
+    def is_hashed(value: str) -> bool:
+        """Indica si el valor ya es un hash de bcrypt."""
+        return BCRYPT_HASH_PATTERN.match(value) is not None
+
+    @staticmethod
+    def rounds() -> int:
+        """Costo de bcrypt configurado para los hashes nuevos."""
+        return settings.password_hash_rounds or 12
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Indica si el hash se generó con un costo distinto al configurado."""
+        match = BCRYPT_HASH_PATTERN.match(hashed_password)
+        return match is not None and int(match.group(1)) != self.rounds()
+
+    async def hash(self, password: str, wait: bool = False) -> str:
+        """Hashea una contraseña en un hilo del pool."""
+        return await self._run(hash_password_sync, wait, password, self.rounds())
+
+    async def verify(
+        self, password: str, hashed_password: str, wait: bool = False
+    ) -> bool:
+        """Verifica una contraseña en un hilo del pool."""
+        return await self._run(verify_password_sync, wait, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Espera las operaciones en curso y detiene el pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, function, wait: bool, *args):
+        """Ejecuta la operación en el pool respetando el límite de la cola."""
+        slots = self._get_slots()
+        if not wait and slots.locked():
+            raise PasswordHashQueueFullError(
+                "Hay demasiados inicios de sesión en curso, intente nuevamente."
+            )
+
+        async with slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), function, *args
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Crea el pool de hilos la primera vez que se usa."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers or os.cpu_count(),
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Crea el semáforo que acota la cola la primera vez que se usa."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(settings.password_hash_queue_size or 32)
+        return self._slots
@@ -0,0 +1,70 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from src.config.settings import settings
+from src.utils.reportlab import render_pdf_report
+
+
+class RenderQueueFullError(Exception):
+    """La cola de generación de PDFs está llena."""
+
+
+class PdfRenderer:
+    """Genera PDFs en un pool de procesos para no bloquear el event loop.
+
+    La cantidad de PDFs en espera o en generación está acotada: quien no puede
+    esperar (una descarga) recibe RenderQueueFullError y quien puede (un
+    trabajo en segundo plano) espera su turno.
+    """
+
+    _instance: Optional["PdfRenderer"] = None
+
+    def __new__(cls) -> "PdfRenderer":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(PdfRenderer, cls).__new__(cls)
+            cls._instance._executor = None
+            cls._instance._slots = None
+        return cls._instance
+
+    async def render(
+        self, invoice_data: Dict[str, Any], report_type: str, wait: bool = True
+    ) -> bytes:
+        """Genera el PDF en un proceso del pool."""
+        slots = self._get_slots()
+        if not wait and slots.locked():
+            raise RenderQueueFullError(
+                "Hay demasiados PDFs en generación, intente nuevamente."
+            )
+
+        async with slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), render_pdf_report, invoice_data, report_type
+            )
+
+    def shutdown(self) -> None:
+        """Detiene los procesos del pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos la primera vez que se usa.
+
+        Se usa ``spawn`` para que los procesos no hereden las conexiones ni
+        los hilos del servidor.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.pdf_render_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Crea el semáforo que acota la cola la primera vez que se usa."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(settings.pdf_render_queue_size or 32)
+        return self._slots
@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from src.models.promotion import PromotionModel
 from src.repositories.inventory_item import InventoryItemRepository
 from src.repositories.promotion import PromotionRepository
@@ -8,6 +10,7 @@ from src.schemas.promotion import (
     ResponsePromotionWithAvailabilitySchema,
 )
 from src.services.base_implementation import BaseServiceImplementation
+from src.services.inventory_movement import InventoryMovementService
 from src.services.manufactured_item import ManufacturedItemService
 
 
@@ -23,14 +26,17 @@ class PromotionService(BaseServiceImplementation):
         )
         self.manufactured_item_service = ManufacturedItemService()
         self.inventory_item_repository = InventoryItemRepository()
+        self.inventory_movement_service = InventoryMovementService()
 
     def get_all(self, offset: int = 0, limit: int = 10) -> PaginatedResponseSchema:
         """Obtiene todas las promociones con su disponibilidad."""
         paginated_result = super().get_all(offset, limit)
 
+        live_stock = self._get_live_stock(paginated_result.items)
+
         promotions_with_availability = []
         for promotion in paginated_result.items:
-            is_available = self.check_promotion_availability(promotion)
+            is_available = self.check_promotion_availability(promotion, live_stock)
             promotion_dict = promotion.model_dump()
             promotion_dict["is_available"] = is_available
             promotions_with_availability.append(
@@ -74,19 +80,41 @@ class PromotionService(BaseServiceImplementation):
             id_key, schema, manufactured_item_details, inventory_item_details
         )
 
+    def _get_live_stock(
+        self, promotions: List[ResponsePromotionSchema]
+    ) -> Dict[int, float]:
+        """Obtiene en una sola consulta el stock real de los items de varias promociones."""
+        inventory_item_ids = set()
+        for promotion in promotions:
+            for manufactured_detail in promotion.manufactured_item_details:
+                for detail in manufactured_detail.manufactured_item.details:
+                    inventory_item_ids.add(detail.inventory_item.id_key)
+            for inventory_detail in promotion.inventory_item_details:
+                inventory_item_ids.add(inventory_detail.inventory_item.id_key)
+        return {
+            inventory_item_id: stock
+            for inventory_item_id, (_, stock) in (
+                self.inventory_movement_service.get_live_stock(
+                    list(inventory_item_ids)
+                ).items()
+            )
+        }
+
     @staticmethod
-    def check_promotion_availability(promotion: ResponsePromotionSchema) -> bool:
-        """Verifica si una promoción tiene disponibilidad."""
+    def check_promotion_availability(
+        promotion: ResponsePromotionSchema, live_stock: Dict[int, float]
+    ) -> bool:
+        """Verifica si una promoción tiene disponibilidad con el stock real."""
         for manufactured_detail in promotion.manufactured_item_details:
             for detail in manufactured_detail.manufactured_item.details:
-                if detail.inventory_item.current_stock < (
+                if live_stock[detail.inventory_item.id_key] < (
                     detail.quantity * manufactured_detail.quantity
                 ):
                     return False
 
         for inventory_detail in promotion.inventory_item_details:
             if (
-                inventory_detail.inventory_item.current_stock
+                live_stock[inventory_detail.inventory_item.id_key]
                 < inventory_detail.quantity
             ):
                 return False
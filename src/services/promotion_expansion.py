@@ -0,0 +1,91 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.repositories.base_implementation import RecordNotFoundError
+from src.repositories.promotion import PromotionRepository
+from src.schemas.order_detail import CreateOrderDetailSchema
+from src.schemas.order_inventory_detail import CreateOrderInventoryDetailSchema
+from src.schemas.order_promotion_detail import CreateOrderPromotionDetailSchema
+
+
+class PromotionExpansionService:
+    """Servicio para expandir las promociones de un pedido en detalles regulares."""
+
+    def __init__(self):
+        self.promotion_repository = PromotionRepository()
+
+    def expand(
+        self, promotion_details: List[CreateOrderPromotionDetailSchema]
+    ) -> Tuple[List[CreateOrderDetailSchema], List[CreateOrderInventoryDetailSchema]]:
+        """Expande las promociones cargándolas todas en una única consulta."""
+        if not promotion_details:
+            return [], []
+
+        promotion_quantities: Dict[int, int] = defaultdict(int)
+        for promotion_detail in promotion_details:
+            promotion_quantities[
+                promotion_detail.promotion_id
+            ] += promotion_detail.quantity
+
+        rows = self.promotion_repository.get_expansion_rows(list(promotion_quantities))
+
+        missing_ids = set(promotion_quantities) - {row.promotion_id for row in rows}
+        if missing_ids:
+            raise RecordNotFoundError(f"No record found with id {min(missing_ids)}")
+
+        return self.merge_rows(rows, promotion_quantities)
+
+    @staticmethod
+    def merge_rows(
+        rows: Iterable[Any], promotion_quantities: Dict[int, int]
+    ) -> Tuple[List[CreateOrderDetailSchema], List[CreateOrderInventoryDetailSchema]]:
+        """Agrupa las filas de las promociones por item usando índices por ID.
+
+        Cuando un mismo item aparece en varias promociones, el precio unitario
+        resultante es el promedio ponderado de los precios con descuento.
+        """
+        totals: Dict[str, Dict[int, List[float]]] = {
+            "manufactured": {},
+            "inventory": {},
+        }
+
+        for row in rows:
+            if row.item_id is None:
+                continue
+
+            quantity = row.quantity * promotion_quantities[row.promotion_id]
+            if not quantity:
+                continue
+
+            discounted_price = row.price * (1 - row.discount_percentage / 100)
+
+            item_totals = totals[row.item_type].get(row.item_id)
+            if item_totals is None:
+                totals[row.item_type][row.item_id] = [
+                    quantity,
+                    discounted_price * quantity,
+                ]
+            else:
+                item_totals[0] += quantity
+                item_totals[1] += discounted_price * quantity
+
+        expanded_details = [
+            CreateOrderDetailSchema(
+                manufactured_item_id=item_id,
+                quantity=quantity,
+                unit_price=total_value / quantity,
+                subtotal=total_value,
+            )
+            for item_id, (quantity, total_value) in totals["manufactured"].items()
+        ]
+        expanded_inventory_details = [
+            CreateOrderInventoryDetailSchema(
+                inventory_item_id=item_id,
+                quantity=quantity,
+                unit_price=total_value / quantity,
+                subtotal=total_value,
+            )
+            for item_id, (quantity, total_value) in totals["inventory"].items()
+        ]
+
+        return expanded_details, expanded_inventory_details
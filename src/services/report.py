@@ -1,13 +1,62 @@
-from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict, List
+from datetime import datetime, timedelta
+from itertools import chain
+from tempfile import SpooledTemporaryFile
+from typing import Any, Dict, Iterator, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from src.config.settings import settings
 from src.repositories.inventory_purchase import InventoryPurchaseRepository
 from src.repositories.invoice import InvoiceRepository
-from src.repositories.order import OrderRepository
-from src.repositories.order_detail import OrderDetailRepository
-from src.repositories.order_inventory_detail import OrderInventoryDetailRepository
+from src.schemas.report_series import (
+    ReportSeriesPointSchema,
+    ReportSeriesSchema,
+    SeriesBucket,
+)
+from src.schemas.sales_rollup import ProductBreakdown
+from src.services.sales_rollup import SalesRollupService
 from src.utils.openpyxl import generate_excel_report
+from src.utils.tabular_export import ReportColumn, ReportFormat, stream_report
+
+REVENUE_REPORT_COLUMNS: List[ReportColumn] = [
+    ("tipo", str),
+    ("fecha", datetime),
+    ("descripcion", str),
+    ("cantidad", float),
+    ("costo_total", float),
+    ("ganancia_total", float),
+]
+TOP_PRODUCTS_COLUMNS: List[ReportColumn] = [
+    ("id", int),
+    ("name", str),
+    ("quantity", float),
+    ("revenue", float),
+    ("category", str),
+    ("type", str),
+]
+TOP_PRODUCTS_BY_DELIVERY_COLUMNS: List[ReportColumn] = TOP_PRODUCTS_COLUMNS + [
+    ("delivery_method", str),
+]
+TOP_CATEGORIES_COLUMNS: List[ReportColumn] = [
+    ("category", str),
+    ("type", str),
+    ("quantity", float),
+    ("revenue", float),
+]
+TOP_CUSTOMERS_COLUMNS: List[ReportColumn] = [
+    ("id", int),
+    ("name", str),
+    ("email", str),
+    ("order_count", int),
+    ("total_amount", float),
+]
+
+MAX_SERIES_POINTS = 2000
+SERIES_BUCKET_LENGTHS = {
+    SeriesBucket.hour: timedelta(hours=1),
+    SeriesBucket.day: timedelta(days=1),
+    SeriesBucket.week: timedelta(weeks=1),
+    SeriesBucket.month: timedelta(days=28),
+}
 
 
 class ReportService:
@@ -15,52 +64,41 @@ class ReportService:
 
     def __init__(self):
         self.inventory_purchase_repository = InventoryPurchaseRepository()
-        self.order_repository = OrderRepository()
-        self.order_detail_repository = OrderDetailRepository()
-        self.order_inventory_detail_repository = OrderInventoryDetailRepository()
         self.invoice_repository = InvoiceRepository()
+        self.sales_rollup_service = SalesRollupService()
 
     def get_top_products(
-        self, start_date: datetime, end_date: datetime, limit: int = 10
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 10,
+        breakdown: Optional[ProductBreakdown] = None,
     ) -> List[Dict[str, Any]]:
-        """Obtiene los productos más vendidos en un rango de fechas."""
-        manufactured_products = (
-            self.order_detail_repository.get_top_manufactured_products(
-                start_date, end_date, limit
-            )
+        """Obtiene los productos más vendidos, opcionalmente por categoría o forma de entrega."""
+        return self.sales_rollup_service.get_top_products(
+            start_date, end_date, limit, breakdown
         )
 
-        inventory_products = (
-            self.order_inventory_detail_repository.get_top_inventory_products(
-                start_date, end_date, limit
-            )
-        )
-
-        all_products = manufactured_products + inventory_products
-        all_products.sort(key=lambda x: x["quantity"], reverse=True)
-
-        return all_products[:limit]
+    def get_top_categories(
+        self, start_date: datetime, end_date: datetime, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Obtiene las categorías con más ingresos en un rango de fechas."""
+        return self.sales_rollup_service.get_top_categories(start_date, end_date, limit)
 
     def get_top_customers(
         self, start_date: datetime, end_date: datetime, limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Obtiene los clientes con más compras en un rango de fechas."""
-        return self.order_repository.get_top_customers(start_date, end_date, limit)
+        return self.sales_rollup_service.get_top_customers(start_date, end_date, limit)
 
     def get_revenue_by_period(
         self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Any]:
         """Obtiene los ingresos totales y gastos en un rango de fechas."""
-        revenue_data = self.invoice_repository.get_revenue_by_period(
-            start_date, end_date
-        )
-
-        purchases_data = self.inventory_purchase_repository.get_purchase_costs(
-            start_date, end_date
-        )
+        financials = self.sales_rollup_service.get_financials(start_date, end_date)
 
-        total_revenue = revenue_data["total_revenue"]
-        total_expenses = purchases_data["purchase_costs"]
+        total_revenue = financials["total_revenue"]
+        total_expenses = financials["purchase_costs"]
 
         profit = total_revenue - total_expenses
         profit_margin = (profit / total_revenue * 100) if total_revenue > 0 else 0
@@ -70,22 +108,134 @@ class ReportService:
             "total_expenses": total_expenses,
             "profit": profit,
             "profit_margin_percentage": profit_margin,
-            "total_invoices": revenue_data["invoice_count"],
-            "total_inventory_purchases": purchases_data["purchase_count"],
+            "total_invoices": financials["invoice_count"],
+            "total_inventory_purchases": financials["purchase_count"],
             "start_date": start_date,
             "end_date": end_date,
         }
 
-    def get_excel_revenue_report(
-        self, start_date: datetime, end_date: datetime, buffer: BytesIO
-    ) -> None:
-        """Genera un reporte de ingresos en formato Excel."""
-        purchases_data = self.inventory_purchase_repository.get_purchases_report_data(
-            start_date, end_date
+    def get_series(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        bucket: SeriesBucket,
+        timezone: str,
+    ) -> ReportSeriesSchema:
+        """Obtiene ingresos, gastos, pedidos y ticket promedio por intervalo.
+
+        Las fechas sin zona horaria se interpretan en ``timezone`` y los
+        intervalos se arman en esa zona.
+        """
+        try:
+            zone = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Zona horaria desconocida: {timezone}")
+        storage_zone = ZoneInfo(settings.app_timezone)
+
+        start = (
+            start_date.astimezone(zone)
+            if start_date.tzinfo
+            else start_date.replace(tzinfo=zone)
+        )
+        end = (
+            end_date.astimezone(zone)
+            if end_date.tzinfo
+            else end_date.replace(tzinfo=zone)
+        )
+        if start > end:
+            raise ValueError("La fecha de inicio debe ser anterior a la de fin.")
+        if (end - start) / SERIES_BUCKET_LENGTHS[bucket] > MAX_SERIES_POINTS:
+            raise ValueError(
+                f"El rango pedido supera los {MAX_SERIES_POINTS} intervalos."
+            )
+
+        rows = self.invoice_repository.get_series(
+            bucket.value,
+            zone.key,
+            storage_zone.key,
+            start.replace(tzinfo=None),
+            end.replace(tzinfo=None),
+            start.astimezone(storage_zone).replace(tzinfo=None),
+            end.astimezone(storage_zone).replace(tzinfo=None),
+        )
+        return ReportSeriesSchema(
+            bucket=bucket,
+            timezone=zone.key,
+            start_date=start,
+            end_date=end,
+            points=[
+                ReportSeriesPointSchema(
+                    bucket=row.bucket.replace(tzinfo=zone),
+                    revenue=row.revenue,
+                    invoice_count=row.invoice_count,
+                    expenses=row.expenses,
+                    purchase_count=row.purchase_count,
+                    order_count=row.order_count,
+                    average_ticket=(
+                        row.order_total / row.order_count if row.order_count else 0
+                    ),
+                )
+                for row in rows
+            ],
+        )
+
+    def export_revenue_report(
+        self, start_date: datetime, end_date: datetime, report_format: ReportFormat
+    ) -> Iterator[bytes]:
+        """Exporta las compras e ingresos del período leyendo la base por lotes."""
+        purchases = (
+            ("Compra de Inventario", purchase_date, name, quantity, total_cost, None)
+            for purchase_date, quantity, total_cost, name in (
+                self.inventory_purchase_repository.get_purchases_report_data(
+                    start_date, end_date
+                )
+            )
+        )
+        invoices = (
+            ("Venta", invoice_date, invoice_type, None, None, total)
+            for invoice_date, total, invoice_type in (
+                self.invoice_repository.get_invoices_report_data(start_date, end_date)
+            )
+        )
+        return stream_report(
+            report_format, REVENUE_REPORT_COLUMNS, chain(purchases, invoices)
         )
 
-        invoices_data = self.invoice_repository.get_invoices_report_data(
-            start_date, end_date
+    @staticmethod
+    def export_rows(
+        rows: List[Dict[str, Any]],
+        columns: List[ReportColumn],
+        report_format: ReportFormat,
+    ) -> Iterator[bytes]:
+        """Exporta el resultado de un reporte en el formato pedido."""
+        return stream_report(
+            report_format,
+            columns,
+            ([row[name] for name, _ in columns] for row in rows),
         )
 
-        generate_excel_report(buffer, purchases_data, invoices_data)
+    def get_excel_revenue_report(
+        self, start_date: datetime, end_date: datetime
+    ) -> SpooledTemporaryFile:
+        """Genera un reporte de ingresos en formato Excel.
+
+        Las filas se leen de la base por lotes y se escriben directamente en un
+        archivo temporal que sólo pasa a disco si supera el tamaño configurado.
+        """
+        file = SpooledTemporaryFile(
+            max_size=settings.report_spool_max_bytes or 10 * 1024 * 1024
+        )
+        try:
+            generate_excel_report(
+                file,
+                self.inventory_purchase_repository.get_purchases_report_data(
+                    start_date, end_date
+                ),
+                self.invoice_repository.get_invoices_report_data(start_date, end_date),
+            )
+        except BaseException:
+            file.close()
+            raise
+
+        file.seek(0)
+        return file
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import settings
+from src.repositories.cache_version import CacheVersionRepository
+from src.schemas.report_cache import ReportCacheMetricsSchema
+
+CacheKey = Tuple[str, Optional[datetime], Optional[datetime], Hashable]
+ReportCompute = Callable[[Optional[datetime], Optional[datetime]], Any]
+
+REPORT_CACHE_VERSION = "reports"
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    expires_at: float
+
+
+class ReportCache:
+    """Caché en memoria de los resultados de los reportes.
+
+    Cada resultado se guarda por reporte, rango de fechas normalizado y límite
+    durante ``report_cache_ttl_seconds``. Cuando cambia un dato que entra en
+    los reportes se descartan los resultados cuyo rango lo incluye, y los
+    pedidos simultáneos de un mismo reporte comparten un único cálculo.
+
+    El reporte se calcula con el rango exacto del pedido que lo inicia; los
+    pedidos del mismo minuto reciben ese resultado, que a lo sumo difiere en
+    los segundos sueltos de los extremos, igual que un resultado en caché.
+
+    Cada proceso tiene su propia caché. Para que un cambio hecho en otro
+    worker también la descarte, cada invalidación incrementa una versión
+    guardada en la base y cada lectura la compara con la última vista: si
+    cambió, se descartan todos los resultados del proceso.
+    """
+
+    _instance: Optional["ReportCache"] = None
+
+    def __new__(cls) -> "ReportCache":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(ReportCache, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._entries = OrderedDict()
+            cls._instance._in_flight = {}
+            cls._instance._generation = 0
+            cls._instance._version = 0
+            cls._instance._stats = Counter()
+            cls._instance.version_repository = CacheVersionRepository()
+        return cls._instance
+
+    @staticmethod
+    def normalize_range(
+        start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Extiende el rango a minutos completos para armar la clave de la caché."""
+        if start_date is not None:
+            start_date = start_date.replace(second=0, microsecond=0)
+        if end_date is not None:
+            end_date = end_date.replace(second=59, microsecond=999999)
+        return start_date, end_date
+
+    async def get_or_compute(
+        self,
+        report: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: Hashable,
+        compute: ReportCompute,
+    ) -> Any:
+        """Devuelve el reporte guardado o lo calcula con el rango pedido."""
+        key = (report, *self.normalize_range(start_date, end_date), limit)
+        version = await run_in_threadpool(
+            self.version_repository.get_version, REPORT_CACHE_VERSION
+        )
+
+        with self._lock:
+            if version != self._version:
+                # Otro proceso registró un cambio: no se sabe qué rango tocó.
+                self._generation += 1
+                self._version = version
+                self._stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.value
+            if entry is not None:
+                del self._entries[key]
+
+            task = self._in_flight.get(key)
+            self._stats["coalesced" if task is not None else "misses"] += 1
+
+        if task is None:
+            task = asyncio.ensure_future(
+                self._compute(key, compute, start_date, end_date)
+            )
+            self._in_flight[key] = task
+
+        # El cálculo sigue aunque se cancele el pedido que lo inició, porque
+        # puede haber otros esperando el mismo resultado.
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        key: CacheKey,
+        compute: ReportCompute,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> Any:
+        """Calcula un reporte y lo guarda si no cambiaron los datos mientras tanto.
+
+        La entrada se invalida con el rango normalizado de la clave, que incluye
+        el de todos los pedidos que la comparten.
+        """
+        generation = self._generation
+        try:
+            value = await run_in_threadpool(compute, start_date, end_date)
+        finally:
+            del self._in_flight[key]
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = CacheEntry(
+                    value,
+                    key[1],
+                    key[2],
+                    time.monotonic() + (settings.report_cache_ttl_seconds or 60),
+                )
+                self._entries.move_to_end(key)
+                while len(self._entries) > (settings.report_cache_max_entries or 256):
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return value
+
+    def invalidate(self, when: datetime) -> None:
+        """Descarta los resultados cuyo rango incluye el momento de un cambio.
+
+        En este proceso se descarta sólo el rango afectado; los demás workers
+        ven la nueva versión en la base y descartan todos sus resultados.
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if self._in_range(when, entry.start_date, entry.end_date)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+
+        try:
+            version = self.version_repository.bump(REPORT_CACHE_VERSION)
+        except Exception as e:
+            print(f"Error al invalidar la caché de reportes en los demás procesos: {e}")
+            return
+
+        with self._lock:
+            # Si nadie más cambió la versión desde la última lectura, este
+            # proceso ya descartó lo que correspondía y la puede adoptar.
+            if version == self._version + 1:
+                self._version = version
+
+    @staticmethod
+    def _in_range(
+        when: datetime, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> bool:
+        """Indica si un momento (en hora local) cae dentro de un rango."""
+        for bound in (start_date, end_date):
+            if bound is not None and bound.tzinfo is not None and when.tzinfo is None:
+                when = when.astimezone(bound.tzinfo)
+        return (start_date is None or start_date <= when) and (
+            end_date is None or when <= end_date
+        )
+
+    def metrics(self) -> ReportCacheMetricsSchema:
+        """Devuelve los contadores de uso de la caché."""
+        with self._lock:
+            stats: Dict[str, int] = dict(self._stats)
+            entries = len(self._entries)
+        requests = sum(stats.get(name, 0) for name in ("hits", "coalesced", "misses"))
+        served = stats.get("hits", 0) + stats.get("coalesced", 0)
+        return ReportCacheMetricsSchema(
+            hits=stats.get("hits", 0),
+            coalesced=stats.get("coalesced", 0),
+            misses=stats.get("misses", 0),
+            invalidations=stats.get("invalidations", 0),
+            evictions=stats.get("evictions", 0),
+            entries=entries,
+            hit_rate=served / requests if requests else 0.0,
+        )
@@ -0,0 +1,422 @@
+import math
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.models.daily_category_sales import DailyCategorySalesModel
+from src.models.daily_customer_sales import DailyCustomerSalesModel
+from src.models.daily_financials import DailyFinancialsModel
+from src.models.daily_product_sales import DailyProductSalesModel
+from src.models.invoice import InvoiceType
+from src.models.order import OrderStatus
+from src.repositories.inventory_purchase import InventoryPurchaseRepository
+from src.repositories.invoice import InvoiceRepository
+from src.repositories.order import OrderRepository
+from src.repositories.order_detail import OrderDetailRepository
+from src.repositories.order_inventory_detail import OrderInventoryDetailRepository
+from src.repositories.sales_rollup import (
+    INVENTORY_ITEM,
+    MANUFACTURED_ITEM,
+    ROLLUP_TABLES,
+    RollupRows,
+    SalesRollupRepository,
+)
+from src.schemas.inventory_purchase import ResponseInventoryPurchaseSchema
+from src.schemas.invoice import ResponseInvoiceSchema
+from src.schemas.order import ResponseOrderSchema
+from src.schemas.sales_rollup import ProductBreakdown, RollupMismatchSchema
+from src.services.job_queue import JobQueue
+from src.services.report_cache import ReportCache
+
+SALES_ROLLUP_BACKFILL_JOB = "sales_rollup_backfill"
+DAYS_PER_BATCH = 31
+
+DayRange = Tuple[Optional[date], Optional[date]]
+DatetimeRange = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def day_batches(start_day: date, end_day: date) -> Iterator[Tuple[date, date]]:
+    """Divide un rango de días en bloques consecutivos."""
+    while start_day <= end_day:
+        batch_end = min(start_day + timedelta(days=DAYS_PER_BATCH - 1), end_day)
+        yield start_day, batch_end
+        start_day = batch_end + timedelta(days=1)
+
+
+class SalesRollupService:
+    """Servicio que mantiene y consulta los acumulados diarios de los reportes.
+
+    Los acumulados se actualizan cuando un pedido pasa a entregado, se emite una
+    factura o nota de crédito y se registra una compra, y en cada caso se
+    descartan los reportes en caché que incluyen ese momento. Los reportes leen
+    los días completos del rango desde los acumulados y sólo van a las tablas
+    originales para las horas sueltas de los extremos.
+
+    Las tablas de acumulados arrancan vacías: al iniciar la aplicación se encola
+    una única vez el recálculo de todo el historial y, hasta que termina, los
+    reportes se calculan completos desde las tablas originales.
+    """
+
+    _backfilled = False
+
+    def __init__(self):
+        self.repository = SalesRollupRepository()
+        self.order_repository = OrderRepository()
+        self.order_detail_repository = OrderDetailRepository()
+        self.order_inventory_detail_repository = OrderInventoryDetailRepository()
+        self.invoice_repository = InvoiceRepository()
+        self.inventory_purchase_repository = InventoryPurchaseRepository()
+        self.report_cache = ReportCache()
+        self.job_queue = JobQueue()
+        self.job_queue.register(SALES_ROLLUP_BACKFILL_JOB, self._run_backfill)
+
+    def on_order_status_change(
+        self, previous_status: Optional[str], order: ResponseOrderSchema
+    ) -> None:
+        """Suma el pedido a los acumulados al entregarse, o lo resta si deja de estarlo."""
+        was_delivered = previous_status == OrderStatus.entregado.value
+        is_delivered = order.status == OrderStatus.entregado.value
+        if was_delivered == is_delivered or order.date is None:
+            return
+
+        self._increment(self._order_rows([(order, 1 if is_delivered else -1)]))
+        self.report_cache.invalidate(order.date)
+
+    def on_order_updated(
+        self, previous: ResponseOrderSchema, order: ResponseOrderSchema
+    ) -> None:
+        """Rehace los acumulados de un pedido entregado cuyos datos cambiaron.
+
+        La forma de entrega y el cliente forman parte de la clave de los
+        acumulados: se resta el pedido como estaba y se suma como quedó.
+        """
+        if (previous.status, previous.delivery_method, previous.user.id_key) == (
+            order.status,
+            order.delivery_method,
+            order.user.id_key,
+        ):
+            return
+
+        changes = [
+            (changed, sign)
+            for changed, sign in ((previous, -1), (order, 1))
+            if changed.status == OrderStatus.entregado.value and changed.date
+        ]
+        if not changes:
+            return
+
+        self._increment(self._order_rows(changes))
+        for changed, _ in changes:
+            self.report_cache.invalidate(changed.date)
+
+    @staticmethod
+    def _order_rows(changes: List[Tuple[ResponseOrderSchema, int]]) -> RollupRows:
+        """Arma los cambios de los acumulados de pedidos sumados o restados."""
+        products = defaultdict(lambda: {"quantity": 0, "revenue": 0})
+        categories = defaultdict(lambda: {"quantity": 0, "revenue": 0})
+        customers = defaultdict(lambda: {"order_count": 0, "total_amount": 0})
+        for order, sign in changes:
+            day = order.date.date()
+            lines = [
+                (
+                    MANUFACTURED_ITEM,
+                    detail.manufactured_item.id_key,
+                    detail.manufactured_item.category.id_key,
+                    detail.quantity,
+                    detail.subtotal,
+                )
+                for detail in order.details
+            ] + [
+                (
+                    INVENTORY_ITEM,
+                    detail.inventory_item.id_key,
+                    detail.inventory_item.category.id_key,
+                    detail.quantity,
+                    detail.subtotal,
+                )
+                for detail in order.inventory_details
+            ]
+            for item_type, item_id, category_id, quantity, subtotal in lines:
+                for totals in (
+                    products[(day, item_type, item_id, order.delivery_method)],
+                    categories[(day, item_type, category_id)],
+                ):
+                    totals["quantity"] += sign * quantity
+                    totals["revenue"] += sign * subtotal
+
+            customer = customers[(day, order.user.id_key)]
+            customer["order_count"] += sign
+            customer["total_amount"] += sign * (order.final_total or 0)
+
+        return {
+            DailyProductSalesModel: products,
+            DailyCategorySalesModel: categories,
+            DailyCustomerSalesModel: customers,
+        }
+
+    def on_invoice_created(self, invoice: ResponseInvoiceSchema) -> None:
+        """Suma una factura emitida a los ingresos del día."""
+        if invoice.type == InvoiceType.factura.value:
+            self._increment_financials(
+                invoice.date, revenue=invoice.total, invoice_count=1
+            )
+
+    def on_credit_note(self, invoice: ResponseInvoiceSchema) -> None:
+        """Descuenta de los ingresos del día una factura anulada con nota de crédito."""
+        if invoice.type == InvoiceType.factura.value:
+            self._increment_financials(
+                invoice.date, revenue=-invoice.total, invoice_count=-1
+            )
+
+    def on_purchase_recorded(self, purchase: ResponseInventoryPurchaseSchema) -> None:
+        """Suma una compra de inventario a los gastos del día."""
+        self._increment_financials(
+            purchase.purchase_date, expenses=purchase.total_cost, purchase_count=1
+        )
+
+    def _increment_financials(self, when: datetime, **values: float) -> None:
+        """Suma ingresos o gastos al acumulado del día."""
+        self._increment({DailyFinancialsModel: {(when.date(),): values}})
+        self.report_cache.invalidate(when)
+
+    def _increment(self, rows: RollupRows) -> None:
+        """Aplica los cambios sobre los acumulados.
+
+        El cambio original ya quedó guardado, así que un error acá no se propaga:
+        se informa y los acumulados se corrigen con el comando de recálculo.
+        """
+        try:
+            self.repository.increment(rows)
+        except Exception as e:
+            print(
+                f"Error al actualizar los acumulados de reportes: {e}. "
+                "Recalcular con: python -m commands.sales_rollups backfill"
+            )
+
+    def get_top_products(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int = 10,
+        breakdown: Optional[ProductBreakdown] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene los productos más vendidos en un rango de fechas."""
+        days, edges = self._split_report_range(start_date, end_date)
+        return self.repository.get_top_products(days, edges, limit, breakdown)
+
+    def get_top_categories(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene las categorías con más ingresos en un rango de fechas."""
+        days, edges = self._split_report_range(start_date, end_date)
+        partial_rows = [
+            self.order_detail_repository.get_top_manufactured_products(start, end, None)
+            + self.order_inventory_detail_repository.get_top_inventory_products(
+                start, end, None
+            )
+            for start, end in edges
+        ]
+        rollup_rows = (
+            self.repository.get_category_totals(*days, None if edges else limit)
+            if days
+            else []
+        )
+        categories = self._merge(
+            [
+                rollup_rows,
+                *(
+                    [
+                        {
+                            key: row[key]
+                            for key in ("category", "type", "quantity", "revenue")
+                        }
+                        for row in rows
+                    ]
+                    for rows in partial_rows
+                ),
+            ],
+            ("type", "category"),
+            ("quantity", "revenue"),
+        )
+        categories.sort(key=lambda x: x["revenue"], reverse=True)
+        return categories[:limit]
+
+    def get_top_customers(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene los clientes con más pedidos en un rango de fechas."""
+        days, edges = self._split_report_range(start_date, end_date)
+        partial_rows = [
+            self.order_repository.get_top_customers(start, end, None)
+            for start, end in edges
+        ]
+        rollup_rows = (
+            self.repository.get_customer_totals(*days, None if edges else limit)
+            if days
+            else []
+        )
+        customers = self._merge(
+            [rollup_rows, *partial_rows], ("id",), ("order_count", "total_amount")
+        )
+        customers.sort(key=lambda x: x["order_count"], reverse=True)
+        return customers[:limit]
+
+    def get_financials(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Dict[str, float]:
+        """Obtiene ingresos, facturas, gastos y compras de un rango de fechas."""
+        days, edges = self._split_report_range(start_date, end_date)
+        totals = {
+            "total_revenue": 0,
+            "invoice_count": 0,
+            "purchase_costs": 0,
+            "purchase_count": 0,
+        }
+        parts = [self.repository.get_financial_totals(*days)] if days else []
+        for start, end in edges:
+            parts.append(self.invoice_repository.get_revenue_by_period(start, end))
+            parts.append(
+                self.inventory_purchase_repository.get_purchase_costs(start, end)
+            )
+        for part in parts:
+            for name, value in part.items():
+                totals[name] += value
+        return totals
+
+    def _split_report_range(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Tuple[Optional[DayRange], List[DatetimeRange]]:
+        """Divide el rango de un reporte, o lo deja entero si los acumulados no están listos."""
+        if not self.is_backfilled():
+            return None, [(start_date, end_date)]
+        return self.split_range(start_date, end_date)
+
+    @staticmethod
+    def split_range(
+        start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Tuple[Optional[DayRange], List[DatetimeRange]]:
+        """Divide un rango en los días completos que cubre y los tramos sueltos de los extremos.
+
+        Devuelve el rango de días (o None si no cubre ningún día completo) y los
+        tramos, con ambos extremos incluidos como en los reportes originales.
+        """
+        first_day = last_day = None
+        if start_date is not None:
+            first_day = start_date.date()
+            if start_date.time() != time.min:
+                first_day += timedelta(days=1)
+        if end_date is not None:
+            last_day = (end_date + timedelta(microseconds=1)).date() - timedelta(days=1)
+
+        if first_day is not None and last_day is not None and first_day > last_day:
+            return None, [(start_date, end_date)]
+
+        edges = []
+        if start_date is not None and first_day != start_date.date():
+            edges.append(
+                (
+                    start_date,
+                    datetime.combine(first_day, time.min, start_date.tzinfo)
+                    - timedelta(microseconds=1),
+                )
+            )
+        if end_date is not None:
+            after_last_day = datetime.combine(
+                last_day + timedelta(days=1), time.min, end_date.tzinfo
+            )
+            if after_last_day <= end_date:
+                edges.append((after_last_day, end_date))
+        return (first_day, last_day), edges
+
+    @staticmethod
+    def _merge(
+        row_lists: Iterable[List[Dict[str, Any]]],
+        key_fields: Tuple[str, ...],
+        value_fields: Tuple[str, ...],
+    ) -> List[Dict[str, Any]]:
+        """Une filas de varias fuentes sumando los valores de las que comparten clave."""
+        merged: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for rows in row_lists:
+            for row in rows:
+                key = tuple(row[name] for name in key_fields)
+                if key not in merged:
+                    merged[key] = dict(row)
+                    continue
+                for name in value_fields:
+                    merged[key][name] += row[name]
+        return list(merged.values())
+
+    def schedule_backfill(self) -> None:
+        """Encola el recálculo de todo el historial si nunca se hizo."""
+        if not self.is_backfilled() and self.repository.claim_backfill():
+            self.job_queue.enqueue(SALES_ROLLUP_BACKFILL_JOB, {})
+
+    def is_backfilled(self) -> bool:
+        """Indica si los acumulados ya cubren todo el historial."""
+        if not SalesRollupService._backfilled:
+            SalesRollupService._backfilled = self.repository.is_backfilled()
+        return SalesRollupService._backfilled
+
+    def mark_backfilled(self) -> None:
+        """Registra que los acumulados cubren todo el historial."""
+        self.repository.mark_backfilled()
+        SalesRollupService._backfilled = True
+
+    async def _run_backfill(self, _: Dict[str, Any]) -> None:
+        """Trabajo en segundo plano: recalcula todo el historial."""
+        await run_in_threadpool(self.backfill_history)
+
+    def backfill_history(self) -> None:
+        """Recalcula los acumulados de todo el historial, de a bloques de días."""
+        first_day = self.get_first_day()
+        if first_day is not None:
+            for batch_start, batch_end in day_batches(first_day, date.today()):
+                self.backfill(batch_start, batch_end)
+        self.mark_backfilled()
+
+    def backfill(self, start_day: Optional[date], end_day: Optional[date]) -> None:
+        """Recalcula los acumulados de un rango de días desde las tablas originales."""
+        self.repository.rebuild(start_day, end_day)
+
+    def check(
+        self, start_day: Optional[date], end_day: Optional[date]
+    ) -> List[RollupMismatchSchema]:
+        """Compara los acumulados guardados con los calculados desde las tablas originales."""
+        expected = self.repository.compute_rollups(start_day, end_day)
+        actual = self.repository.get_stored_rollups(start_day, end_day)
+        mismatches = []
+        for model, (_, values) in ROLLUP_TABLES.items():
+            for key in sorted(expected[model].keys() | actual[model].keys()):
+                expected_values = {
+                    name: expected[model].get(key, {}).get(name, 0) for name in values
+                }
+                actual_values = {
+                    name: actual[model].get(key, {}).get(name, 0) for name in values
+                }
+                if not all(
+                    math.isclose(
+                        expected_values[name], actual_values[name], abs_tol=1e-6
+                    )
+                    for name in values
+                ):
+                    mismatches.append(
+                        RollupMismatchSchema(
+                            table=model.__tablename__,
+                            key=list(key),
+                            expected=expected_values,
+                            actual=actual_values,
+                        )
+                    )
+        return mismatches
+
+    def get_first_day(self) -> Optional[date]:
+        """Primer día con datos, para recalcular o revisar todo el historial."""
+        return self.repository.get_first_day()
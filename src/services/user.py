@@ -4,7 +4,8 @@ from src.schemas.auth import GoogleUser
 from src.schemas.pagination import PaginatedResponseSchema
 from src.schemas.user import CreateUserSchema, ResponseUserSchema
 from src.services.base_implementation import BaseServiceImplementation
-from src.utils.cloudinary import upload_base64_image_to_cloudinary
+from src.services.image_uploader import ImageUploader
+from src.services.kitchen_backlog import KitchenBacklog
 
 
 class UserService(BaseServiceImplementation[UserModel, ResponseUserSchema]):
@@ -18,15 +19,34 @@ class UserService(BaseServiceImplementation[UserModel, ResponseUserSchema]):
             create_schema=CreateUserSchema,
             response_schema=ResponseUserSchema,
         )
+        self.kitchen_backlog = KitchenBacklog()
+        self.image_uploader = ImageUploader()
+
+    def save(self, schema: CreateUserSchema) -> ResponseUserSchema:
+        """Guarda un nuevo usuario y actualiza la cantidad de cocineros."""
+        user = super().save(schema)
+        self.kitchen_backlog.on_user_change(None, user)
+        return user
 
     def update(self, id_key: int, schema: CreateUserSchema) -> ResponseUserSchema:
-        """Actualiza un usuario existente y maneja la imagen si es necesario."""
+        """Actualiza un usuario existente, subiendo la imagen en segundo plano."""
         user = self.repository.find(id_key)
-        if schema.image_url and schema.image_url != user.image_url:
-            schema.image_url = upload_base64_image_to_cloudinary(
-                schema.image_url, "users"
+        pending_upload = self.image_uploader.prepare_upload(schema, user.image_url)
+        updated_user = super().update(id_key, schema)
+        self.kitchen_backlog.on_user_change(user, updated_user)
+
+        if pending_upload:
+            self.image_uploader.schedule_upload(
+                self.repository, id_key, *pending_upload, "users"
             )
-        return super().update(id_key, schema)
+        return updated_user
+
+    def delete(self, id_key: int) -> ResponseUserSchema:
+        """Elimina un usuario y actualiza la cantidad de cocineros."""
+        user = self.repository.find(id_key)
+        deleted_user = super().delete(id_key)
+        self.kitchen_backlog.on_user_change(user, deleted_user)
+        return deleted_user
 
     def create_or_update_user_from_google_info(
         self, google_user: GoogleUser
@@ -72,6 +92,14 @@ class UserService(BaseServiceImplementation[UserModel, ResponseUserSchema]):
             id_key, {"password": new_password, "first_login": False}
         )
 
+    def rehash_password(
+        self, id_key: int, current_password: str, new_password: str
+    ) -> bool:
+        """Reemplaza el hash de la contraseña si nadie la cambió mientras tanto."""
+        return self.repository.replace_value(
+            id_key, "password", current_password, new_password
+        )
+
     def search_employees_by_name(
         self, search_term: str, offset: int, limit: int
     ) -> PaginatedResponseSchema:
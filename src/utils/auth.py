@@ -1,13 +1,13 @@
 from datetime import UTC, datetime, timedelta
 from typing import Optional
 
-import bcrypt
 from jose import jwt
 from pydantic import EmailStr
 
 from src.config.settings import settings
 from src.models.user import UserRole
 from src.schemas.user import ResponseUserSchema
+from src.services.password_hasher import PasswordHasher, PasswordHashQueueFullError
 from src.services.user import UserService
 
 
@@ -29,32 +29,33 @@ def create_access_token(user_email: EmailStr, user_id: int, user_role: UserRole)
     )
 
 
-def authenticate_user(
-    user_email: EmailStr, user_password: str, user_service: UserService
+async def authenticate_user(
+    user_email: EmailStr,
+    user_password: str,
+    user_service: UserService,
+    password_hasher: PasswordHasher,
 ) -> Optional[ResponseUserSchema]:
-    """Autentica a un usuario verificando su email y contraseña."""
+    """Autentica a un usuario verificando su email y contraseña.
+
+    Si el hash guardado se generó con otro costo de bcrypt, se vuelve a
+    hashear la contraseña con el costo actual aprovechando que se conoce.
+    """
     existing_user = user_service.get_one_by("email", user_email)
 
     if not existing_user or not existing_user.password:
         return None
 
-    if not bcrypt.checkpw(
-        user_password.encode("utf-8"), existing_user.password.encode("utf-8")
-    ):
+    if not await password_hasher.verify(user_password, existing_user.password):
         return None
 
-    return existing_user
-
-
-def hash_password(password: str) -> str:
-    """Hashea una contraseña usando bcrypt."""
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed_password.decode("utf-8")
+    if password_hasher.needs_rehash(existing_user.password):
+        try:
+            new_password = await password_hasher.hash(user_password)
+        except PasswordHashQueueFullError:
+            # Se reintenta en el próximo inicio de sesión.
+            return existing_user
+        user_service.rehash_password(
+            existing_user.id_key, existing_user.password, new_password
+        )
 
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica si una contraseña en texto plano coincide con un hash."""
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+    return existing_user
@@ -1,4 +1,4 @@
-import base64
+from typing import BinaryIO
 
 import cloudinary.uploader
 
@@ -12,14 +12,10 @@ cloudinary.config(
 )
 
 
-def upload_base64_image_to_cloudinary(base64_str: str, folder: str) -> str:
-    """Sube una imagen en formato base64 a Cloudinary y devuelve la URL de la misma."""
+def upload_image_to_cloudinary(file: BinaryIO, folder: str) -> str:
+    """Sube una imagen a Cloudinary y devuelve la URL de la misma."""
     try:
-        if "," in base64_str:
-            base64_str = base64_str.split(",")[1]
-
-        image_data = base64.b64decode(base64_str)
-        result = cloudinary.uploader.upload(image_data, folder=folder)
+        result = cloudinary.uploader.upload(file, folder=folder)
         return result["secure_url"]
     except Exception as e:
         raise ValueError(f"Error al subir la imagen a Cloudinary: {e}")
@@ -28,7 +24,11 @@ def upload_base64_image_to_cloudinary(base64_str: str, folder: str) -> str:
 def delete_image_from_cloudinary(image_url: str) -> None:
     """Elimina una imagen de Cloudinary usando su URL."""
     try:
-        public_id = image_url.split("/")[-1].split(".")[0]
-        cloudinary.uploader.destroy(f"manufactured_items/{public_id}")
+        # .../image/upload/v123/<carpeta>/<id>.<ext> -> <carpeta>/<id>
+        path = image_url.split("/upload/", 1)[1].split("/")
+        if path[0].startswith("v") and path[0][1:].isdigit():
+            path = path[1:]
+        public_id = "/".join(path).rsplit(".", 1)[0]
+        cloudinary.uploader.destroy(public_id)
     except Exception as e:
         raise ValueError(f"Error al eliminar la imagen de Cloudinary: {e}")
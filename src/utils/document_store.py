@@ -0,0 +1,82 @@
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.config.settings import settings
+
+
+class DocumentStore(ABC):
+    """Almacenamiento de documentos generados, identificados por una clave."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Indica si el documento ya fue guardado."""
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Obtiene el contenido de un documento."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Guarda un documento."""
+        pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Ruta local del documento, para servirlo con sendfile si existe."""
+        return None
+
+
+class LocalDocumentStore(DocumentStore):
+    """Guarda los documentos como archivos en un directorio local."""
+
+    def __init__(self, base_path: str) -> None:
+        self.base_path = os.path.abspath(base_path)
+
+    def exists(self, key: str) -> bool:
+        """Indica si el documento ya fue guardado."""
+        return os.path.isfile(self._path(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Obtiene el contenido de un documento."""
+        try:
+            with open(self._path(key), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Guarda un documento de forma atómica: nunca se lee un archivo a medio escribir."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Ruta local del documento, para servirlo con sendfile si existe."""
+        path = self._path(key)
+        return path if os.path.isfile(path) else None
+
+    def _path(self, key: str) -> str:
+        """Convierte la clave en una ruta dentro del directorio base."""
+        path = os.path.abspath(os.path.join(self.base_path, key))
+        if os.path.commonpath([path, self.base_path]) != self.base_path:
+            raise ValueError(f"Clave de documento inválida: {key}")
+        return path
+
+
+def get_document_store() -> DocumentStore:
+    """Devuelve el almacenamiento de documentos configurado."""
+    if settings.document_store_backend == "local":
+        return LocalDocumentStore(settings.document_store_path)
+    raise ValueError(
+        f"Almacenamiento de documentos desconocido: {settings.document_store_backend}"
+    )
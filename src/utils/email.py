@@ -1,50 +1,70 @@
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import List, Optional, Tuple
 
-import aiosmtplib
 from pydantic import EmailStr
 
 from src.config.settings import settings
+from src.utils.smtp import EmailDeliveryError, SMTPConnectionPool
 
 
-async def send_email_with_attachment(
+def build_message(
     to_email: str,
     subject: str,
     body: str,
-    attachment_data: bytes,
-    attachment_filename: str,
-) -> bool:
-    """Envia un correo electrónico con un archivo adjunto."""
-    try:
-        message = MIMEMultipart()
-        message["From"] = settings.from_email
-        message["To"] = to_email
-        message["Subject"] = subject
-
-        message.attach(MIMEText(body, "plain"))
-
-        attachment = MIMEApplication(attachment_data, _subtype="pdf")
+    attachment_data: Optional[bytes] = None,
+    attachment_filename: Optional[str] = None,
+    attachment_content_type: str = "application/pdf",
+) -> MIMEMultipart:
+    """Arma un correo electrónico con un archivo adjunto opcional."""
+    message = MIMEMultipart()
+    message["From"] = settings.from_email
+    message["To"] = to_email
+    message["Subject"] = subject
+
+    message.attach(MIMEText(body, "plain"))
+
+    if attachment_data is not None:
+        attachment = MIMEApplication(
+            attachment_data, _subtype=attachment_content_type.split("/")[-1]
+        )
         attachment.add_header(
             "Content-Disposition", f"attachment; filename={attachment_filename}"
         )
         message.attach(attachment)
 
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_username,
-            password=settings.smtp_password,
-            use_tls=settings.smtp_use_tls,
-        )
+    return message
+
+
+async def send_email_with_attachment(
+    to_email: str,
+    subject: str,
+    body: str,
+    attachment_data: bytes,
+    attachment_filename: str,
+    attachment_content_type: str = "application/pdf",
+) -> None:
+    """Envia un correo electrónico con un archivo adjunto.
+
+    Lanza TransientEmailError o PermanentEmailError si no se pudo entregar.
+    """
+    message = build_message(
+        to_email,
+        subject,
+        body,
+        attachment_data,
+        attachment_filename,
+        attachment_content_type,
+    )
+    await SMTPConnectionPool().send(message)
 
-        print(f"Email enviado a {to_email} con éxito.")
-        return True
 
-    except Exception as e:
-        print(f"Error al enviar el email a {to_email}: {e}")
-        return False
+async def send_bulk_emails(
+    messages: List[MIMEMultipart],
+) -> List[Tuple[MIMEMultipart, Optional[EmailDeliveryError]]]:
+    """Envia un lote de correos reutilizando las conexiones del pool."""
+    return await SMTPConnectionPool().send_batch(messages)
 
 
 async def send_invoice_email(
@@ -52,7 +72,7 @@ async def send_invoice_email(
     customer_name: str,
     invoice_number: str,
     pdf_data: bytes,
-) -> bool:
+) -> None:
     """Envia un correo electrónico con una factura adjunta."""
     subject = f"Factura #{invoice_number} - El Buen Sabor"
 
@@ -65,7 +85,7 @@ Gracias por su compra.
 Saludos cordiales,
 El equipo de El Buen Sabor"""
 
-    return await send_email_with_attachment(
+    await send_email_with_attachment(
         to_email=customer_email,
         subject=subject,
         body=body,
@@ -80,7 +100,7 @@ async def send_credit_note_email(
     customer_name: str,
     credit_note_number: str,
     pdf_data: bytes,
-) -> bool:
+) -> None:
     """Envia un correo electrónico con una nota de crédito adjunta."""
     subject = f"Nota de Crédito #{credit_note_number} - El Buen Sabor"
 
@@ -95,7 +115,7 @@ Si tiene alguna consulta, no dude en contactarnos.
 Saludos cordiales,
 El equipo de El Buen Sabor"""
 
-    return await send_email_with_attachment(
+    await send_email_with_attachment(
         to_email=customer_email,
         subject=subject,
         body=body,
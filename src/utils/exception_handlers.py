@@ -4,6 +4,7 @@ from psycopg2.errors import ForeignKeyViolation, UniqueViolation
 from sqlalchemy.exc import IntegrityError
 
 from src.repositories.base_implementation import RecordNotFoundError
+from src.services.password_hasher import PasswordHashQueueFullError
 
 
 async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
@@ -30,6 +31,17 @@ async def value_error_handler(_: Request, exc: ValueError) -> JSONResponse:
     )
 
 
+async def password_hash_queue_full_handler(
+    _: Request, exc: PasswordHashQueueFullError
+) -> JSONResponse:
+    """Manejador de excepciones para la cola de hasheo de contraseñas llena."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 async def integrity_error_handler(_: Request, exc: IntegrityError) -> JSONResponse:
     """Manejador de excepciones para errores de integridad en la base de datos."""
     if isinstance(exc.orig, ForeignKeyViolation):
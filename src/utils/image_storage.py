@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+
+import httpx
+
+from src.config.settings import settings
+from src.utils.cloudinary import (
+    delete_image_from_cloudinary,
+    upload_image_to_cloudinary,
+)
+
+# Firmas de los formatos de imagen aceptados: (extensión, offset, bytes mágicos).
+IMAGE_SIGNATURES = (
+    ("jpg", 0, b"\xff\xd8\xff"),
+    ("png", 0, b"\x89PNG\r\n\x1a\n"),
+    ("gif", 0, b"GIF87a"),
+    ("gif", 0, b"GIF89a"),
+    ("webp", 8, b"WEBP"),
+)
+
+IMAGE_HEADER_SIZE = 16
+
+
+def detect_image_extension(header: bytes) -> Optional[str]:
+    """Detecta el formato de una imagen por sus primeros bytes."""
+    for extension, offset, signature in IMAGE_SIGNATURES:
+        if header[offset : offset + len(signature)] == signature:
+            if extension == "webp" and not header.startswith(b"RIFF"):
+                continue
+            return extension
+    return None
+
+
+class ImageStorage(ABC):
+    """Almacenamiento de imágenes públicas, identificadas por su URL."""
+
+    @abstractmethod
+    def upload(self, file: BinaryIO, folder: str) -> str:
+        """Guarda una imagen y devuelve su URL pública."""
+        pass
+
+    @abstractmethod
+    def read(self, image_url: str) -> bytes:
+        """Obtiene el contenido de una imagen a partir de su URL."""
+        pass
+
+    @abstractmethod
+    def delete(self, image_url: str) -> None:
+        """Elimina una imagen a partir de su URL."""
+        pass
+
+    @abstractmethod
+    def owns(self, image_url: str) -> bool:
+        """Indica si la URL corresponde a una imagen de este almacenamiento."""
+        pass
+
+
+class LocalImageStorage(ImageStorage):
+    """Guarda las imágenes en un directorio local servido por la propia API."""
+
+    def __init__(self, base_path: str, base_url: str) -> None:
+        self.base_path = os.path.abspath(base_path)
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, file: BinaryIO, folder: str) -> str:
+        """Guarda la imagen de forma atómica con un nombre único."""
+        header = file.read(IMAGE_HEADER_SIZE)
+        extension = detect_image_extension(header)
+        if extension is None:
+            raise ValueError("El archivo no es una imagen válida.")
+
+        key = f"{folder}/{uuid.uuid4().hex}.{extension}"
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(file_descriptor, "wb") as target:
+                target.write(header)
+                shutil.copyfileobj(file, target)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return f"{self.base_url}/{key}"
+
+    def read(self, image_url: str) -> bytes:
+        """Lee la imagen del directorio local."""
+        if not self.owns(image_url):
+            raise ValueError(f"La imagen no pertenece al almacenamiento: {image_url}")
+        with open(self._path(image_url[len(self.base_url) + 1 :]), "rb") as file:
+            return file.read()
+
+    def delete(self, image_url: str) -> None:
+        """Elimina la imagen si existe."""
+        if not self.owns(image_url):
+            return
+        try:
+            os.unlink(self._path(image_url[len(self.base_url) + 1 :]))
+        except FileNotFoundError:
+            pass
+
+    def owns(self, image_url: str) -> bool:
+        """Indica si la URL corresponde a una imagen de este almacenamiento."""
+        return image_url.startswith(f"{self.base_url}/")
+
+    def _path(self, key: str) -> str:
+        """Convierte la clave en una ruta dentro del directorio base."""
+        path = os.path.abspath(os.path.join(self.base_path, key))
+        if os.path.commonpath([path, self.base_path]) != self.base_path:
+            raise ValueError(f"Clave de imagen inválida: {key}")
+        return path
+
+
+class CloudinaryImageStorage(ImageStorage):
+    """Guarda las imágenes en Cloudinary."""
+
+    def upload(self, file: BinaryIO, folder: str) -> str:
+        """Sube la imagen a Cloudinary."""
+        return upload_image_to_cloudinary(file, folder)
+
+    def read(self, image_url: str) -> bytes:
+        """Descarga la imagen de Cloudinary."""
+        response = httpx.get(image_url, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+    def delete(self, image_url: str) -> None:
+        """Elimina la imagen de Cloudinary."""
+        if self.owns(image_url):
+            delete_image_from_cloudinary(image_url)
+
+    def owns(self, image_url: str) -> bool:
+        """Indica si la URL corresponde a una imagen de Cloudinary."""
+        return "res.cloudinary.com/" in image_url
+
+
+def get_image_storage() -> ImageStorage:
+    """Devuelve el almacenamiento de imágenes configurado."""
+    if settings.image_storage_backend == "local":
+        return LocalImageStorage(
+            settings.image_storage_path, settings.image_public_base_url
+        )
+    if settings.image_storage_backend == "cloudinary":
+        return CloudinaryImageStorage()
+    raise ValueError(
+        f"Almacenamiento de imágenes desconocido: {settings.image_storage_backend}"
+    )
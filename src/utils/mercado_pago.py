@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import hmac
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.config.settings import settings
+
+
+class MercadoPagoError(Exception):
+    """Error al llamar a la API de Mercado Pago."""
+
+
+class MercadoPagoUnavailableError(MercadoPagoError):
+    """Mercado Pago no responde o el circuito está abierto: conviene reintentar más tarde."""
+
+
+def verify_webhook_signature(
+    signature: Optional[str],
+    request_id: Optional[str],
+    data_id: str,
+    secret: str,
+    tolerance_seconds: float,
+) -> bool:
+    """Verifica la firma ``x-signature`` de una notificación de Mercado Pago.
+
+    La firma es un HMAC-SHA256 con la clave secreta del webhook sobre el
+    manifiesto ``id:<data.id>;request-id:<x-request-id>;ts:<ts>;``. Se rechazan
+    las firmas cuyo ``ts`` se aleja más de ``tolerance_seconds`` de la hora
+    actual, para que una notificación capturada no pueda reenviarse después.
+    """
+    if not signature:
+        return False
+
+    parts = dict(
+        part.strip().split("=", 1) for part in signature.split(",") if "=" in part
+    )
+    timestamp, received = parts.get("ts"), parts.get("v1")
+    if not timestamp or not received:
+        return False
+
+    manifest = f"id:{data_id.lower()};"
+    if request_id:
+        manifest += f"request-id:{request_id};"
+    manifest += f"ts:{timestamp};"
+    expected = hmac.new(
+        secret.encode("utf-8"), manifest.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    if not hmac.compare_digest(expected, received):
+        return False
+
+    try:
+        signed_at = int(timestamp)
+    except ValueError:
+        return False
+    # Según la versión, Mercado Pago envía el ts en segundos o en milisegundos.
+    if signed_at > 10**11:
+        signed_at /= 1000
+    return abs(time.time() - signed_at) <= tolerance_seconds
+
+
+class CircuitBreaker:
+    """Corta las llamadas a un servicio que viene fallando.
+
+    Después de ``failure_threshold`` fallas seguidas el circuito se abre y las
+    llamadas fallan enseguida durante ``reset_seconds``. Pasado ese tiempo se
+    deja pasar una sola llamada de prueba: si sale bien el circuito se cierra y
+    si falla se vuelve a abrir.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Estado del circuito: cerrado, abierto o semiabierto."""
+        if self.opened_at is None:
+            return "cerrado"
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return "abierto"
+        return "semiabierto"
+
+    def before_call(self) -> bool:
+        """Verifica si la llamada puede salir; si no, falla sin esperar.
+
+        Devuelve True si es la llamada de prueba del circuito semiabierto.
+        """
+        state = self.state
+        if state == "abierto" or (state == "semiabierto" and self._trial_in_flight):
+            raise MercadoPagoUnavailableError(
+                "Mercado Pago no está disponible en este momento."
+            )
+        if state == "semiabierto":
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Cierra el circuito después de una llamada exitosa."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Libera la llamada de prueba si terminó sin un resultado (por ejemplo, cancelada)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Cuenta una falla y abre el circuito si corresponde."""
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class MercadoPagoClient:
+    """Cliente asíncrono de la API de Mercado Pago.
+
+    Todas las llamadas comparten un ``httpx.AsyncClient`` con pool de
+    conexiones y timeouts. Los errores de red, 429 y 5xx se reintentan con
+    espera exponencial, y un circuit breaker deja de llamar mientras el
+    servicio está caído para no acumular pedidos esperando.
+    """
+
+    _instance: Optional["MercadoPagoClient"] = None
+
+    def __new__(cls) -> "MercadoPagoClient":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(MercadoPagoClient, cls).__new__(cls)
+            cls._instance._client = None
+            cls._instance.circuit_breaker = CircuitBreaker(
+                settings.mp_circuit_failure_threshold or 5,
+                settings.mp_circuit_reset_seconds or 30,
+            )
+        return cls._instance
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Crea el cliente HTTP compartido la primera vez que se usa."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=settings.mp_api_base_url,
+                headers={"Authorization": f"Bearer {settings.prod_access_token}"},
+                timeout=httpx.Timeout(
+                    settings.mp_timeout_seconds or 10,
+                    connect=settings.mp_connect_timeout_seconds or 3,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.mp_pool_size or 20,
+                    max_keepalive_connections=settings.mp_pool_size or 20,
+                ),
+            )
+        return self._client
+
+    async def create_preference(
+        self, preference: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Crea una preferencia de pago."""
+        return await self._request(
+            "POST",
+            "/checkout/preferences",
+            json=preference,
+            headers={"X-Idempotency-Key": idempotency_key} if idempotency_key else None,
+        )
+
+    async def get_payment(self, payment_id: str) -> Dict[str, Any]:
+        """Obtiene un pago por su ID."""
+        return await self._request("GET", f"/v1/payments/{payment_id}")
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Hace una llamada con reintentos y pasando por el circuit breaker."""
+        is_trial = self.circuit_breaker.before_call()
+        try:
+            response = await self._request_with_retries(method, path, json, headers)
+        finally:
+            if is_trial:
+                self.circuit_breaker.release()
+
+        # Un 4xx es un error del pedido, no del servicio: no abre el circuito.
+        self.circuit_breaker.record_success()
+        if response.is_error:
+            raise MercadoPagoError(
+                f"Mercado Pago respondió {response.status_code}: {response.text}"
+            )
+        return response.json()
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+    ) -> httpx.Response:
+        """Hace la llamada y reintenta los errores de red, 429 y 5xx."""
+        max_retries = settings.mp_max_retries or 0
+        attempt = 0
+
+        while True:
+            try:
+                response = await self._get_client().request(
+                    method, path, json=json, headers=headers
+                )
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                error: Exception = MercadoPagoUnavailableError(
+                    f"Mercado Pago respondió {response.status_code}: {response.text}"
+                )
+            except httpx.TransportError as e:
+                error = MercadoPagoUnavailableError(
+                    f"Error de conexión con Mercado Pago: {e!r}"
+                )
+
+            if attempt >= max_retries:
+                self.circuit_breaker.record_failure()
+                raise error
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Espera exponencial con jitter antes de reintentar."""
+        base_seconds = settings.mp_retry_base_seconds or 0.2
+        return base_seconds * 2 ** (attempt - 1) * (0.5 + random.random())
+
+    async def close(self) -> None:
+        """Cierra las conexiones del pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,147 @@
+from tempfile import SpooledTemporaryFile
+from typing import List, Optional
+
+from fastapi import HTTPException, Request
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from src.utils.image_storage import IMAGE_HEADER_SIZE, detect_image_extension
+
+# Lo que agrega el multipart alrededor del archivo (boundary y headers de la parte).
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+# Hasta este tamaño el archivo se guarda en memoria; después pasa a disco.
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+class _ImageUploadReceiver:
+    """Arma el archivo de una parte del multipart a medida que llegan los bytes."""
+
+    def __init__(self, field_name: str, max_bytes: int) -> None:
+        self.field_name = field_name.encode("utf-8")
+        self.max_bytes = max_bytes
+        self.file = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self.size = 0
+        self.found = False
+        self.too_large = False
+        self.pending: List[bytes] = []
+        self._in_file = False
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition: Optional[bytes] = None
+
+    def on_part_begin(self) -> None:
+        self._in_file = False
+        self._disposition = None
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition or b"")
+        self._in_file = (
+            not self.found
+            and options.get(b"name") == self.field_name
+            and b"filename" in options
+        )
+        self.found = self.found or self._in_file
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file or self.too_large:
+            return
+        self.size += end - start
+        if self.size > self.max_bytes:
+            self.too_large = True
+            return
+        self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        self._in_file = False
+
+
+async def receive_image_upload(
+    request: Request, max_bytes: int, field_name: str = "file"
+) -> SpooledTemporaryFile:
+    """Recibe una imagen ``multipart/form-data`` leyendo el cuerpo por partes.
+
+    El archivo se escribe a medida que llega y la lectura se corta apenas
+    supera ``max_bytes``. El formato se detecta por los primeros bytes y no
+    por el Content-Type que declara el cliente.
+    """
+    content_type, options = parse_options_header(
+        request.headers.get("content-type", "")
+    )
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(
+            status_code=400, detail="Se esperaba un cuerpo multipart/form-data."
+        )
+
+    content_length = request.headers.get("content-length")
+    if (
+        content_length
+        and content_length.isdigit()
+        and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES
+    ):
+        raise HTTPException(status_code=413, detail="La imagen es demasiado grande.")
+
+    receiver = _ImageUploadReceiver(field_name, max_bytes)
+    parser = MultipartParser(
+        options[b"boundary"],
+        {
+            "on_part_begin": receiver.on_part_begin,
+            "on_header_field": receiver.on_header_field,
+            "on_header_value": receiver.on_header_value,
+            "on_header_end": receiver.on_header_end,
+            "on_headers_finished": receiver.on_headers_finished,
+            "on_part_data": receiver.on_part_data,
+            "on_part_end": receiver.on_part_end,
+        },
+    )
+
+    file = receiver.file
+    written = 0
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if receiver.too_large:
+                raise HTTPException(
+                    status_code=413, detail="La imagen es demasiado grande."
+                )
+            data, receiver.pending = b"".join(receiver.pending), []
+            if not data:
+                continue
+            # Una vez que pasó a disco, la escritura no debe bloquear el event loop.
+            if written + len(data) > SPOOL_MAX_BYTES:
+                await run_in_threadpool(file.write, data)
+            else:
+                file.write(data)
+            written += len(data)
+        parser.finalize()
+
+        if not receiver.found or receiver.size == 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Falta el archivo de imagen en el campo '{field_name}'.",
+            )
+
+        file.seek(0)
+        if detect_image_extension(file.read(IMAGE_HEADER_SIZE)) is None:
+            raise HTTPException(
+                status_code=415,
+                detail="El archivo no es una imagen JPEG, PNG, GIF o WebP.",
+            )
+        file.seek(0)
+        return file
+    except BaseException:
+        file.close()
+        raise
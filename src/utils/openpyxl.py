@@ -1,20 +1,25 @@
 from datetime import datetime
-from io import BytesIO
-from typing import List, Tuple
+from typing import BinaryIO, Iterable, Tuple
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 
+from src.models.invoice import InvoiceType
+
 
 def generate_excel_report(
-    buffer: BytesIO,
-    purchases: List[Tuple[datetime, int, float, str]],
-    invoices: List[Tuple[datetime, float, str]],
+    file: BinaryIO,
+    purchases: Iterable[Tuple[datetime, int, float, str]],
+    invoices: Iterable[Tuple[datetime, float, InvoiceType]],
 ) -> None:
-    """Genera un reporte en formato Excel con las compras e ingresos."""
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = "Report"
+    """Genera un reporte en formato Excel con las compras e ingresos.
+
+    Usa un libro de sólo escritura: cada fila se vuelca al archivo a medida que
+    se recorre, sin mantener la hoja completa en memoria.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Report")
 
     headers = [
         "Tipo",
@@ -24,28 +29,26 @@ def generate_excel_report(
         "Costo Total",
         "Ganancia Total",
     ]
-    for col_num, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col_num)
-        cell.value = header
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
         cell.font = Font(bold=True)
+        header_cells.append(cell)
+    sheet.append(header_cells)
 
-    row = 2
     for purchase_date, quantity, total_cost, name in purchases:
-        sheet.cell(row=row, column=1).value = "Compra de Inventario"
-        sheet.cell(row=row, column=2).value = purchase_date
-        sheet.cell(row=row, column=3).value = name
-        sheet.cell(row=row, column=4).value = quantity
-        sheet.cell(row=row, column=5).value = total_cost
-        sheet.cell(row=row, column=6).value = None
-        row += 1
+        sheet.append(
+            [
+                "Compra de Inventario",
+                purchase_date,
+                name,
+                quantity,
+                total_cost,
+                None,
+            ]
+        )
 
     for invoice_date, total, invoice_type in invoices:
-        sheet.cell(row=row, column=1).value = "Venta"
-        sheet.cell(row=row, column=2).value = invoice_date
-        sheet.cell(row=row, column=3).value = invoice_type.value
-        sheet.cell(row=row, column=4).value = None
-        sheet.cell(row=row, column=5).value = None
-        sheet.cell(row=row, column=6).value = total
-        row += 1
-
-    workbook.save(buffer)
+        sheet.append(["Venta", invoice_date, invoice_type.value, None, None, total])
+
+    workbook.save(file)
@@ -0,0 +1,47 @@
+import io
+from typing import Dict
+
+from PIL import Image, ImageOps
+
+# Formatos de salida: (formato de Pillow, opciones de guardado).
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", {"method": 4}),
+    "jpg": ("JPEG", {"optimize": True, "progressive": True}),
+}
+
+
+def render_derivatives(
+    image_data: bytes, sizes: Dict[str, int], quality: int
+) -> Dict[str, bytes]:
+    """Genera versiones reducidas de una imagen en WebP y JPEG.
+
+    ``sizes`` indica el lado mayor de cada tamaño. Devuelve los bytes de cada
+    variante con claves como ``thumbnail_webp``. Las imágenes nunca se agrandan.
+    """
+    with Image.open(io.BytesIO(image_data)) as source:
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    derivatives = {}
+    for size_name, max_side in sizes.items():
+        resized = image.copy()
+        resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+        for extension, (image_format, options) in DERIVATIVE_FORMATS.items():
+            output = _flatten(resized) if image_format == "JPEG" else resized
+            buffer = io.BytesIO()
+            output.save(buffer, image_format, quality=quality, **options)
+            derivatives[f"{size_name}_{extension}"] = buffer.getvalue()
+
+    return derivatives
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Pone la imagen sobre fondo blanco para formatos sin transparencia."""
+    if image.mode != "RGBA":
+        return image
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
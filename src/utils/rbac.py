@@ -54,6 +54,13 @@ def get_current_user(
     return {"id": user_id, "email": user_email, "role": user_role}
 
 
+def get_user_from_token(token: str) -> Dict[str, Any]:
+    """Obtiene el usuario a partir de un token JWT recibido fuera del header."""
+    return get_current_user(
+        validate_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    )
+
+
 def has_role(allowed_roles: Union[List[UserRole], UserRole]) -> Any:
     """Decorador para verificar si el usuario tiene uno de los roles permitidos."""
     if isinstance(allowed_roles, UserRole):
@@ -1,3 +1,5 @@
+import io
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
@@ -63,3 +65,10 @@ def generate_pdf_report(invoice_data: dict, filename: str, invoice_type: str) ->
     )
 
     doc.build(elements)
+
+
+def render_pdf_report(invoice_data: dict, invoice_type: str) -> bytes:
+    """Genera el PDF de una factura o nota de crédito y devuelve su contenido."""
+    buffer = io.BytesIO()
+    generate_pdf_report(invoice_data, buffer, invoice_type)
+    return buffer.getvalue()
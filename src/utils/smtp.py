@@ -0,0 +1,198 @@
+import asyncio
+import time
+from email.message import Message
+from typing import List, Optional, Sequence, Tuple, Union
+
+import aiosmtplib
+
+from src.config.settings import settings
+
+
+class EmailDeliveryError(Exception):
+    """Error al entregar un correo electrónico."""
+
+
+class TransientEmailError(EmailDeliveryError):
+    """Error temporal (4xx, desconexión, timeout): conviene reintentar."""
+
+
+class PermanentEmailError(EmailDeliveryError):
+    """Error definitivo (5xx): reintentar no va a cambiar el resultado."""
+
+
+class PooledConnection:
+    """Conexión SMTP autenticada que se reutiliza entre envíos."""
+
+    def __init__(self) -> None:
+        self.client = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_username,
+            password=settings.smtp_password,
+            use_tls=bool(settings.smtp_use_tls),
+            timeout=settings.smtp_timeout_seconds,
+        )
+        self.sent_messages = 0
+        self.last_used = 0.0
+
+    async def ensure_connected(self) -> None:
+        """Abre la conexión o verifica con NOOP que la conexión inactiva siga viva."""
+        if self.client.is_connected:
+            idle_seconds = time.monotonic() - self.last_used
+            if idle_seconds < (settings.smtp_idle_check_seconds or 30):
+                return
+            try:
+                await self.client.noop()
+                return
+            except aiosmtplib.SMTPException:
+                self.client.close()
+
+        await self.client.connect()
+        self.sent_messages = 0
+
+    async def send(self, message: Message) -> None:
+        """Envía un mensaje por la conexión."""
+        await self.ensure_connected()
+        await self.client.send_message(message)
+        self.sent_messages += 1
+        self.last_used = time.monotonic()
+
+    async def close(self) -> None:
+        """Cierra la conexión con QUIT, o la corta si el servidor no responde."""
+        if not self.client.is_connected:
+            return
+        try:
+            await self.client.quit()
+        except aiosmtplib.SMTPException:
+            self.client.close()
+
+
+class SMTPConnectionPool:
+    """Pool de conexiones SMTP de larga duración.
+
+    Limita la cantidad de conexiones simultáneas, reutiliza la sesión
+    (TCP + TLS + AUTH) entre mensajes y la renueva al llegar al máximo de
+    mensajes por conexión. Los errores se clasifican en temporales y
+    definitivos para que quien envía decida si reintentar.
+    """
+
+    _instance: Optional["SMTPConnectionPool"] = None
+
+    def __new__(cls) -> "SMTPConnectionPool":
+        """Implementación del patrón Singleton"""
+        if cls._instance is None:
+            cls._instance = super(SMTPConnectionPool, cls).__new__(cls)
+            cls._instance._idle = []
+            cls._instance._semaphore = None
+        return cls._instance
+
+    async def send(self, message: Message) -> None:
+        """Envía un mensaje reutilizando una conexión del pool.
+
+        Si la conexión estaba cortada se reintenta una vez con una conexión nueva.
+        """
+        async with self._get_semaphore():
+            connection = self._acquire()
+            await self._send_on(connection, message)
+            self._release(connection)
+
+    async def send_batch(
+        self, messages: Sequence[Message]
+    ) -> List[Tuple[Message, Optional[EmailDeliveryError]]]:
+        """Envía un lote de mensajes repartido entre las conexiones del pool.
+
+        El lote se divide en hasta ``smtp_pool_size`` partes y cada parte se
+        envía en orden por una sola conexión, sin devolverla al pool entre
+        mensajes. Un error en un mensaje no corta el resto del lote. Los
+        resultados vuelven en el orden de los mensajes.
+        """
+        chunk_count = min(settings.smtp_pool_size or 4, len(messages))
+        chunks = [messages[index::chunk_count] for index in range(chunk_count)]
+        results = await asyncio.gather(*(self._send_chunk(chunk) for chunk in chunks))
+        return [
+            results[position % chunk_count][position // chunk_count]
+            for position in range(len(messages))
+        ]
+
+    async def _send_chunk(
+        self, messages: Sequence[Message]
+    ) -> List[Tuple[Message, Optional[EmailDeliveryError]]]:
+        """Envía varios mensajes seguidos por una misma conexión del pool."""
+        max_messages = settings.smtp_max_messages_per_connection or 100
+        results: List[Tuple[Message, Optional[EmailDeliveryError]]] = []
+        async with self._get_semaphore():
+            connection = self._acquire()
+            for message in messages:
+                if connection.sent_messages >= max_messages:
+                    await connection.close()
+                try:
+                    await self._send_on(connection, message)
+                    results.append((message, None))
+                except EmailDeliveryError as e:
+                    results.append((message, e))
+            self._release(connection)
+        return results
+
+    async def _send_on(self, connection: PooledConnection, message: Message) -> None:
+        """Envía un mensaje por una conexión, reconectando una vez si estaba cortada.
+
+        Ante un error la conexión se cierra; el próximo envío vuelve a conectar.
+        """
+        try:
+            try:
+                await connection.send(message)
+            except (
+                aiosmtplib.SMTPServerDisconnected,
+                aiosmtplib.SMTPConnectError,
+            ):
+                connection.client.close()
+                await connection.send(message)
+        except aiosmtplib.SMTPException as e:
+            connection.client.close()
+            raise self.classify(e) from e
+        except (OSError, asyncio.TimeoutError) as e:
+            connection.client.close()
+            raise TransientEmailError(str(e)) from e
+
+    async def close(self) -> None:
+        """Cierra todas las conexiones inactivas."""
+        idle, self._idle = self._idle, []
+        await asyncio.gather(
+            *(connection.close() for connection in idle), return_exceptions=True
+        )
+
+    @staticmethod
+    def classify(
+        error: Union[aiosmtplib.SMTPException, Exception],
+    ) -> EmailDeliveryError:
+        """Clasifica un error SMTP según si vale la pena reintentar."""
+        if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+            codes = [recipient.code for recipient in error.recipients]
+        elif isinstance(error, aiosmtplib.SMTPResponseException):
+            codes = [error.code]
+        else:
+            codes = []
+
+        if codes and all(500 <= code < 600 for code in codes):
+            return PermanentEmailError(str(error))
+        return TransientEmailError(str(error))
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Crea el semáforo la primera vez que se usa, dentro del event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.smtp_pool_size or 4)
+        return self._semaphore
+
+    def _acquire(self) -> PooledConnection:
+        """Toma una conexión inactiva o crea una nueva."""
+        if self._idle:
+            return self._idle.pop()
+        return PooledConnection()
+
+    def _release(self, connection: PooledConnection) -> None:
+        """Devuelve la conexión al pool o la cierra si ya envió demasiados mensajes."""
+        max_messages = settings.smtp_max_messages_per_connection or 100
+        if connection.sent_messages >= max_messages:
+            asyncio.create_task(connection.close())
+            return
+        self._idle.append(connection)
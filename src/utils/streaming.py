@@ -0,0 +1,12 @@
+from typing import BinaryIO, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_file(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Lee un archivo por partes para enviarlo en una respuesta y luego lo cierra."""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
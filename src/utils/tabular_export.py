@@ -0,0 +1,160 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+ReportColumn = Tuple[str, type]
+
+ROWS_PER_CHUNK = 5000
+
+
+class ReportFormat(enum.Enum):
+    csv = "csv"
+    parquet = "parquet"
+    ndjson = "ndjson"
+
+
+MEDIA_TYPES = {
+    ReportFormat.csv: "text/csv",
+    ReportFormat.parquet: "application/vnd.apache.parquet",
+    ReportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def stream_report(
+    report_format: ReportFormat,
+    columns: List[ReportColumn],
+    rows: Iterable[Sequence[Any]],
+    rows_per_chunk: int = ROWS_PER_CHUNK,
+) -> Iterator[bytes]:
+    """Serializa las filas en el formato pedido y las devuelve por partes."""
+    if report_format == ReportFormat.csv:
+        return _stream_csv(columns, rows, rows_per_chunk)
+    if report_format == ReportFormat.ndjson:
+        return _stream_ndjson(columns, rows, rows_per_chunk)
+    return _stream_parquet(columns, rows, rows_per_chunk)
+
+
+def _batches(
+    rows: Iterable[Sequence[Any]], rows_per_chunk: int
+) -> Iterator[List[Sequence[Any]]]:
+    """Agrupa las filas en lotes."""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, rows_per_chunk)):
+        yield batch
+
+
+def _stream_csv(
+    columns: List[ReportColumn],
+    rows: Iterable[Sequence[Any]],
+    rows_per_chunk: int,
+) -> Iterator[bytes]:
+    """Genera un CSV por lotes de filas."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+
+    for batch in _batches(rows, rows_per_chunk):
+        writer.writerows(
+            [value.value if isinstance(value, enum.Enum) else value for value in row]
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _stream_ndjson(
+    columns: List[ReportColumn],
+    rows: Iterable[Sequence[Any]],
+    rows_per_chunk: int,
+) -> Iterator[bytes]:
+    """Genera un objeto JSON por línea, por lotes de filas."""
+    names = [name for name, _ in columns]
+
+    def default(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, enum.Enum):
+            return value.value
+        return str(value)
+
+    for batch in _batches(rows, rows_per_chunk):
+        yield "".join(
+            json.dumps(dict(zip(names, row)), default=default, ensure_ascii=False)
+            + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+
+class _ChunkSink:
+    """Destino de escritura que acumula los bytes hasta que se retiran."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        """Devuelve los bytes escritos desde la última llamada."""
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+def _stream_parquet(
+    columns: List[ReportColumn],
+    rows: Iterable[Sequence[Any]],
+    rows_per_chunk: int,
+) -> Iterator[bytes]:
+    """Genera un Parquet con un row group por lote de filas.
+
+    Cada lote se transpone a columnas y se escribe como un row group, así la
+    memoria depende del tamaño del lote y no de la cantidad total de filas.
+    """
+    # pyarrow se importa al usarlo para no cargarlo en cada arranque de la app.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        str: pa.string(),
+        int: pa.int64(),
+        float: pa.float64(),
+        datetime: pa.timestamp("us"),
+    }
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in _batches(rows, rows_per_chunk):
+            arrays = [
+                pa.array(
+                    [
+                        value.value if isinstance(value, enum.Enum) else value
+                        for value in column_values
+                    ],
+                    type=field.type,
+                )
+                for field, column_values in zip(schema, zip(*batch))
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
@@ -0,0 +1,45 @@
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+
+
+class _ChunkWriter:
+    """Archivo de sólo escritura que acumula los bytes hasta que se retiran."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        """Devuelve los bytes escritos desde la última llamada."""
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+async def stream_zip(
+    entries: AsyncIterator[Tuple[str, bytes]],
+) -> AsyncIterator[bytes]:
+    """Arma un ZIP a medida que llegan los archivos y lo devuelve por partes.
+
+    Cada entrada se escribe y se envía apenas está disponible, así en memoria
+    sólo queda el archivo que se está agregando.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_STORED) as archive:
+        async for filename, data in entries:
+            entry = zipfile.ZipInfo(filename, date_time=datetime.now().timetuple()[:6])
+            archive.writestr(entry, data)
+            yield writer.take()
+    yield writer.take()